@@ -0,0 +1,47 @@
+"""Pure-Python analytics behind the NCAT Operations Dashboard.
+
+Importing this package only pulls in pandas; the Streamlit UI in
+`ncat_dashboard.py` is a thin layer over these functions.
+"""
+from .batch import map_snapshots
+from .data import (
+    REGISTRY_LISTS,
+    SOURCE_COLUMNS,
+    Dataset,
+    Loaded,
+    data_version,
+    load_data,
+    load_sources,
+    published_data,
+    registry_columns,
+    registry_lists,
+    registry_names,
+    table_signature,
+)
+from .metrics import (
+    CATEGORY_LABELS,
+    FULL_YEARS,
+    LIST_LABELS,
+    NON_TERMINATION_CATEGORIES,
+    TERMINATION_CATEGORIES,
+    category_summary,
+    category_yoy,
+    filter_categories,
+    list_shares,
+    list_summary,
+    melt_categories,
+    melt_lists,
+    melt_parties,
+    melt_registries,
+    normalize_party_categories,
+    overview_metrics,
+    party_ratios,
+    party_split_groups,
+    party_summary,
+    registry_comparison,
+    registry_stats,
+    registry_values,
+    specialization,
+    top_performers,
+    yoy_changes,
+)
@@ -0,0 +1,188 @@
+"""Per-user roles and the slice of the data each user may see.
+
+Users are configured in the Streamlit secrets, one table per user:
+
+    [users.jsmith]
+    password = "..."
+    role = "registry_manager"          # admin, executive or registry_manager
+    registries = ["Liverpool"]
+    lists = ["Private Tenancy"]        # optional; every list when omitted
+
+A login resolves to a `Scope` once. The dashboard keeps it in the session and
+applies it where data is read: `scope_data` keeps only the registry and list
+columns the scope allows (so the cube built from it only holds their cells),
+and `scope_cells` / `scope_counts` do the same for the case-level stores,
+refusing any store that lacks a dimension the scope restricts.
+State-wide tenancy tables have no registry breakdown; they stay visible to
+every scope that includes Private Tenancy and are emptied otherwise.
+"""
+import copy
+import hmac
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .data import REGISTRY_LISTS, Dataset, registry_columns
+from .metrics import LIST_LABELS
+
+ROLES = ('admin', 'executive', 'registry_manager')
+
+TENANCY_LIST = 'Private Tenancy'
+
+# State-wide tables that only cover the private tenancy list
+TENANCY_TABLES = ('df_tenancy', 'df_categories', 'df_parties', 'df_party_categories')
+
+# `df_other_lists` column -> list name
+_LIST_COLUMNS = {**LIST_LABELS, 'Tenancy': TENANCY_LIST}
+
+
+class Scope(namedtuple('Scope', ['user', 'role', 'registries', 'lists'])):
+    """A signed-in user's role and the registries and lists they may see (`None` for all)."""
+    __slots__ = ()
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+    @property
+    def unrestricted(self):
+        return self.registries is None and self.lists is None
+
+    def allows_registry(self, registry):
+        return self.registries is None or registry in self.registries
+
+    def allows_list(self, list_type):
+        return self.lists is None or list_type in self.lists
+
+    def describe(self):
+        parts = [self.role.replace('_', ' ')]
+        if self.registries is not None:
+            parts.append(', '.join(self.registries))
+        if self.lists is not None:
+            parts.append(', '.join(self.lists))
+        return ' · '.join(parts)
+
+
+def parse_users(config):
+    """Returns `{username: (password, Scope)}` from the `users` secrets section.
+
+    Raises `ValueError` for an unknown role or a registry manager without registries.
+    """
+    users = {}
+    for user, entry in dict(config).items():
+        role = entry.get('role', 'executive')
+        if role not in ROLES:
+            raise ValueError(f"User '{user}': unknown role '{role}' (expected one of {', '.join(ROLES)})")
+        registries = entry.get('registries')
+        lists = entry.get('lists')
+        if role == 'registry_manager' and not registries:
+            raise ValueError(f"User '{user}': a registry manager needs at least one registry")
+        users[user] = (str(entry['password']), Scope(user, role,
+                                                     tuple(sorted(registries)) if registries else None,
+                                                     tuple(sorted(lists)) if lists else None))
+    return users
+
+
+def authenticate(users, username, password):
+    """Returns the `Scope` of `username` if `password` matches, else None."""
+    if username not in users:
+        return None
+    expected, scope = users[username]
+    return scope if hmac.compare_digest(expected.encode(), password.encode()) else None
+
+
+def scope_data(data, scope):
+    """Returns `data` with only the registry and list columns `scope` allows."""
+    if scope.unrestricted:
+        return data
+    tables = data._asdict()
+    for list_type, field in REGISTRY_LISTS.items():
+        df = tables[field]
+        keep = [c for c in registry_columns(df) if scope.allows_registry(c)] if scope.allows_list(list_type) else []
+        tables[field] = df[['Year'] + keep]
+    totals = data.df_total_ccd
+    tables['df_total_ccd'] = totals[['Year'] + [c for c in registry_columns(totals) if scope.allows_registry(c)]]
+    lists = data.df_other_lists
+    tables['df_other_lists'] = lists[['Year'] + [c for c in registry_columns(lists)
+                                                 if scope.allows_list(_LIST_COLUMNS.get(c, c))]]
+    if not scope.allows_list(TENANCY_LIST):
+        for field in TENANCY_TABLES:
+            tables[field] = tables[field].iloc[:0]
+    return Dataset(**tables)
+
+
+def _check_dimensions(scope, dimensions):
+    # A restriction on a dimension the store does not carry cannot be applied; refuse rather than ignore it
+    missing = [dim for dim, restricted in (('Registry', scope.registries), ('List', scope.lists))
+               if restricted is not None and dim not in dimensions]
+    if missing:
+        raise ValueError(f"Cannot apply the scope of '{scope.user}': the data has no {' or '.join(missing)} dimension")
+
+
+def scope_cells(store, scope, cell):
+    """Returns a shallow copy of a per-cell store (`.cells` keyed by `cell` tuples) within `scope`.
+
+    Raises `ValueError` if `scope` restricts a dimension that `cell` lacks.
+    """
+    if store is None or scope.unrestricted:
+        return store
+    _check_dimensions(scope, cell)
+    registry = cell.index('Registry') if 'Registry' in cell else None
+    list_position = cell.index('List') if 'List' in cell else None
+    scoped = copy.copy(store)
+    scoped.cells = {key: value for key, value in store.cells.items()
+                    if (registry is None or scope.allows_registry(key[registry]))
+                    and (list_position is None or scope.allows_list(key[list_position]))}
+    return scoped
+
+
+def scope_counts(counts, scope):
+    """Returns the rows of a Series indexed by `Registry` and/or `List` within `scope`.
+
+    Raises `ValueError` if `scope` restricts a dimension the index lacks.
+    """
+    if counts is None or scope.unrestricted:
+        return counts
+    _check_dimensions(scope, counts.index.names)
+    mask = np.ones(len(counts), dtype=bool)
+    if 'Registry' in counts.index.names:
+        mask &= counts.index.get_level_values('Registry').map(scope.allows_registry).to_numpy(dtype=bool)
+    if 'List' in counts.index.names:
+        mask &= counts.index.get_level_values('List').map(scope.allows_list).to_numpy(dtype=bool)
+    return counts[mask]
+
+
+def scope_alerts(alerts, scope, registries, lists):
+    """Drops alerts whose series names one of `registries` or `lists` outside `scope`."""
+    if alerts.empty or scope.unrestricted:
+        return alerts
+    hidden = {r for r in registries if not scope.allows_registry(r)} | {l for l in lists if not scope.allows_list(l)}
+    return alerts[[not hidden.intersection(series.split(' / ')) for series in alerts['Series']]]
+
+
+def _visible(cells, scoped):
+    visible = {field.removeprefix('df_'): set(df.columns) for field, df in zip(scoped._fields, scoped) if len(df)}
+    return np.array([column in visible.get(table, ()) for table, column in zip(cells['Table'], cells['Column'])],
+                    dtype=bool)
+
+
+def scope_changes(changes, scoped):
+    """Keeps the changed cells (see `SnapshotStore.diff`) in tables and columns of the scoped `Dataset`."""
+    return changes[_visible(changes, scoped)]
+
+
+def scope_reconciliation(result, scope, scoped):
+    """Returns a `Reconciliation` with only the failing checks whose every cell is in the scoped `Dataset`.
+
+    Passing checks are dropped for a restricted scope: their cells are not
+    recorded, so a sum over registries outside the scope cannot be excluded.
+    """
+    if result is None or scope.unrestricted:
+        return result
+    flags = result.flags
+    hidden = pd.MultiIndex.from_frame(flags.loc[~_visible(flags, scoped), ['Check', 'Key']])
+    checks = result.checks[result.checks['Status'] != 'ok']
+    return result._replace(
+        checks=checks[~pd.MultiIndex.from_frame(checks[['Check', 'Row']]).isin(hidden)],
+        flags=flags[~pd.MultiIndex.from_frame(flags[['Check', 'Key']]).isin(hidden)])
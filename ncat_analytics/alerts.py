@@ -0,0 +1,229 @@
+"""Threshold alerts over registry, list and category series.
+
+A `Rule` names a series grain (`dims`, any subset of the cube dimensions),
+optional cube filters, a kind and a threshold:
+
+    yoy          |change on the previous year| in %      >= threshold
+    share_shift  |change in share of the year's total| in percentage points
+    zscore       |(value - mean of prior years) / std of prior years|
+
+Rules are read from `alert_rules.json` in the data directory (a list of
+objects with the `Rule` fields) and default to `DEFAULT_RULES`.
+
+`AlertScheduler` evaluates the rules in a daemon thread whenever the data or
+the rules change, so no user rerun ever pays for it, and appends the hits to
+`alert_log.csv` in the data directory, after a marker row that records the
+evaluation even when nothing fired. The dashboard only reads that log, for
+the current data and rules versions.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .cases import data_dir
+from .compare import consecutive_changes
+from .cube import MEASURE, build_cube
+from .data import data_version
+from .metrics import FULL_YEARS
+
+KINDS = ('yoy', 'share_shift', 'zscore')
+
+# `min_value` ignores series whose value (yoy: previous value) is below it
+Rule = namedtuple('Rule', ['name', 'kind', 'dims', 'threshold', 'filters', 'min_value'], defaults=({}, 0))
+
+DEFAULT_RULES = [
+    Rule('Category YoY spike', 'yoy', ('Category',), 50, min_value=100),
+    Rule('Registry list YoY spike', 'yoy', ('Registry', 'List'), 40, min_value=200),
+    Rule('Category share shift', 'share_shift', ('Category',), 3, min_value=100),
+    Rule('List share shift', 'share_shift', ('List',), 3),
+    Rule('Registry list outlier', 'zscore', ('Registry', 'List'), 3, min_value=200),
+]
+
+LOG_COLUMNS = ['Evaluated', 'Data_Version', 'Rules_Version', 'Rule', 'Kind', 'Series', 'Year',
+               'Value', 'Baseline', 'Score', 'Threshold']
+
+
+def rules_path():
+    return os.path.join(data_dir(), 'alert_rules.json')
+
+
+def log_path():
+    return os.path.join(data_dir(), 'alert_log.csv')
+
+
+def load_rules(path=None):
+    """Returns the rules in `path` (default `rules_path()`), or `DEFAULT_RULES` if there is no file."""
+    path = path or rules_path()
+    if not os.path.exists(path):
+        return list(DEFAULT_RULES)
+    with open(path) as f:
+        specs = json.load(f)
+    rules = [Rule(**{**spec, 'dims': tuple(spec['dims'])}) for spec in specs]
+    for rule in rules:
+        if rule.kind not in KINDS:
+            raise ValueError(f"Rule '{rule.name}' has unknown kind '{rule.kind}'; expected one of {KINDS}")
+        if rule.kind == 'share_shift' and not rule.dims:
+            raise ValueError(f"Rule '{rule.name}' needs at least one dimension to compute shares")
+    return rules
+
+
+def rules_version(rules):
+    return hashlib.sha1(repr(list(rules)).encode()).hexdigest()[:12]
+
+
+def _yoy(series, dims, min_value):
+    out = consecutive_changes(series, dims)
+    return out.assign(Value=out[MEASURE], Baseline=out['Previous'], Score=out['Change_%'],
+                      Eligible=out['Previous'] >= min_value)
+
+
+def _share_shift(series, dims, min_value):
+    share = series[MEASURE] / series.groupby('Year')[MEASURE].transform('sum') * 100
+    out = consecutive_changes(series.assign(Share=share), dims, measure='Share')
+    return out.assign(Value=out['Share'], Baseline=out['Previous'], Score=out['Change'],
+                      Eligible=out[MEASURE] >= min_value)
+
+
+def _zscore(series, dims, min_value):
+    out = consecutive_changes(series, dims)
+    values = out[MEASURE].astype(float)
+    # Running sums over each series give the mean and std of all prior years
+    groups = [out[d] for d in dims] or np.zeros(len(out))
+    prior = out.groupby(groups, sort=False).cumcount()
+    total = values.groupby(groups, sort=False).cumsum() - values
+    squares = (values ** 2).groupby(groups, sort=False).cumsum() - values ** 2
+    mean = total / prior.where(prior > 0)
+    std = np.sqrt(((squares - prior * mean ** 2) / (prior - 1).where(prior > 1)).clip(lower=0))
+    return out.assign(Value=values, Baseline=mean, Score=(values - mean) / std.where(std > 0),
+                      Eligible=(prior >= 3) & (values >= min_value))
+
+
+_SCORERS = {'yoy': _yoy, 'share_shift': _share_shift, 'zscore': _zscore}
+
+
+def evaluate(cube, rules, year=None):
+    """Returns one row per rule hit in `year` (default the last full year), largest breaches first.
+
+    Raises `KeyError` when a rule's dimensions and filters are not covered by the cube.
+    """
+    year = year or FULL_YEARS[1]
+    years = list(range(FULL_YEARS[0], year + 1))
+    hits = []
+    for rule in rules:
+        dims = list(rule.dims)
+        series = cube.query(('Year', *dims), Year=years, **rule.filters)
+        scored = _SCORERS[rule.kind](series, dims, rule.min_value)
+        scored = scored[(scored['Year'] == year) & scored['Eligible'] & (scored['Score'].abs() >= rule.threshold)]
+        if scored.empty:
+            continue
+        label = scored[dims].astype(str).agg(' / '.join, axis=1) if dims else 'All'
+        hits.append(pd.DataFrame({
+            'Rule': rule.name, 'Kind': rule.kind, 'Series': label, 'Year': year,
+            'Value': scored['Value'], 'Baseline': scored['Baseline'], 'Score': scored['Score'],
+            'Threshold': rule.threshold,
+        }))
+    if not hits:
+        return pd.DataFrame(columns=LOG_COLUMNS[3:])
+    out = pd.concat(hits, ignore_index=True)
+    severity = out['Score'].abs() / out['Threshold']
+    return out.iloc[np.argsort(-severity.to_numpy(), kind='stable')].reset_index(drop=True)
+
+
+def read_alert_log(path=None):
+    path = path or log_path()
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    return pd.read_csv(path)
+
+
+def logged_versions(log):
+    """Returns the (data version, rules version) pairs evaluated in `log`."""
+    return set(zip(log['Data_Version'].astype(str), log['Rules_Version'].astype(str)))
+
+
+def latest_alerts(log, data_version, rules_version):
+    """Returns the alerts from the most recent evaluation of `data_version` with `rules_version`.
+
+    Empty when those versions were not evaluated yet or raised no alerts.
+    """
+    log = log[(log['Data_Version'].astype(str) == data_version) & (log['Rules_Version'].astype(str) == rules_version)]
+    if log.empty:
+        return log.reset_index(drop=True)
+    latest = log[log['Evaluated'] == log['Evaluated'].max()]
+    # Marker rows leave `Year` empty, so it is read back as float
+    return latest[latest['Rule'].notna()].astype({'Year': 'int64'}).reset_index(drop=True)
+
+
+def append_alert_log(alerts, data_version, rules_version, path=None):
+    """Appends one evaluation's alerts after a marker row with no `Rule`, so evaluations without alerts are logged too."""
+    path = path or log_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    marker = pd.DataFrame([{'Rule': None}], columns=LOG_COLUMNS[3:])
+    rows = pd.concat([marker, alerts], ignore_index=True) if len(alerts) else marker
+    stamped = rows.assign(Evaluated=pd.Timestamp.now().isoformat(timespec='seconds'),
+                          Data_Version=data_version, Rules_Version=rules_version)[LOG_COLUMNS]
+    stamped.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+
+class AlertScheduler:
+    """Evaluates alert rules in a background thread after every data refresh.
+
+    `load` returns a `Dataset`; every `interval` seconds (or immediately after
+    `notify()`) the scheduler reloads it and, if its `data_version` or the
+    rules changed since the last evaluation, rebuilds the cube, evaluates the
+    rules and appends the hits to the alert log. A version pair already in the
+    log (e.g. after a restart) is not evaluated again.
+    """
+
+    def __init__(self, load, interval=300, rules_file=None, log_file=None):
+        self.load = load
+        self.interval = interval
+        self.rules_file = rules_file
+        self.log_file = log_file
+        self.evaluated = None
+        self.last_run = None
+        self.last_error = None
+        self._wake = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Runs one evaluation if the data or rules changed; returns True if it evaluated."""
+        try:
+            data = self.load()
+            rules = load_rules(self.rules_file)
+            versions = (data_version(data), rules_version(rules))
+            if versions == self.evaluated:
+                return False
+            if versions not in logged_versions(read_alert_log(self.log_file)):
+                start = time.perf_counter()
+                alerts = evaluate(build_cube(data), rules)
+                append_alert_log(alerts, *versions, path=self.log_file)
+                self.last_run = time.perf_counter() - start
+            self.evaluated = versions
+            self.last_error = None
+            return True
+        except Exception as exc:  # keep the thread alive; the dashboard shows the error
+            self.last_error = exc
+            return False
+
+    def _run(self):
+        while True:
+            self.check()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def notify(self):
+        """Wakes the scheduler so a data refresh is picked up without waiting for `interval`."""
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='ncat-alerts', daemon=True)
+            self._thread.start()
+        return self
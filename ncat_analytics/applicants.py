@@ -0,0 +1,115 @@
+"""Repeat-applicant analytics over the case-level `cases` extract.
+
+One `HyperLogLog` (distinct applicants) and one `MisraGries` summary (top
+filers) is kept per (Year, Registry, List, Category) cell. Building the store is a
+single streaming pass over the extract; any slice is then answered by merging
+the sketches of the cells it covers.
+"""
+import pickle
+
+import pandas as pd
+
+from .cases import iter_chunks, with_year
+from .sketches import HyperLogLog, MisraGries, hash_values
+
+CELL = ('Year', 'Registry', 'List', 'Category')
+
+
+def normalize_applicants(names):
+    """Upper-cases and collapses whitespace so spelling variants count once."""
+    return names.astype(str).str.strip().str.replace(r'\s+', ' ', regex=True).str.upper()
+
+
+class ApplicantSketches:
+    """Per-cell distinct-applicant and heavy-hitter sketches."""
+
+    def __init__(self, p=12, k=200):
+        self.p = p
+        self.k = k
+        self.cells = {}
+
+    def _cell(self, key):
+        if key not in self.cells:
+            self.cells[key] = (HyperLogLog(self.p), MisraGries(self.k))
+        return self.cells[key]
+
+    def update(self, chunk):
+        """Adds a chunk of case rows (needs `Lodged` or `Year`, `Registry`, `List`, `Category`, `Applicant`)."""
+        if 'Year' not in chunk:
+            chunk = with_year(chunk)
+        chunk = chunk.dropna(subset=['Applicant']).reset_index(drop=True)
+        names = normalize_applicants(chunk['Applicant'])
+        hashes = hash_values(names)
+        for key, positions in chunk.groupby(list(CELL), sort=False).indices.items():
+            hll, heavy = self._cell(key)
+            hll.add_hashes(hashes[positions])
+            heavy.add_counts(names.iloc[positions].value_counts())
+        return self
+
+    def keys(self, years=None, registries=None, lists=None, categories=None):
+        filters = (years, registries, lists, categories)
+        return [key for key in self.cells
+                if all(values is None or value in values for value, values in zip(key, filters))]
+
+    def merged(self, years=None, registries=None, lists=None, categories=None):
+        """Returns the (HyperLogLog, MisraGries) pair for the slice."""
+        hll, heavy = HyperLogLog(self.p), MisraGries(self.k)
+        for key in self.keys(years, registries, lists, categories):
+            cell_hll, cell_heavy = self.cells[key]
+            hll.merge(cell_hll)
+            heavy.merge(cell_heavy)
+        return hll, heavy
+
+    def summary(self, by=None, top_n=10, years=None, registries=None, lists=None, categories=None):
+        """Returns filings, estimated distinct applicants and top-`top_n` share.
+
+        With `by` (one of `CELL`) there is one row per value of that
+        dimension; otherwise a single row for the whole slice.
+        """
+        keys = self.keys(years, registries, lists, categories)
+        if by is None:
+            groups = {'All': keys}
+        else:
+            position = CELL.index(by)
+            groups = {}
+            for key in keys:
+                groups.setdefault(key[position], []).append(key)
+        rows = []
+        for value, group_keys in sorted(groups.items()):
+            hll, heavy = HyperLogLog(self.p), MisraGries(self.k)
+            for key in group_keys:
+                hll.merge(self.cells[key][0])
+                heavy.merge(self.cells[key][1])
+            distinct = max(hll.estimate(), 1)
+            rows.append({
+                by or 'Slice': value,
+                'Filings': heavy.total,
+                'Distinct_Applicants': int(round(distinct)),
+                'Filings_per_Applicant': heavy.total / distinct,
+                f'Top_{top_n}_Share_%': heavy.top(top_n).sum() / heavy.total * 100 if heavy.total else 0.0,
+            })
+        return pd.DataFrame(rows)
+
+    def top_filers(self, n=10, years=None, registries=None, lists=None, categories=None):
+        """Returns the `n` heaviest filers in the slice with lower-bound filing counts."""
+        _, heavy = self.merged(years, registries, lists, categories)
+        top = heavy.top(n).rename_axis('Applicant').reset_index(name='Filings')
+        top['Max_Undercount'] = int(heavy.error)
+        return top
+
+    @classmethod
+    def from_extract(cls, name='cases', chunksize=500_000, directory=None, **kwargs):
+        store = cls(**kwargs)
+        columns = ['Lodged', 'Registry', 'List', 'Category', 'Applicant']
+        for chunk in iter_chunks(name, columns=columns, chunksize=chunksize, directory=directory):
+            store.update(chunk)
+        return store
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
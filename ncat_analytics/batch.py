@@ -0,0 +1,15 @@
+"""Run dashboard computations over many data snapshots in a process pool."""
+from concurrent.futures import ProcessPoolExecutor
+
+
+def map_snapshots(func, snapshots, max_workers=None):
+    """Applies `func` to every snapshot in a process pool and returns the results in order.
+
+    `func` must be a module-level callable so it can be pickled, e.g.
+    `map_snapshots(summarise, [load_data(), ...])`.
+    """
+    snapshots = list(snapshots)
+    if len(snapshots) <= 1:
+        return [func(snapshot) for snapshot in snapshots]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(func, snapshots))
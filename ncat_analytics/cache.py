@@ -0,0 +1,192 @@
+"""Persistent, content-addressed result cache shared by worker processes.
+
+`st.cache_data` lives in one process, so every restart starts cold. A
+`DiskCache` keeps pickled results under `NCAT_CACHE_DIR` (default
+`<data dir>/cache`), one file per key:
+
+* keys are SHA-256 digests of a namespace plus key parts, which callers make
+  from content (`data_version`, extract signatures, `code_version`), so a new
+  data or code version simply misses;
+* writes go to a temporary file that is renamed into place, so a reader in
+  another process sees either the whole entry or none;
+* a hit touches the file's mtime, and when the cache grows past `max_bytes`
+  the least recently used entries are deleted under an exclusive lock, so
+  only one process evicts at a time.
+"""
+import datetime
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .cases import data_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is not serialised between processes
+    fcntl = None
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def cache_dir():
+    return os.environ.get('NCAT_CACHE_DIR', os.path.join(data_dir(), 'cache'))
+
+
+def code_version(*paths):
+    """Returns a short hash of the `ncat_analytics` sources plus any extra `paths`."""
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(_PACKAGE_DIR, '*.py'))) + list(paths):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+# Values whose repr is complete and stable, so it can stand for their content
+_SCALARS = (type(None), bool, int, float, complex, str, bytes, np.generic,
+            datetime.date, datetime.time, datetime.timedelta, pd.Timestamp, pd.Timedelta, range)
+
+
+def fingerprint(value):
+    """Returns a stable digest of `value`; DataFrames, Series, Indexes and arrays are hashed by content.
+
+    Raises `TypeError` for a value of any other type, whose repr may be
+    abbreviated or include its id; callers then skip the cache.
+    """
+    digest = hashlib.sha256()
+
+    def update(v):
+        if isinstance(v, pd.DataFrame):
+            digest.update(repr(('DataFrame', list(v.columns), list(v.dtypes.astype(str)))).encode())
+            digest.update(pd.util.hash_pandas_object(v, index=True).to_numpy().tobytes())
+        elif isinstance(v, pd.Series):
+            digest.update(repr(('Series', v.name, str(v.dtype))).encode())
+            digest.update(pd.util.hash_pandas_object(v, index=True).to_numpy().tobytes())
+        elif isinstance(v, pd.Index):
+            digest.update(repr(('Index', list(v.names), str(v.dtype))).encode())
+            digest.update(pd.util.hash_pandas_object(v).to_numpy().tobytes())
+        elif isinstance(v, np.ndarray):
+            digest.update(repr(('ndarray', str(v.dtype), v.shape)).encode())
+            if v.dtype.hasobject:
+                # Object arrays hold pointers; hash the values they point to
+                digest.update(pd.util.hash_pandas_object(pd.Series(v.ravel()), index=False).to_numpy().tobytes())
+            else:
+                digest.update(np.ascontiguousarray(v).tobytes())
+        elif isinstance(v, dict):
+            digest.update(b'{')
+            for k in sorted(v, key=repr):
+                update(k)
+                update(v[k])
+            digest.update(b'}')
+        elif isinstance(v, (list, tuple)):
+            digest.update(b'[')
+            for item in v:
+                update(item)
+            digest.update(b']')
+        elif isinstance(v, _SCALARS):
+            digest.update(repr(v).encode())
+        else:
+            raise TypeError(f"Cannot fingerprint a {type(v).__name__}")
+        digest.update(b'\0')
+
+    update(value)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Pickled results on disk with a size cap and least-recently-used eviction."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or cache_dir()
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('NCAT_CACHE_MAX_MB', 512)) * 2 ** 20)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._bytes = self._scan()[1]
+
+    def key(self, namespace, *parts):
+        return hashlib.sha256(f'{namespace}\0{fingerprint(parts)}'.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.pkl')
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Missing, evicted by another process meanwhile, or unreadable
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._bytes += os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, namespace, parts, compute):
+        """Returns the cached result for `(namespace, *parts)`, computing and storing it on a miss."""
+        key = self.key(namespace, *parts)
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def _scan(self):
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*', '*.pkl')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries, sum(size for _, size, _ in entries)
+
+    def evict(self, target=0.9):
+        """Deletes least recently used entries until the cache is under `target` x `max_bytes`."""
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Temporary files left behind by processes that died mid-write
+            for tmp in glob.glob(os.path.join(self.directory, '*', '*.tmp')):
+                try:
+                    if os.path.getmtime(tmp) < time.time() - 3600:
+                        os.unlink(tmp)
+                except OSError:
+                    pass
+            entries, total = self._scan()
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * target:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+            self._bytes = total
+
+    def stats(self):
+        entries, total = self._scan()
+        return {'entries': len(entries), 'bytes': total, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,144 @@
+"""Monte Carlo workload and capacity needs per registry.
+
+Staffing is driven by hearings and member hours, not applications. For each
+registry and list, `simulate` draws
+
+    applications   ~ Poisson(volume x (1 + growth))
+    hearing rate   ~ Gamma with the list's mean hearings per application and CV
+    hearings       ~ Poisson(applications x hearing rate)
+    hours/hearing  ~ Triangular(low, mode, high) for the list
+
+The hearing rate and hours per hearing are drawn once per list and draw, so
+their uncertainty moves every registry together, as a practice change would.
+Member hours divided by the sitting hours of one full-time member give FTE.
+All draws of a chunk are one vectorised (draws x registries x lists) array;
+chunks can be spread over a process pool, and each chunk has its own seed
+from `np.random.SeedSequence`, so a seed gives the same result with or
+without the pool. Percentiles of totals are taken over the summed draws,
+not summed from registry percentiles.
+
+`DEFAULT_EFFORT` is a starting point to be replaced with listing-system
+figures; the dashboard lets users edit it.
+"""
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data import registry_columns, registry_lists
+
+Effort = namedtuple('Effort', ['hearings', 'hearings_cv', 'hours_low', 'hours_mode', 'hours_high'])
+
+# List -> hearings per application (mean, CV) and member hours per hearing (low, mode, high)
+DEFAULT_EFFORT = {
+    'Private Tenancy': Effort(1.2, 0.15, 0.25, 0.5, 1.0),
+    'Social Housing': Effort(1.3, 0.15, 0.25, 0.5, 1.0),
+    'General': Effort(1.5, 0.2, 0.5, 1.0, 2.5),
+    'Home Building': Effort(2.5, 0.25, 1.0, 2.5, 6.0),
+    'Strata Schemes': Effort(1.8, 0.2, 0.5, 1.5, 3.0),
+    'Motor Vehicles': Effort(1.3, 0.15, 0.5, 0.75, 1.5),
+    'Commercial': Effort(1.5, 0.2, 0.5, 1.0, 2.0),
+    'Residential Communities': Effort(1.6, 0.2, 0.5, 1.0, 2.5),
+    'Retirement Villages': Effort(1.6, 0.2, 0.5, 1.0, 2.5),
+    'Other': Effort(1.3, 0.2, 0.5, 0.75, 1.5),
+}
+
+# Total CCD applications not published under any per-registry list
+OTHER = 'Other'
+
+# Hearing hours one full-time member sits in a year
+SITTING_HOURS = 1100
+
+PERCENTILES = (50, 90)
+
+CHUNK_DRAWS = 5000
+
+Simulation = namedtuple('Simulation', ['summary', 'total_fte', 'seconds'])
+
+
+def registry_volumes(data, year, include_other=True):
+    """Returns a Registry x List frame of `year` applications.
+
+    With `include_other`, each registry's Total CCD not covered by the list
+    tables is added as an `Other` list.
+    """
+    frames = {list_type: df[df['Year'] == year].set_index('Year')[registry_columns(df)].sum()
+              for list_type, df in registry_lists(data).items() if registry_columns(df)}
+    volumes = pd.DataFrame(frames).fillna(0)
+    if include_other:
+        totals = data.df_total_ccd[data.df_total_ccd['Year'] == year].set_index('Year')
+        totals = totals[registry_columns(totals)].sum()
+        volumes = volumes.reindex(volumes.index.union(totals.index), fill_value=0)
+        volumes[OTHER] = (totals.reindex(volumes.index, fill_value=0) - volumes.sum(axis=1)).clip(lower=0)
+    volumes.index.name = 'Registry'
+    return volumes[[c for c in volumes.columns if volumes[c].sum() > 0]]
+
+
+def _effort_arrays(lists, effort):
+    """Returns the `Effort` fields as arrays over `lists`; raises `ValueError` for an invalid profile."""
+    rows = []
+    for list_type in lists:
+        profile = Effort(*effort.get(list_type, DEFAULT_EFFORT.get(list_type, DEFAULT_EFFORT[OTHER])))
+        if min(profile) < 0 or not profile.hours_low <= profile.hours_mode <= profile.hours_high:
+            raise ValueError(f"{list_type}: effort must be non-negative with hours low <= mode <= high")
+        rows.append(profile)
+    return np.array(rows, dtype=float).reshape(len(lists), len(Effort._fields)).T
+
+
+def _triangular(rng, low, mode, high, size):
+    """Inverse-CDF triangular draws; unlike `Generator.triangular` a zero-width triangle is allowed."""
+    u = rng.random(size)
+    width = high - low
+    cut = np.divide(mode - low, width, out=np.zeros_like(width), where=width > 0)
+    return np.where(u < cut, low + np.sqrt(u * width * (mode - low)), high - np.sqrt((1 - u) * width * (high - mode)))
+
+
+def _simulate_chunk(volumes, effort_table, draws, seed):
+    """Returns (hearings, hours) drawn for each registry, each (draws x registries)."""
+    rng = np.random.default_rng(seed)
+    hearings_mean, cv, low, mode, high = effort_table
+    lists = len(cv)
+    applications = rng.poisson(volumes, size=(draws, *volumes.shape))
+    # Gamma with mean `hearings_mean` and coefficient of variation `cv`; a zero CV is the mean itself
+    shape = 1 / np.maximum(cv, 1e-6) ** 2
+    rate = np.where(cv > 0, rng.gamma(shape, hearings_mean / shape, size=(draws, lists)), hearings_mean)
+    hearings = rng.poisson(applications * rate[:, None, :])
+    hours = hearings * _triangular(rng, low, mode, high, (draws, lists))[:, None, :]
+    return hearings.sum(axis=2), hours.sum(axis=2)
+
+
+def simulate(volumes, effort=None, draws=20_000, growth=0.0, sitting_hours=SITTING_HOURS, seed=0,
+             max_workers=1, chunk_draws=CHUNK_DRAWS):
+    """Returns a `Simulation` of hearings, member hours and FTE per registry.
+
+    `volumes` is a Registry x List frame (see `registry_volumes`); `effort`
+    maps lists to `Effort` and falls back to `DEFAULT_EFFORT`. `max_workers`
+    above 1 runs the chunks of `chunk_draws` draws in a process pool.
+    """
+    start = time.perf_counter()
+    effort_table = _effort_arrays(list(volumes.columns), effort or {})
+    expected = volumes.to_numpy(dtype=float) * (1 + growth)
+    sizes = [min(chunk_draws, draws - first) for first in range(0, draws, chunk_draws)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(expected, effort_table, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    if max_workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*chunk_args) for chunk_args in args]
+    hearings = np.concatenate([c[0] for c in chunks])
+    hours = np.concatenate([c[1] for c in chunks])
+
+    # The total is one more "registry": percentiles of the summed draws
+    registries = list(volumes.index) + ['Total']
+    hearings = np.column_stack([hearings, hearings.sum(axis=1)])
+    hours = np.column_stack([hours, hours.sum(axis=1)])
+    summary = pd.DataFrame({'Registry': registries,
+                            'Applications': np.append(expected.sum(axis=1), expected.sum())})
+    for name, values in (('Hearings', hearings), ('Hours', hours), ('FTE', hours / sitting_hours)):
+        summary[f'{name}_Mean'] = values.mean(axis=0)
+        for p, row in zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=0)):
+            summary[f'{name}_P{p}'] = row
+    return Simulation(summary, hours[:, -1] / sitting_hours, time.perf_counter() - start)
@@ -0,0 +1,79 @@
+"""Case-level extracts.
+
+The annual-report tables only carry counts. Case-level analyses read
+extracts from the data directory (`NCAT_DATA_DIR`, default `./data`), where
+each extract is `<name>.csv`, `<name>.parquet` or a `<name>/` directory of
+such files (e.g. one file per month of lodgements).
+
+`cases` extract columns:
+
+    Case_ID     unique case number
+    Lodged      lodgement date
+    Registry    registry the case was lodged at
+    List        NCAT list (e.g. "Private Tenancy")
+    Category    application category display name (see `CATEGORY_LABELS`)
+    Party       applicant type: Landlord, Tenant or Other
+    Applicant   applicant name or agent identifier
+    Address     address of the rented property, free-form (only read by `linkage`)
+    Description free-text summary of the application (only read by `search`)
+"""
+import glob
+import os
+
+import pandas as pd
+
+CASE_COLUMNS = ['Case_ID', 'Lodged', 'Registry', 'List', 'Category', 'Party', 'Applicant']
+
+
+def data_dir():
+    return os.environ.get('NCAT_DATA_DIR', 'data')
+
+
+def extract_files(name, directory=None):
+    """Returns the files making up extract `name`, in name order."""
+    directory = directory or data_dir()
+    files = []
+    for ext in ('csv', 'parquet'):
+        files += glob.glob(os.path.join(directory, f'{name}.{ext}'))
+        files += glob.glob(os.path.join(directory, name, f'*.{ext}'))
+    return sorted(files)
+
+
+def has_extract(name, directory=None):
+    return bool(extract_files(name, directory))
+
+
+def extract_signature(name, directory=None):
+    """Returns (path, size, mtime) for each file of `name`; changes whenever the extract does."""
+    return tuple((path, os.path.getsize(path), os.path.getmtime(path))
+                 for path in extract_files(name, directory))
+
+
+def iter_chunks(name, columns=None, chunksize=500_000, directory=None):
+    """Yields extract `name` as DataFrames of at most `chunksize` rows.
+
+    Only one chunk is held in memory at a time, so extracts larger than
+    memory can be streamed through the sketch and digest builders.
+    """
+    for path in extract_files(name, directory):
+        yield from iter_file_chunks(path, columns, chunksize)
+
+
+def iter_file_chunks(path, columns=None, chunksize=500_000):
+    """Yields one extract file as DataFrames of at most `chunksize` rows."""
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+        return
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        # Without pyarrow fall back to whole-file reads
+        yield pd.read_parquet(path, columns=columns)
+        return
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+        yield batch.to_pandas()
+
+
+def with_year(chunk, date_col='Lodged'):
+    """Adds an integer `Year` column derived from `date_col`."""
+    return chunk.assign(Year=pd.to_datetime(chunk[date_col]).dt.year)
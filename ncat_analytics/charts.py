@@ -0,0 +1,165 @@
+"""Compact Plotly payloads.
+
+`optimize_figure` rewrites a figure before it is sent to the browser:
+
+* per-point arrays become narrow NumPy arrays, which Plotly (>= 6)
+  serialises as base64 typed arrays instead of JSON number lists;
+* line traces longer than `max_points` are downsampled with
+  largest-triangle-three-buckets (LTTB), which keeps peaks and troughs;
+* scatter traces longer than `webgl_threshold` switch to `scattergl`.
+
+`CachedExpress` keeps the specs of `plotly.express` figures in a persistent
+`DiskCache`, keyed by the content of the call's arguments.
+
+`FigureScheduler` builds a page's independent figures on a bounded thread
+pool, including `optimize_figure` and the payload measurement, so the page
+can reserve their places up front and draw each one as soon as it is ready.
+Build functions must not call Streamlit: only the script thread draws.
+
+This module imports Plotly, so it is not imported by `ncat_analytics` itself.
+"""
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import plotly
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+POINT_ARRAYS = ('x', 'y', 'text', 'hovertext', 'customdata')
+
+BuiltFigure = namedtuple('BuiltFigure', ['figure', 'payload_bytes', 'seconds'])
+
+
+def lttb_indices(x, y, n_out):
+    """Returns the indices of `n_out` points chosen by largest-triangle-three-buckets."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Buckets for the interior points; first and last points are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def _numeric(values):
+    """Returns `values` as a float array, mapping datetimes to epoch nanoseconds, or None."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    if values.dtype.kind in 'iuf':
+        return values.astype(float)
+    return None
+
+
+def _compact(values):
+    """Returns numeric `values` in the narrowest dtype that holds them exactly."""
+    array = np.asarray(values)
+    if array.dtype.kind == 'f' and np.all(np.isfinite(array)) and np.all(array == np.round(array)):
+        array = array.astype(np.int64)
+    if array.dtype.kind in 'iu' and len(array):
+        for dtype in (np.int8, np.int16, np.int32):
+            if np.iinfo(dtype).min <= array.min() and array.max() <= np.iinfo(dtype).max:
+                return array.astype(dtype)
+    if array.dtype.kind in 'iuf':
+        return array
+    return values
+
+
+def optimize_figure(fig, max_points=2000, webgl_threshold=1000):
+    """Returns a copy of `fig` with typed-array data, downsampled lines and WebGL traces."""
+    traces = []
+    for trace in fig.data:
+        spec = trace.to_plotly_json()
+        if spec.get('type') in ('scatter', 'scattergl') and spec.get('x') is not None and spec.get('y') is not None:
+            x, y = _numeric(spec['x']), _numeric(spec['y'])
+            stacked = spec.get('stackgroup') or spec.get('fill') not in (None, 'none')
+            n = len(spec['y'])
+            if n > max_points and x is not None and y is not None and not stacked:
+                keep = lttb_indices(x, y, max_points)
+                for key in POINT_ARRAYS:
+                    if spec.get(key) is not None and np.ndim(spec[key]) and len(spec[key]) == n:
+                        spec[key] = np.asarray(spec[key])[keep]
+            if spec['type'] == 'scatter' and n > webgl_threshold and not stacked:
+                spec['type'] = 'scattergl'
+        for key in ('x', 'y', 'z'):
+            if spec.get(key) is not None and np.ndim(spec[key]):
+                spec[key] = _compact(spec[key])
+        if spec.get('type') == 'scattergl':
+            traces.append(go.Scattergl(spec, skip_invalid=True))
+        else:
+            traces.append(spec)
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def payload_bytes(fig):
+    """Returns the size of the JSON that is shipped to the browser for `fig`."""
+    return len(pio.to_json(fig, validate=False).encode())
+
+
+class CachedExpress:
+    """`plotly.express` with figures cached in a `DiskCache`.
+
+    Chart functions are keyed by the content of their arguments (DataFrames
+    are hashed, not identified), so `cached.bar(df, x='Year', ...)` returns a
+    figure rebuilt from the stored spec whenever the same call was made
+    before, in this process or any earlier one. Calls with an argument
+    `fingerprint` cannot hash are built directly. Other attributes, such as
+    `colors`, pass through to `plotly.express`.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getattr__(self, name):
+        func = getattr(px, name)
+        if not callable(func) or name[0].isupper() or name.startswith('_'):
+            return func
+
+        def chart(*args, **kwargs):
+            try:
+                key = self.cache.key(f'px.{name}', plotly.__version__, args, kwargs)
+            except TypeError:
+                # An argument that cannot be hashed by content is never served from the cache
+                return func(*args, **kwargs)
+            spec = self.cache.get(key)
+            if spec is None:
+                spec = func(*args, **kwargs).to_plotly_json()
+                self.cache.set(key, spec)
+            return go.Figure(spec)
+
+        return chart
+
+
+class FigureScheduler:
+    """Builds figures on a bounded thread pool shared by every session."""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='figures')
+
+    @staticmethod
+    def _build(build):
+        start = time.perf_counter()
+        fig = optimize_figure(build())
+        return BuiltFigure(fig, payload_bytes(fig), time.perf_counter() - start)
+
+    def submit(self, build):
+        """Returns a future of the `BuiltFigure` for `build()`, which returns a Plotly figure."""
+        return self.pool.submit(self._build, build)
@@ -0,0 +1,220 @@
+"""Cross-list correlation and lead-lag analysis over List x Registry series.
+
+Each series is the volume of one list at one registry, annually from the
+per-registry tables (`annual_series`) or monthly from the `cases` extract
+(`monthly_counts` / `monthly_series`). `lead_lag` correlates every pair of
+series at every lag from 0 to `max_lag` in one batch: per lag, the windows
+of all series are standardised together and a single matrix product gives
+the correlations of all pairs, so thousands of monthly series take one BLAS
+call per lag instead of a Python loop over millions of pairs.
+
+By default series are compared on their period-on-period changes, so shared
+trends (such as the 2020 dip) do not make every pair look correlated. A
+positive lag means the first series of a pair leads the second.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from .cases import iter_chunks
+from .data import registry_columns, registry_lists
+from .metrics import FULL_YEARS
+
+SERIES_KEYS = ['List', 'Registry']
+
+# Pairs need at least this many overlapping periods to be correlated
+MIN_PERIODS = 4
+
+PAIR_COLUMNS = ['Leader', 'Follower', 'Lag', 'Correlation', 'Same_Period']
+
+
+def series_label(key):
+    return ' · '.join(key)
+
+
+def annual_series(data, years=FULL_YEARS):
+    """Returns the per-registry list volumes of `data` as a (List, Registry) x Year frame.
+
+    Only the full years in `years` are kept; the partial first and last
+    years would otherwise dominate every correlation with their coverage jumps.
+    """
+    frames = {list_type: df[df['Year'].between(*years)].set_index('Year')[registry_columns(df)].T
+              for list_type, df in registry_lists(data).items() if registry_columns(df)}
+    if not frames:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=SERIES_KEYS))
+    series = pd.concat(frames, names=SERIES_KEYS)
+    return series[sorted(series.columns)].astype(float)
+
+
+def monthly_counts(cases='cases', chunksize=500_000, directory=None):
+    """Returns lodgements indexed by (List, Registry, Month) from the `cases` extract."""
+    totals = None
+    for chunk in iter_chunks(cases, columns=['Lodged', 'Registry', 'List'], chunksize=chunksize, directory=directory):
+        month = pd.to_datetime(chunk['Lodged']).dt.to_period('M').dt.to_timestamp()
+        counts = chunk.assign(Month=month).groupby(SERIES_KEYS + ['Month']).size()
+        totals = counts if totals is None else totals.add(counts, fill_value=0)
+    if totals is None:
+        return pd.Series(dtype='int64', index=pd.MultiIndex.from_arrays([[]] * 3, names=SERIES_KEYS + ['Month']))
+    return totals.astype('int64')
+
+
+def monthly_series(counts):
+    """Returns `monthly_counts` as a (List, Registry) x Month frame; months without lodgements are 0."""
+    if counts.empty:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=SERIES_KEYS))
+    series = counts.unstack('Month')
+    months = pd.date_range(series.columns.min(), series.columns.max(), freq='MS')
+    return series.reindex(columns=months).fillna(0).astype(float)
+
+
+def _standardise(values):
+    """Returns each row as z-scores with missing values at 0 (the row mean), and rows with variance."""
+    observed = np.isfinite(values)
+    n = observed.sum(axis=1)
+    filled = np.where(observed, values, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = filled.sum(axis=1) / n
+        centred = np.where(observed, values - mean[:, None], 0.0)
+        std = np.sqrt((centred ** 2).sum(axis=1) / n)
+        valid = (n >= MIN_PERIODS) & (std > 0)
+        z = centred / np.where(valid, std, 1.0)[:, None]
+    z[~valid] = 0.0
+    return z.astype(np.float32), valid
+
+
+def _windows(values, max_lag):
+    """Returns (lag, leading window, trailing window, periods) with both windows standardised, per lag."""
+    windows = []
+    for lag in range(max_lag + 1):
+        periods = values.shape[1] - lag
+        if periods >= MIN_PERIODS:
+            windows.append((lag, _standardise(values[:, :periods]), _standardise(values[:, lag:]), periods))
+    return windows
+
+
+def _correlate(first, second, periods, rows, columns=slice(None)):
+    """Returns corr(first[rows], second[columns]) of standardised windows, NaN where either has no variance."""
+    (a, a_valid), (b, b_valid) = first, second
+    corr = a[rows] @ b[columns].T
+    corr /= np.float32(periods)
+    corr[~a_valid[rows]] = np.nan
+    corr[:, ~b_valid[columns]] = np.nan
+    return np.clip(corr, -1, 1, out=corr)
+
+
+def _prepare(series, changes):
+    values = series.to_numpy(dtype=np.float64)
+    return np.diff(values, axis=1) if changes else values
+
+
+class LeadLag:
+    """Pairwise same-period and best-lag correlations of a set of series."""
+
+    def __init__(self, keys, same_period, best, best_lag, max_lag, changes, seconds):
+        self.keys = keys
+        self.labels = [series_label(key) for key in keys]
+        self.same_period = same_period
+        self.best = best
+        self.best_lag = best_lag
+        self.max_lag = max_lag
+        self.changes = changes
+        self.seconds = seconds
+
+    def __len__(self):
+        return len(self.keys)
+
+    def select(self, lists=None):
+        """Returns the positions of the series on `lists` (all when None)."""
+        if lists is None:
+            return np.arange(len(self.keys))
+        lists = set(lists)
+        return np.array([i for i, key in enumerate(self.keys) if key[0] in lists], dtype=int)
+
+    def matrix(self, kind='same_period', lists=None):
+        """Returns the `same_period`, `best` or `best_lag` matrix as a labelled DataFrame."""
+        positions = self.select(lists)
+        labels = [self.labels[i] for i in positions]
+        return pd.DataFrame(getattr(self, kind)[np.ix_(positions, positions)], index=labels, columns=labels)
+
+    def pairs(self, top=50, lists=None, cross_list=False, min_lag=0):
+        """Returns the `top` pairs by absolute best-lag correlation, leader first.
+
+        `cross_list` keeps only pairs on different lists; `min_lag` drops pairs
+        whose strongest relation is at a shorter lag.
+        """
+        positions = self.select(lists)
+        first, second = np.triu_indices(len(positions), k=1)
+        first, second = positions[first], positions[second]
+        lag = self.best_lag[first, second]
+        corr = self.best[first, second]
+        keep = np.isfinite(corr) & (np.abs(lag) >= min_lag)
+        if cross_list:
+            list_of = np.array([key[0] for key in self.keys], dtype=object)
+            keep &= list_of[first] != list_of[second]
+        first, second, lag, corr = first[keep], second[keep], lag[keep], corr[keep]
+        if len(corr) > top:
+            chosen = np.argpartition(-np.abs(corr), top - 1)[:top]
+            first, second, lag, corr = first[chosen], second[chosen], lag[chosen], corr[chosen]
+        order = np.argsort(-np.abs(corr), kind='stable')
+        first, second, lag, corr = first[order], second[order], lag[order], corr[order]
+        # A negative lag means the second series leads
+        leader, follower = np.where(lag >= 0, first, second), np.where(lag >= 0, second, first)
+        labels = np.array(self.labels, dtype=object)
+        return pd.DataFrame({
+            'Leader': labels[leader], 'Follower': labels[follower], 'Lag': np.abs(lag),
+            'Correlation': corr.astype(float), 'Same_Period': self.same_period[first, second].astype(float),
+        }, columns=PAIR_COLUMNS)
+
+
+def lead_lag(series, max_lag=1, changes=True, block_bytes=32 * 2 ** 20):
+    """Returns a `LeadLag` over the rows of a (List, Registry) x period frame.
+
+    Every pair is correlated at lags `-max_lag..max_lag`; the best lag of a
+    pair is the one with the largest absolute correlation (the shortest lag
+    on ties). Periods missing from a series count as its mean. Only pairs
+    above the diagonal are computed, in row blocks whose lag stack fits in
+    `block_bytes`; the rest is mirrored.
+    """
+    start = time.perf_counter()
+    values = _prepare(series, changes)
+    n = len(values)
+    windows = _windows(values, max_lag)
+    # Stack order 0, +1, -1, +2, -2, ...: argmax keeps the first maximum, so ties go to the shortest lag
+    lags = np.array([0] + [signed for lag, *_ in windows[1:] for signed in (lag, -lag)], dtype=np.int16)
+    same_period = np.full((n, n), np.nan, dtype=np.float32)
+    best = np.full((n, n), np.nan, dtype=np.float32)
+    best_lag = np.zeros((n, n), dtype=np.int16)
+    block = max(1, block_bytes // (4 * len(lags) * max(n, 1)))
+    for first in range(0, n if windows else 0, block):
+        rows, columns = slice(first, first + block), slice(first, n)
+        stack = np.empty((len(lags), len(values[rows]), n - first), dtype=np.float32)
+        for i, (lag, leading, trailing, periods) in enumerate(windows):
+            # +lag: the block's series lead the others; -lag: the others lead the block's
+            stack[max(2 * i - 1, 0)] = _correlate(leading, trailing, periods, rows, columns)
+            if lag:
+                stack[2 * i] = _correlate(trailing, leading, periods, rows, columns)
+        choice = np.nan_to_num(np.abs(stack), nan=-1.0).argmax(axis=0)
+        same_period[rows, columns] = stack[0]
+        best[rows, columns] = np.take_along_axis(stack, choice[None], axis=0)[0]
+        best_lag[rows, columns] = lags[choice]
+    for first in range(0, n, block):
+        # Mirror the computed upper triangle, block by block; a lead one way is a lag the other
+        rows, columns = slice(first, first + block), slice(0, first)
+        same_period[rows, columns] = same_period[columns, rows].T
+        best[rows, columns] = best[columns, rows].T
+        best_lag[rows, columns] = -best_lag[columns, rows].T
+    np.fill_diagonal(best, np.nan)
+    np.fill_diagonal(same_period, np.nan)
+    return LeadLag(list(series.index), same_period, best, best_lag, max_lag, changes, time.perf_counter() - start)
+
+
+def lag_profile(series, first, second, max_lag=1, changes=True):
+    """Returns the correlation of series `first` and `second` at each lag (positive: `first` leads)."""
+    values = _prepare(series.loc[[first, second]], changes)
+    profile = {}
+    for lag, leading, trailing, periods in _windows(values, max_lag):
+        profile[lag] = _correlate(leading, trailing, periods, slice(0, 1))[0, 1]
+        if lag:
+            profile[-lag] = _correlate(trailing, leading, periods, slice(0, 1))[0, 1]
+    return pd.Series(profile, name='Correlation', dtype=float).sort_index().rename_axis('Lag')
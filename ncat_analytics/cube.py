@@ -0,0 +1,196 @@
+"""Pre-aggregated cube over Year x Registry x List x Category x Party.
+
+The annual-report tables are published at different grains: per-registry
+list volumes, state-wide category volumes, category-by-party splits and so on.
+Each of these is a *source* with its own set of dimensions. For every source
+the cube materialises the full lattice of roll-ups once (each cuboid is
+aggregated from its smallest already-built parent, not from the raw facts),
+and `Cube.query` answers a group-by from the most specific source that covers
+the requested dimensions.
+
+Party per registry is not published. The `registry_party_estimate` source
+fills that gap explicitly: each registry's private tenancy volume is split by
+the state-wide category and party shares of its year. Estimate sources only
+answer slices that no published source covers, and `Cube.is_estimate` tells
+the caller so the figures can be labelled. A slice that no source covers
+raises `KeyError` rather than silently mixing grains. Case-level sources can
+be passed to `build_cube` to make exact slices available.
+"""
+import time
+from itertools import combinations
+
+import pandas as pd
+
+from .data import registry_lists
+from .metrics import LIST_LABELS, PARTY_CATEGORY_LABELS, melt_categories, normalize_party_categories
+
+DIMENSIONS = ('Year', 'Registry', 'List', 'Category', 'Party')
+MEASURE = 'Applications'
+
+# Drill-down path used by the dashboard
+DRILL_PATH = ('Registry', 'List', 'Category', 'Party')
+
+# `df_other_lists` calls private tenancy "Tenancy"; the per-registry tables do not
+_LIST_NAMES = {**LIST_LABELS, 'Tenancy': 'Private Tenancy'}
+
+# Sources derived under an assumption rather than published
+ESTIMATES = ('registry_party_estimate',)
+
+
+def registry_party_estimate(registry_facts, party_category_facts):
+    """Returns private tenancy volumes per (Year, Registry, List, Category, Party), estimated.
+
+    Each registry's volume is split by its year's state-wide category and
+    party shares, i.e. every registry is assumed to have the state's mix.
+    """
+    shares = party_category_facts.dropna(subset=['Category'])
+    shares = shares.assign(Share=shares[MEASURE] / shares.groupby('Year')[MEASURE].transform('sum'))
+    volumes = registry_facts[registry_facts['List'] == 'Private Tenancy']
+    estimate = volumes.merge(shares[['Year', 'Category', 'Party', 'Share']], on='Year')
+    return estimate.assign(**{MEASURE: estimate[MEASURE] * estimate['Share']}).drop(columns='Share')
+
+
+def dataset_facts(data):
+    """Returns the aggregate tables of `data` as fact sources, most specific first.
+
+    Each source is a long DataFrame with a subset of `DIMENSIONS` plus an
+    `Applications` column. Sources named in `ESTIMATES` come last.
+    """
+    registry_frames = []
+    for list_type, df in registry_lists(data).items():
+        long = df.melt(id_vars=['Year'], var_name='Registry', value_name=MEASURE)
+        long.insert(2, 'List', list_type)
+        registry_frames.append(long)
+
+    party_categories = normalize_party_categories(data.df_party_categories)
+    party_categories = party_categories.melt(id_vars=['Year', 'Category'], value_vars=['Landlord', 'Tenant'],
+                                             var_name='Party', value_name=MEASURE)
+    party_categories['Category'] = party_categories['Category'].map(PARTY_CATEGORY_LABELS)
+
+    categories = melt_categories(data.df_categories)
+    parties = data.df_parties.melt(id_vars=['Year'], var_name='Party', value_name=MEASURE)
+    lists = data.df_other_lists.melt(id_vars=['Year'], var_name='List', value_name=MEASURE)
+    lists['List'] = lists['List'].map(_LIST_NAMES)
+    totals = data.df_total_ccd.melt(id_vars=['Year'], var_name='Registry', value_name=MEASURE)
+
+    sources = {
+        'party_categories': party_categories.assign(List='Private Tenancy'),
+        'registry_lists': pd.concat(registry_frames, ignore_index=True),
+        'categories': categories.assign(List='Private Tenancy'),
+        'parties': parties.assign(List='Private Tenancy'),
+        'lists': lists,
+        'registry_totals': totals,
+    }
+    sources = {name: df.dropna(subset=[MEASURE]) for name, df in sources.items()}
+    sources['registry_party_estimate'] = registry_party_estimate(sources['registry_lists'],
+                                                                 sources['party_categories'])
+    return sources
+
+
+class Cube:
+    """Materialised roll-ups of one or more fact sources.
+
+    `cuboids` maps `(source, dims)` to a Series of `Applications` indexed by
+    `dims` (a tuple in `DIMENSIONS` order); the `()` cuboid holds the grand
+    total. `estimates` names the sources that are estimated.
+    """
+
+    def __init__(self, cuboids, sources, build_seconds, estimates=()):
+        self.cuboids = cuboids
+        self.sources = sources
+        self.build_seconds = build_seconds
+        self.estimates = tuple(estimates)
+
+    def _route(self, dims, source=None):
+        if source is not None:
+            if not set(dims) <= set(self.sources[source]):
+                raise KeyError(f"Source '{source}' does not cover {sorted(dims)}")
+            return source
+        candidates = [name for name, grain in self.sources.items() if set(dims) <= set(grain)]
+        if not candidates:
+            raise KeyError(f"No source covers dimensions {sorted(dims)}")
+        # Published sources before estimates, then fewest extra dimensions; ties keep source order
+        return min(candidates, key=lambda name: (name in self.estimates, len(self.sources[name])))
+
+    def covers(self, dims):
+        """Returns True if some source can answer a group-by over `dims`."""
+        return any(set(dims) <= set(grain) for grain in self.sources.values())
+
+    def is_estimate(self, dims, source=None, **filters):
+        """Returns True if `query(dims, source, **filters)` is answered from an estimate source."""
+        return self._route(tuple(d for d in DIMENSIONS if d in dims or d in filters), source) in self.estimates
+
+    def query(self, dims, source=None, **filters):
+        """Returns `Applications` grouped by `dims`, restricted to `filters`.
+
+        Filter values may be a scalar or a list, e.g.
+        `cube.query(['Year', 'Registry'], List='Social Housing', Year=[2023, 2024])`.
+        With no `dims` the (filtered) grand total is returned as a number.
+        """
+        dims = tuple(d for d in DIMENSIONS if d in dims)
+        needed = tuple(d for d in DIMENSIONS if d in dims or d in filters)
+        name = self._route(needed, source)
+        cuboid = self.cuboids[(name, needed)]
+        if filters:
+            mask = True
+            for dim, value in filters.items():
+                values = value if isinstance(value, (list, tuple, set)) else [value]
+                mask = mask & cuboid.index.get_level_values(dim).isin(values)
+            cuboid = cuboid[mask]
+        if not dims:
+            return cuboid.sum()
+        if needed != dims:
+            cuboid = cuboid.groupby(level=list(dims), sort=True).sum()
+        return cuboid.reset_index()
+
+    def drill(self, path=DRILL_PATH, source=None, **selection):
+        """Returns the next level of `path` below `selection`, per year.
+
+        `cube.drill(Registry='Sydney')` breaks Sydney down by list,
+        `cube.drill(List='Private Tenancy')` breaks tenancy down by category.
+        """
+        depth = max((path.index(d) + 1 for d in selection if d in path), default=0)
+        if depth >= len(path):
+            raise KeyError(f"Already at the lowest level of {path}")
+        return self.query(('Year', path[depth]), source=source, **selection)
+
+    def stats(self):
+        """Returns one row per cuboid with its source, dimensions, cell count and size."""
+        rows = [{'Source': name, 'Dimensions': ' × '.join(dims), 'Cells': len(series),
+                 'Bytes': series.memory_usage(index=True, deep=True)}
+                for (name, dims), series in self.cuboids.items()]
+        return pd.DataFrame(rows)
+
+    @property
+    def nbytes(self):
+        return int(self.stats()['Bytes'].sum())
+
+
+def _lattice(facts, grain):
+    """Builds every roll-up of `facts` over `grain` down to the grand total, smallest parent first."""
+    cuboids = {grain: facts.groupby(list(grain), sort=True)[MEASURE].sum()}
+    for size in range(len(grain) - 1, -1, -1):
+        for dims in combinations(grain, size):
+            # Cheapest parent: the built cuboid with one extra dimension and fewest cells
+            parents = [cuboids[p] for p in cuboids if len(p) == size + 1 and set(dims) <= set(p)]
+            parent = min(parents, key=len)
+            if dims:
+                cuboids[dims] = parent.groupby(level=list(dims), sort=True).sum()
+            else:
+                cuboids[dims] = pd.Series([parent.sum()], name=MEASURE)
+    return cuboids
+
+
+def build_cube(data, extra_sources=None):
+    """Materialises the cube for `data` plus any `extra_sources` (name -> fact DataFrame)."""
+    start = time.perf_counter()
+    facts = dataset_facts(data)
+    if extra_sources:
+        facts = {**extra_sources, **facts}
+    cuboids, sources = {}, {}
+    for name, df in facts.items():
+        grain = tuple(d for d in DIMENSIONS if d in df.columns)
+        sources[name] = grain
+        for dims, series in _lattice(df, grain).items():
+            cuboids[(name, dims)] = series
+    return Cube(cuboids, sources, time.perf_counter() - start, [name for name in ESTIMATES if name in sources])
@@ -0,0 +1,425 @@
+"""Source tables for the NCAT dashboard.
+
+Everything here is plain pandas so the tables can be loaded from batch jobs
+and notebooks without a Streamlit runtime.
+
+`published_data` holds the figures from the annual reports. Any table can be
+replaced by a table extract in the data directory, `tables/<name>` (see
+`cases.extract_files`), where `<name>` is the `Dataset` field without `df_`,
+e.g. `tables/total_ccd.csv`. `load_sources` reads the extracts concurrently
+and times each one. An extract that cannot be read, lacks the published
+table's descriptive columns or misses the timeout falls back to the
+published table and is reported, so only the pages reading that table are
+affected.
+"""
+import hashlib
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as ResultTimeout
+
+import pandas as pd
+
+from .cases import extract_signature, has_extract, iter_chunks
+
+Dataset = namedtuple('Dataset', [
+    'df_tenancy', 'df_categories', 'df_parties', 'df_geo', 'df_other_lists', 'df_total_ccd',
+    'df_social_housing', 'df_general', 'df_home_building', 'df_strata', 'df_motor_vehicles',
+    'df_commercial', 'df_residential_communities', 'df_retirement_villages', 'df_party_categories',
+])
+
+# Display name -> Dataset field for the per-registry list tables
+REGISTRY_LISTS = {
+    "Private Tenancy": 'df_geo',
+    "Social Housing": 'df_social_housing',
+    "General": 'df_general',
+    "Home Building": 'df_home_building',
+    "Strata Schemes": 'df_strata',
+    "Motor Vehicles": 'df_motor_vehicles',
+    "Commercial": 'df_commercial',
+    "Residential Communities": 'df_residential_communities',
+    "Retirement Villages": 'df_retirement_villages',
+}
+
+
+def registry_lists(data):
+    """Returns the per-registry list tables of `data` keyed by display name."""
+    return {name: getattr(data, field) for name, field in REGISTRY_LISTS.items()}
+
+
+def registry_columns(df_registry):
+    """Returns the registry columns of a per-registry table (every column but `Year`)."""
+    return [col for col in df_registry.columns if col != 'Year']
+
+
+def registry_names(data):
+    """Returns every registry that appears in the total or per-list registry tables."""
+    names = set(registry_columns(data.df_total_ccd))
+    for df in registry_lists(data).values():
+        names.update(registry_columns(df))
+    return sorted(names)
+
+
+SOURCE_COLUMNS = ['Table', 'Source', 'Status', 'Rows', 'Seconds', 'Error']
+
+Loaded = namedtuple('Loaded', ['data', 'sources', 'seconds'])
+
+
+def table_extract(field):
+    """Returns the name of the extract that replaces table `field`, e.g. `tables/total_ccd`."""
+    return f"tables/{field.removeprefix('df_')}"
+
+
+def table_signature(directory=None):
+    """Returns the `extract_signature` of every table extract; changes whenever any of them does."""
+    return tuple(extract_signature(table_extract(field), directory) for field in Dataset._fields)
+
+
+def _read_extract(name, directory):
+    """Returns extract `name` as one DataFrame and the seconds the read took."""
+    start = time.perf_counter()
+    df = pd.concat(list(iter_chunks(name, chunksize=1_000_000, directory=directory)), ignore_index=True)
+    return df, time.perf_counter() - start
+
+
+def _check_extract(df, published):
+    """Raises `ValueError` unless `df` has the descriptive columns of `published` and numeric values."""
+    keys = [c for c in published.columns if c == 'Year' or not pd.api.types.is_numeric_dtype(published[c])]
+    missing = [c for c in keys if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing columns {', '.join(missing)}")
+    text = [c for c in df.columns if c not in keys and not pd.api.types.is_numeric_dtype(df[c])]
+    if text:
+        raise ValueError(f"non-numeric values in {', '.join(text)}")
+    if df.empty:
+        raise ValueError("no rows")
+
+
+def load_sources(directory=None, max_workers=4, processes=False, timeout=None):
+    """Returns a `Loaded` dataset, each table read from its extract where there is one.
+
+    Extracts are read on a thread pool (file reads and the pandas parsers
+    release the GIL), or on a process pool with `processes` for large CSVs.
+    `timeout` bounds the whole load in seconds. `sources` has one row per
+    table: its source, status (`ok`, `failed` or `timed out`), rows and
+    seconds.
+    """
+    start = time.perf_counter()
+    tables = published_data()._asdict()
+    sources = {field: {'Table': field.removeprefix('df_'), 'Source': 'published', 'Status': 'ok',
+                       'Rows': len(df), 'Seconds': 0.0, 'Error': ''} for field, df in tables.items()}
+    names = {field: table_extract(field) for field in Dataset._fields if has_extract(table_extract(field), directory)}
+    if names:
+        executor = (ProcessPoolExecutor if processes else ThreadPoolExecutor)(max_workers=max_workers)
+        futures = {field: executor.submit(_read_extract, name, directory) for field, name in names.items()}
+        try:
+            for field, future in futures.items():
+                source = sources[field]
+                source['Source'] = names[field]
+                remaining = None if timeout is None else max(0.0, timeout - (time.perf_counter() - start))
+                try:
+                    df, seconds = future.result(timeout=remaining)
+                    _check_extract(df, tables[field])
+                except ResultTimeout:
+                    source.update(Status='timed out', Seconds=time.perf_counter() - start,
+                                  Error=f"not read within {timeout:g} s")
+                    continue
+                except Exception as error:
+                    source.update(Status='failed', Error=f"{type(error).__name__}: {error}")
+                    continue
+                tables[field] = df
+                source.update(Rows=len(df), Seconds=seconds)
+        finally:
+            # A timed-out read cannot be interrupted; it finishes in the background and is dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+    return Loaded(Dataset(**tables), pd.DataFrame(list(sources.values()), columns=SOURCE_COLUMNS),
+                  time.perf_counter() - start)
+
+
+def load_data():
+    """Returns the dashboard tables as a `Dataset` (see `load_sources`)."""
+    return load_sources().data
+
+
+def data_version(data):
+    """Returns a short content hash of every table in `data`.
+
+    Derived results (cubes, caches, snapshots) are keyed by this so they are
+    rebuilt exactly when the underlying figures change.
+    """
+    digest = hashlib.sha1()
+    for name, df in zip(data._fields, data):
+        digest.update(name.encode())
+        digest.update(','.join(map(str, df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:12]
+
+
+def published_data():
+    """Builds the tables published in the annual reports and returns them as a `Dataset`."""
+    # Annual Tenancy Applications Data
+    tenancy_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Total_Applications': [7173, 27954, 29780, 28849, 29167, 29905, 29798, 32654, 27720, 27873, 7496],
+        'Data_Completeness': ['Q4 Only', 'Q2, Q3, Q4', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Q1 Only']
+    }
+    
+    # Tenancy Applications by Category (Updated with granular data from Table 2.2)
+    category_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Termination_NonPayment': [2981, 11646, 15224, 14380, 13695, 10462, 9851, 10833, 10599, 9108, 2731],
+        'Rental_Bonds': [1236, 4190, 4787, 4747, 4809, 5403, 5219, 5477, 5460, 6879, 1668],
+        'General_Orders': [1276, 5325, 5618, 5344, 5806, 6388, 6407, 6871, 5571, 2623, 515],
+        'Repairs': [101, 268, 351, 308, 320, 394, 464, 464, 479, 1128, 278],
+        'Rent_Other_Payments': [375, 740, 768, 699, 717, 900, 947, 1153, 1373, 3796, 886],
+        'Termination_Breach_s87': [None, 734, 845, 690, 660, 614, 700, 765, 744, None, None],
+        'Termination_CoTenant_s102': [None, 60, 74, 88, 47, 74, 64, 54, 48, None, None],
+        'Termination_Other': [1030, 2791, 3589, 3148, 3323, 4535, 5119, 5340, 5110, 4418, 1247]
+    }
+    
+    # Lodgements by Party
+    party_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Landlord': [5634, 20662, 23476, 22545, 22448, 20816, 23284, 23265, 21512, 18367, 5256],
+        'Tenant': [1387, 5562, 6304, 6304, 6719, 7568, 6514, 7995, 6208, 7505, 1950],
+        'Other': [152, 1730, None, None, None, 1521, None, 1394, None, 2001, 290]
+    }
+    
+    # Geographic Distribution (Private Tenancy)
+    geo_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [1226, 4049, 5993, 5887, 5994, 6140, 5972, 6607, 6574, 5599, 1820],
+        'Newcastle': [1273, 3768, 5026, 4913, 4610, 4182, 4485, 4424, 4289, 3844, 1161],
+        'Penrith': [1206, 3830, 5892, 5868, 6076, 5533, 4311, 4241, 4135, 3148, 869],
+        'Sydney': [1902, 5845, 8429, 7953, 8064, 11122, 11080, 12768, 10885, 11483, 2963],
+        'Tamworth': [633, 1825, 2217, 2182, 2060, 1643, 2080, 2017, 1845, 1661, 482],
+        'Wollongong': [664, 1939, 2502, 2442, 2435, 1930, 2465, 2425, 2240, 2138, 538]
+    }
+    
+    # Other NCAT Lists Data
+    other_lists_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Tenancy': [7173, 27954, 29780, 28849, 29167, 29905, 29798, 32654, 27720, 27873, 7496],
+        'Social_Housing': [3405, 10448, 12588, 12702, 12782, 9682, 11126, 13001, 12002, 12277, 3507],
+        'General': [1334, 4204, 5103, 4632, 4550, 4895, 4492, 4948, 4961, 4855, 1165],
+        'Home_Building': [693, 2300, 2860, 2870, 2943, 2874, 2980, 3806, 3807, 2983, 497],
+        'Strata_Schemes': [384, 1125, 736, 1192, 1328, 1609, 1498, 1612, 1490, 1417, 298],
+        'Motor_Vehicles': [365, 1218, 1636, 1504, 1531, 1585, 1704, 1735, 1738, 1605, 351]
+    }
+    
+    # Total CCD Applications by Registry
+    total_ccd_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [2182, 6751, 9938, 9845, 9820, 8463, 8146, 9481, 9564, 9315, 2721],
+        'Newcastle': [2567, 6897, 9326, 9143, 8750, 7064, 7691, 8368, 8414, 7837, 2359],
+        'Penrith': [2194, 6598, 10020, 10253, 10651, 8690, 7085, 7353, 6761, 5950, 2900],
+        'Sydney': [3755, 11711, 15869, 15494, 15664, 21122, 21020, 22424, 19934, 20202, 4305],
+        'Tamworth': [1345, 3600, 4607, 4613, 4570, 3890, 4707, 4710, 4606, 4501, 1247],
+        'Wollongong': [1425, 4162, 5216, 5362, 5523, 4489, 4981, 5127, 5094, 4950, 1427]
+    }
+    
+    # Social Housing by Registry
+    social_housing_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [613, 1767, 2469, 2538, 2472, 1566, 1731, 1954, 2094, 2002, 562],
+        'Newcastle': [766, 1805, 2475, 2168, 2272, 1545, 2030, 2382, 2264, 2089, 513],
+        'Penrith': [503, 1409, 2209, 2279, 2441, 1875, 1580, 1612, 1436, 1159, 398],
+        'Sydney': [570, 1640, 2612, 2397, 2433, 1955, 2800, 2962, 2922, 2847, 777],
+        'Tamworth': [499, 1222, 1651, 1521, 1433, 1424, 1635, 1962, 2027, 1980, 670],
+        'Wollongong': [454, 1240, 1647, 1715, 1772, 1317, 1350, 1883, 1838, 1900, 587]
+    }
+    
+    # General List by Registry
+    general_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [143, 478, 602, 578, 542, 550, 595, 602, 616, 662, 155],
+        'Newcastle': [174, 566, 619, 640, 588, 566, 682, 706, 651, 658, 177],
+        'Penrith': [228, 624, 861, 819, 783, 717, 628, 528, 470, 405, 110],
+        'Sydney': [557, 1833, 2123, 1911, 1850, 2188, 1976, 2158, 2230, 2289, 570],
+        'Tamworth': [92, 239, 261, 250, 228, 333, 332, 304, 256, 249, 59],
+        'Wollongong': [140, 351, 401, 434, 428, 501, 485, 420, 399, 432, 94]
+    }
+    
+    # Home Building by Registry
+    home_building_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [81, 266, 359, 358, 401, 370, 384, 457, 467, 396, 61],
+        'Newcastle': [94, 291, 381, 420, 428, 416, 457, 526, 546, 458, 90],
+        'Penrith': [121, 421, 501, 483, 526, 462, 339, 387, 367, 288, 56],
+        'Sydney': [273, 895, 1061, 1064, 1146, 1099, 1161, 1345, 1558, 1181, 205],
+        'Tamworth': [50, 149, 178, 172, 167, 163, 181, 172, 185, 142, 33],
+        'Wollongong': [74, 226, 269, 305, 275, 302, 334, 297, 334, 310, 52]
+    }
+    
+    # Strata Schemes by Registry
+    strata_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [35, 98, 67, 79, 95, 129, 123, 118, 131, 136, 34],
+        'Newcastle': [34, 96, 94, 89, 105, 136, 136, 119, 118, 109, 18],
+        'Penrith': [28, 58, 64, 56, 60, 74, 57, 47, 51, 48, 16],
+        'Sydney': [245, 797, 630, 892, 981, 1131, 1086, 1108, 1039, 1051, 206],
+        'Tamworth': [15, 37, 45, 45, 42, 55, 46, 46, 52, 49, 14],
+        'Wollongong': [27, 73, 50, 50, 61, 63, 78, 75, 61, 53, 10]
+    }
+    
+    # Motor Vehicles by Registry
+    motor_vehicles_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [71, 263, 324, 321, 331, 298, 308, 309, 325, 335, 75],
+        'Newcastle': [46, 170, 223, 215, 210, 206, 206, 234, 233, 225, 60],
+        'Penrith': [78, 256, 331, 341, 367, 345, 345, 256, 221, 216, 31],
+        'Sydney': [97, 360, 462, 453, 461, 471, 483, 524, 527, 489, 127],
+        'Tamworth': [32, 83, 115, 116, 115, 109, 108, 100, 105, 104, 22],
+        'Wollongong': [41, 100, 133, 138, 122, 106, 122, 118, 117, 121, 36]
+    }
+    
+    # Commercial by Registry
+    commercial_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [10, 51, 74, 72, 63, 67, 66, 72, 82, 86, 24],
+        'Newcastle': [29, 70, 110, 115, 121, 101, 90, 104, 118, 129, 39],
+        'Penrith': [27, 67, 85, 90, 86, 98, 72, 60, 63, 64, 10],
+        'Sydney': [104, 331, 430, 420, 415, 430, 391, 394, 366, 372, 83],
+        'Tamworth': [9, 49, 67, 72, 60, 49, 56, 55, 64, 60, 13],
+        'Wollongong': [18, 58, 74, 77, 82, 85, 66, 70, 74, 81, 25]
+    }
+    
+    # Residential Communities by Registry
+    residential_communities_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [2, 5, 5, 10, 25, 14, 20, 17, 15, 15, 9],
+        'Newcastle': [40, 94, 109, 164, 244, 104, 169, 129, 114, 91, 129],
+        'Penrith': [1, 11, 8, 71, 95, 30, 19, 25, 16, 18, 3],
+        'Sydney': [3, 18, 31, 24, 31, 20, 39, 40, 54, 65, 17],
+        'Tamworth': [12, 41, 53, 96, 239, 101, 108, 88, 81, 53, 8],
+        'Wollongong': [2, 59, 70, 57, 129, 61, 74, 127, 61, 43, 9]
+    }
+    
+    # Retirement Villages by Registry
+    retirement_villages_data = {
+        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
+        'Liverpool': [1, 1, 4, 3, 4, 6, 2, 2, 1, 1, 1],
+        'Newcastle': [2, 18, 24, 27, 24, 26, 23, 18, 19, 20, 2],
+        'Penrith': [0, 9, 3, 7, 5, 4, 3, 4, 2, 1, 0],
+        'Sydney': [4, 12, 14, 13, 15, 19, 19, 22, 16, 15, 0],
+        'Tamworth': [1, 3, 2, 1, 1, 4, 3, 4, 1, 5, 4],
+        'Wollongong': [0, 7, 7, 5, 7, 4, 5, 5, 12, 5, 2]
+    }
+    
+    # Party Category Data - Landlord vs Tenant breakdown by application type
+    party_category_data = []
+    
+    # 2017 data
+    party_category_data.extend([
+        {'Year': 2017, 'Category': 'Rental Bonds', 'Landlord': 1527, 'Tenant': 3117, 'Total': 4787},
+        {'Year': 2017, 'Category': 'General Orders', 'Landlord': 3411, 'Tenant': 1872, 'Total': 5618},
+        {'Year': 2017, 'Category': 'Rent and other payments', 'Landlord': 380, 'Tenant': 355, 'Total': 768},
+        {'Year': 2017, 'Category': 'Repairs', 'Landlord': 6, 'Tenant': 329, 'Total': 351},
+        {'Year': 2017, 'Category': 'Termination - Breach (s.87)', 'Landlord': 845, 'Tenant': 0, 'Total': 845},
+        {'Year': 2017, 'Category': 'Termination non-payment of rent', 'Landlord': 15224, 'Tenant': 0, 'Total': 15224},
+        {'Year': 2017, 'Category': 'Termination by co-tenant (s102)', 'Landlord': 0, 'Tenant': 74, 'Total': 74},
+        {'Year': 2017, 'Category': 'Termination - Other', 'Landlord': 2506, 'Tenant': 1023, 'Total': 3589}
+    ])
+    
+    # 2018 data
+    party_category_data.extend([
+        {'Year': 2018, 'Category': 'Rental bonds', 'Landlord': 1496, 'Tenant': 3124, 'Total': 4747},
+        {'Year': 2018, 'Category': 'General orders', 'Landlord': 3292, 'Tenant': 1746, 'Total': 5344},
+        {'Year': 2018, 'Category': 'Rent and other payments', 'Landlord': 332, 'Tenant': 322, 'Total': 699},
+        {'Year': 2018, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 284, 'Total': 308},
+        {'Year': 2018, 'Category': 'Termination - breach (s.87)', 'Landlord': 690, 'Tenant': 0, 'Total': 690},
+        {'Year': 2018, 'Category': 'Termination - non-payment of rent', 'Landlord': 14380, 'Tenant': 0, 'Total': 14380},
+        {'Year': 2018, 'Category': 'Termination by co-tenant (s102)', 'Landlord': 0, 'Tenant': 88, 'Total': 88},
+        {'Year': 2018, 'Category': 'Termination - other', 'Landlord': 2303, 'Tenant': 798, 'Total': 3148}
+    ])
+    
+    # 2019 data
+    party_category_data.extend([
+        {'Year': 2019, 'Category': 'Rental bonds', 'Landlord': 1483, 'Tenant': 3194, 'Total': 4809},
+        {'Year': 2019, 'Category': 'General orders', 'Landlord': 3615, 'Tenant': 1870, 'Total': 5806},
+        {'Year': 2019, 'Category': 'Rent and other payments', 'Landlord': 304, 'Tenant': 367, 'Total': 717},
+        {'Year': 2019, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 293, 'Total': 320},
+        {'Year': 2019, 'Category': 'Termination - breach (s.87)', 'Landlord': 660, 'Tenant': 0, 'Total': 660},
+        {'Year': 2019, 'Category': 'Termination - non-payment of rent', 'Landlord': 13695, 'Tenant': 0, 'Total': 13695},
+        {'Year': 2019, 'Category': 'Termination by co-tenant (s102)', 'Landlord': 0, 'Tenant': 47, 'Total': 47},
+        {'Year': 2019, 'Category': 'Termination - other', 'Landlord': 2274, 'Tenant': 993, 'Total': 3323}
+    ])
+    
+    # 2020 data
+    party_category_data.extend([
+        {'Year': 2020, 'Category': 'Rental Bonds', 'Landlord': 1694, 'Tenant': 3504, 'Total': 5403},
+        {'Year': 2020, 'Category': 'General Orders', 'Landlord': 3935, 'Tenant': 2095, 'Total': 6388},
+        {'Year': 2020, 'Category': 'Rent and other payments', 'Landlord': 360, 'Tenant': 490, 'Total': 900},
+        {'Year': 2020, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 366, 'Total': 394},
+        {'Year': 2020, 'Category': 'Termination - Breach (s 87)', 'Landlord': 614, 'Tenant': 0, 'Total': 614},
+        {'Year': 2020, 'Category': 'Termination non-payment of rent', 'Landlord': 10462, 'Tenant': 0, 'Total': 10462},
+        {'Year': 2020, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 74, 'Total': 74},
+        {'Year': 2020, 'Category': 'Termination - Other', 'Landlord': 3067, 'Tenant': 1386, 'Total': 4535}
+    ])
+    
+    # 2021 data
+    party_category_data.extend([
+        {'Year': 2021, 'Category': 'Rental Bonds', 'Landlord': 1664, 'Tenant': 3363, 'Total': 5219},
+        {'Year': 2021, 'Category': 'General Orders', 'Landlord': 3988, 'Tenant': 2080, 'Total': 6407},
+        {'Year': 2021, 'Category': 'Rent and other payments', 'Landlord': 416, 'Tenant': 479, 'Total': 947},
+        {'Year': 2021, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 430, 'Total': 464},
+        {'Year': 2021, 'Category': 'Termination - Breach (s 87)', 'Landlord': 700, 'Tenant': 0, 'Total': 700},
+        {'Year': 2021, 'Category': 'Termination non-payment of rent', 'Landlord': 9851, 'Tenant': 0, 'Total': 9851},
+        {'Year': 2021, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 64, 'Total': 64},
+        {'Year': 2021, 'Category': 'Termination - Other', 'Landlord': 3501, 'Tenant': 1530, 'Total': 5119}
+    ])
+    
+    # 2022 data
+    party_category_data.extend([
+        {'Year': 2022, 'Category': 'Rental Bonds', 'Landlord': 1771, 'Tenant': 3456, 'Total': 5477},
+        {'Year': 2022, 'Category': 'General Orders', 'Landlord': 4303, 'Tenant': 2193, 'Total': 6871},
+        {'Year': 2022, 'Category': 'Rent and other payments', 'Landlord': 480, 'Tenant': 608, 'Total': 1153},
+        {'Year': 2022, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 435, 'Total': 464},
+        {'Year': 2022, 'Category': 'Termination - Breach (s 87)', 'Landlord': 765, 'Tenant': 0, 'Total': 765},
+        {'Year': 2022, 'Category': 'Termination non-payment of rent', 'Landlord': 10833, 'Tenant': 0, 'Total': 10833},
+        {'Year': 2022, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 54, 'Total': 54},
+        {'Year': 2022, 'Category': 'Termination - Other', 'Landlord': 3677, 'Tenant': 1559, 'Total': 5340}
+    ])
+    
+    # 2023 data
+    party_category_data.extend([
+        {'Year': 2023, 'Category': 'Rental Bonds', 'Landlord': 1708, 'Tenant': 3555, 'Total': 5460},
+        {'Year': 2023, 'Category': 'General Orders', 'Landlord': 3454, 'Tenant': 1831, 'Total': 5571},
+        {'Year': 2023, 'Category': 'Rent and other payments', 'Landlord': 752, 'Tenant': 546, 'Total': 1373},
+        {'Year': 2023, 'Category': 'Repairs', 'Landlord': 116, 'Tenant': 328, 'Total': 479},
+        {'Year': 2023, 'Category': 'Termination - Breach (s 87)', 'Landlord': 744, 'Tenant': 0, 'Total': 744},
+        {'Year': 2023, 'Category': 'Termination non-payment of rent', 'Landlord': 10599, 'Tenant': 0, 'Total': 10599},
+        {'Year': 2023, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 48, 'Total': 48},
+        {'Year': 2023, 'Category': 'Termination - Other', 'Landlord': 3513, 'Tenant': 1455, 'Total': 5110}
+    ])
+    
+    # 2024 data
+    party_category_data.extend([
+        {'Year': 2024, 'Category': 'Rental Bonds', 'Landlord': 2938, 'Tenant': 3745, 'Total': 6879},
+        {'Year': 2024, 'Category': 'General Orders', 'Landlord': 1521, 'Tenant': 937, 'Total': 2623},
+        {'Year': 2024, 'Category': 'Rent and other payments', 'Landlord': 2249, 'Tenant': 1379, 'Total': 3796},
+        {'Year': 2024, 'Category': 'Repairs', 'Landlord': 416, 'Tenant': 668, 'Total': 1128},
+        {'Year': 2024, 'Category': 'Termination non-payment of rent', 'Landlord': 8512, 'Tenant': 106, 'Total': 9108},
+        {'Year': 2024, 'Category': 'Termination other', 'Landlord': 3714, 'Tenant': 534, 'Total': 4418}
+    ])
+    
+    # Convert to DataFrames
+    df_tenancy = pd.DataFrame(tenancy_data)
+    df_categories = pd.DataFrame(category_data)
+    df_parties = pd.DataFrame(party_data)
+    df_geo = pd.DataFrame(geo_data)
+    df_other_lists = pd.DataFrame(other_lists_data)
+    df_total_ccd = pd.DataFrame(total_ccd_data)
+    df_social_housing = pd.DataFrame(social_housing_data)
+    df_general = pd.DataFrame(general_data)
+    df_home_building = pd.DataFrame(home_building_data)
+    df_strata = pd.DataFrame(strata_data)
+    df_motor_vehicles = pd.DataFrame(motor_vehicles_data)
+    df_commercial = pd.DataFrame(commercial_data)
+    df_residential_communities = pd.DataFrame(residential_communities_data)
+    df_retirement_villages = pd.DataFrame(retirement_villages_data)
+    df_party_categories = pd.DataFrame(party_category_data)
+
+    return Dataset(df_tenancy, df_categories, df_parties, df_geo, df_other_lists, df_total_ccd,
+                   df_social_housing, df_general, df_home_building, df_strata, df_motor_vehicles,
+                   df_commercial, df_residential_communities, df_retirement_villages, df_party_categories)
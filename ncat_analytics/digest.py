@@ -0,0 +1,72 @@
+"""Mergeable quantile digest.
+
+`TDigest` summarises a distribution as at most ~`compression` weighted
+centroids, kept small near the tails so p90/p99 stay accurate. Compression
+is a vectorised pass: points are bucketed by the t-digest arcsine scale
+function of their cumulative weight, so adding a chunk of a million durations
+costs one sort rather than a Python loop. Merging two digests concatenates
+their centroids and recompresses, so per-cell digests combine into the digest
+of any slice.
+"""
+import numpy as np
+
+
+class TDigest:
+
+    def __init__(self, compression=200, means=None, weights=None, minimum=np.inf, maximum=-np.inf):
+        self.compression = compression
+        self.means = np.empty(0) if means is None else means
+        self.weights = np.empty(0) if weights is None else weights
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        mid = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * np.pi) * np.arcsin(2 * mid - 1)
+        bucket = np.floor(scale - scale[0]).astype(np.intp)
+        sums = np.bincount(bucket, weights=means * weights)
+        counts = np.bincount(bucket, weights=weights)
+        keep = counts > 0
+        self.means = sums[keep] / counts[keep]
+        self.weights = counts[keep]
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other):
+        if not len(other.weights):
+            return self
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    def copy(self):
+        return TDigest(self.compression, self.means.copy(), self.weights.copy(), self.minimum, self.maximum)
+
+    def quantile(self, q):
+        """Returns the estimated `q` quantile(s) (0-1), or NaN for an empty digest."""
+        q = np.asarray(q, dtype=float)
+        if not len(self.weights):
+            return np.full(q.shape, np.nan)
+        total = self.weights.sum()
+        mid = (np.cumsum(self.weights) - self.weights / 2) / total
+        xp = np.concatenate([[0.0], mid, [1.0]])
+        fp = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return np.interp(q, xp, fp)
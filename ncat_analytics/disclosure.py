@@ -0,0 +1,251 @@
+"""Small-cell suppression of the published counts.
+
+Counts from 1 to `THRESHOLD` (per year, registry, list, ...) can identify
+parties, so `protect_dataset` hides them (primary suppression). Hiding one
+cell is not enough when the cells of a group add up to a published total:
+the missing cell is the total minus the rest. Complementary suppression
+therefore hides further cells until every group along every axis that has a
+hidden cell has at least two, summing to more than `THRESHOLD`. The smallest
+cells are chosen first so as little as possible is lost.
+
+`suppress` works on an N-dimensional array, one boolean pass per axis until
+nothing changes, so the same code protects a 2-D table or the full
+Year x Registry x List x Category cube. The per-registry list tables are
+protected together as one List x Year x Registry array, because their sums
+across lists (Total CCD), registries (list totals) and years are all shown.
+
+The category volumes and their landlord/tenant split are protected
+together, as the split's totals are the category volumes.
+
+Case-level counts from the extracts (outcomes, repeat disputes, search
+matches, ...) are sparse, so `protect_counts` runs the same passes over the
+observed cells of a MultiIndex Series only, and `protect_cells` drops the
+suppressed cells of a per-cell store such as the lifecycle digests.
+
+Hidden cells become NaN. The dashboard protects each data and extract
+version once and every page reads the protected tables and counts.
+"""
+import copy
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .data import REGISTRY_LISTS, Dataset, registry_columns
+from .metrics import CATEGORY_LABELS, PARTY_CATEGORY_LABELS, normalize_party_categories
+from .versions import ROW_KEYS
+
+THRESHOLD = int(os.environ.get('NCAT_SUPPRESSION_THRESHOLD', 5))
+
+REPORT_COLUMNS = ['Table', 'Cells', 'Primary', 'Complementary']
+
+CELL_COLUMNS = ['Table', 'Row', 'Column']
+
+PARTIES = ['Landlord', 'Tenant']
+
+Protected = namedtuple('Protected', ['data', 'cells', 'report', 'seconds'])
+
+
+def _groups(coords, axes):
+    """Returns, for each of `axes`, every cell's group: the cells that agree on all other coordinates."""
+    groups = []
+    for axis in axes:
+        others = [c for i, c in enumerate(coords) if i != axis]
+        if not others:
+            groups.append(np.zeros(len(coords[axis]), dtype=np.intp))
+            continue
+        groups.append(np.unique(np.column_stack(others), axis=0, return_inverse=True)[1].ravel())
+    return groups
+
+
+def _suppress_cells(values, groups, threshold):
+    """Returns (primary, complementary) masks over a flat list of cells, in order along every axis."""
+    primary = (values > 0) & (values <= threshold)
+    hidden = primary.copy()
+    # Complement cost: the smallest count loses least; zeros only as a last resort, and after them
+    # cells that are alone along some axis, as nothing there could hide them in turn
+    largest = values.max(initial=0)
+    alone = np.zeros(len(values), dtype=bool)
+    for group in groups:
+        alone |= np.bincount(group)[group] <= 1
+    cost = np.where(alone, 2 * largest + 2, np.where(values > 0, values, largest + 1))
+    changed = hidden.any()
+    while changed:
+        changed = False
+        for group in groups:
+            count = np.bincount(group, weights=hidden)
+            total = np.bincount(group, weights=np.where(hidden, values, 0))
+            need = (count == 1) | ((count > 0) & (total <= threshold))
+            if not need.any():
+                continue
+            options = np.where(hidden, np.inf, cost)
+            # The cheapest cell of each group, the first along the axis on ties (lexsort is stable)
+            ranked = np.lexsort((options, group))
+            first = ranked[np.r_[True, group[ranked][1:] != group[ranked][:-1]]]
+            add = first[need[group[first]] & np.isfinite(options[first])]
+            if len(add):
+                hidden[add] = True
+                changed = True
+    return primary, hidden & ~primary
+
+
+def suppress(values, threshold=THRESHOLD, axes=None):
+    """Returns (primary, complementary) boolean masks of the cells of `values` to hide.
+
+    NaN cells are not applicable: they are never hidden and protect nothing.
+    Zeros are hidden as complements only when no positive cell is left.
+    """
+    values = np.asarray(values, dtype=float)
+    axes = range(values.ndim) if axes is None else axes
+    cells = np.flatnonzero(np.isfinite(values))
+    primary = np.zeros(values.shape, dtype=bool)
+    complementary = np.zeros(values.shape, dtype=bool)
+    coords = np.unravel_index(cells, values.shape)
+    cell_primary, cell_complementary = _suppress_cells(values.ravel()[cells], _groups(coords, axes), threshold)
+    primary[coords] = cell_primary
+    complementary[coords] = cell_complementary
+    return primary, complementary
+
+
+def protect_counts(counts, threshold=THRESHOLD, levels=None):
+    """Returns case counts (a Series over a MultiIndex) with small cells and their complements set to NaN.
+
+    The cells are protected along every index level, or only along `levels`;
+    combinations without cases are not applicable, so the counts stay sparse.
+    """
+    if counts is None or counts.empty:
+        return counts
+    index = counts.index if isinstance(counts.index, pd.MultiIndex) else pd.MultiIndex.from_arrays([counts.index])
+    codes = [np.asarray(c) for c in index.codes]
+    # In order along every axis, as `suppress` sees a dense array
+    order = np.lexsort(codes[::-1])
+    coords = [c[order] for c in codes]
+    axes = range(len(codes)) if levels is None else [index.names.index(level) for level in levels]
+    primary, complementary = _suppress_cells(counts.to_numpy(dtype=float)[order], _groups(coords, axes), threshold)
+    hidden = np.zeros(len(counts), dtype=bool)
+    hidden[order] = primary | complementary
+    return counts.astype(float).mask(hidden)
+
+
+def protect_cells(store, counts, threshold=THRESHOLD, levels=None):
+    """Returns a shallow copy of a per-cell store without the cells whose case `counts` are suppressed.
+
+    `counts` is indexed by the store's `.cells` keys (e.g. `LifecycleDigests.counts()`).
+    """
+    kept = set(protect_counts(counts, threshold, levels).dropna().index)
+    protected = copy.copy(store)
+    protected.cells = {key: value for key, value in store.cells.items() if key in kept}
+    return protected
+
+
+def _report_row(table, primary, complementary):
+    return {'Table': table, 'Cells': int(primary.size), 'Primary': int(primary.sum()),
+            'Complementary': int(complementary.sum())}
+
+
+def _apply(field, df, columns, hidden):
+    """Returns `df` with the `hidden` (rows x `columns`) cells set to NaN, and those cells in long form."""
+    if not hidden.any():
+        return df, pd.DataFrame(columns=CELL_COLUMNS)
+    df = df.copy()
+    for i, column in enumerate(columns):
+        if hidden[:, i].any():
+            df[column] = df[column].astype(float).mask(hidden[:, i])
+    rows, positions = np.nonzero(hidden)
+    # Row labels as in `SnapshotStore.diff`
+    labels = df[ROW_KEYS.get(field, ['Year'])].astype(str).agg(' · '.join, axis=1).to_numpy()
+    return df, pd.DataFrame({'Table': field.removeprefix('df_'), 'Row': labels[rows],
+                             'Column': np.asarray(columns, dtype=object)[positions]}, columns=CELL_COLUMNS)
+
+
+def _protect_table(field, df, threshold):
+    """Protects the value columns of one table across its rows and columns."""
+    keys = ROW_KEYS.get(field, ['Year'])
+    columns = [c for c in df.columns if c not in keys and pd.api.types.is_numeric_dtype(df[c])]
+    primary, complementary = suppress(df[columns].to_numpy(dtype=float), threshold)
+    df, cells = _apply(field, df, columns, primary | complementary)
+    return df, cells, _report_row(field.removeprefix('df_'), primary, complementary)
+
+
+def _protect_registry_lists(tables, threshold):
+    """Protects the per-registry list tables as one List x Year x Registry array."""
+    fields = [field for field in REGISTRY_LISTS.values() if registry_columns(tables[field])]
+    if not fields:
+        return {}, [], []
+    years = sorted(set().union(*(tables[field]['Year'] for field in fields)))
+    registries = sorted(set().union(*(registry_columns(tables[field]) for field in fields)))
+    cube = np.stack([tables[field].set_index('Year')[registry_columns(tables[field])]
+                     .reindex(index=years, columns=registries).to_numpy(dtype=float) for field in fields])
+    primary, complementary = suppress(cube, threshold)
+    hidden = primary | complementary
+    protected, cells, report = {}, [], []
+    for i, field in enumerate(fields):
+        df = tables[field]
+        mask = pd.DataFrame(hidden[i], index=years, columns=registries)
+        mask = mask.reindex(index=df['Year'], columns=registry_columns(df)).fillna(False).to_numpy(dtype=bool)
+        protected[field], table_cells = _apply(field, df, registry_columns(df), mask)
+        cells.append(table_cells)
+        report.append(_report_row(field.removeprefix('df_'), primary[i], complementary[i]))
+    return protected, cells, report
+
+
+def _protect_categories(tables, threshold):
+    """Returns the protected categories and party categories, each as (table, cells, report row).
+
+    The split's `Total` is the category volume, so it is hidden exactly where
+    `categories` is. Landlord and Tenant are protected as a Year x Category x
+    Party array whose third party, the rest of the total, is not shown but can
+    be derived while the total is.
+    """
+    categories = tables['df_categories']
+    columns = [c for c in categories.columns if c != 'Year' and pd.api.types.is_numeric_dtype(categories[c])]
+    primary, complementary = suppress(categories[columns].to_numpy(dtype=float), threshold)
+    protected = {'df_categories': (*_apply('df_categories', categories, columns, primary | complementary),
+                                   _report_row('categories', primary, complementary))}
+
+    parties = tables['df_party_categories']
+    labels = {label: column for column, label in CATEGORY_LABELS.items()}
+    category = normalize_party_categories(parties)['Category']
+    column = category.map(PARTY_CATEGORY_LABELS).map(labels)
+    rows = pd.MultiIndex.from_arrays([parties['Year'], column])
+    total_primary = ((parties['Total'] > 0) & (parties['Total'] <= threshold)).to_numpy()
+    total_hidden = (pd.DataFrame(primary | complementary, index=categories['Year'], columns=columns).stack()
+                    .reindex(rows).fillna(False).to_numpy(dtype=bool)) | total_primary
+    split = parties[PARTIES].assign(Other=parties['Total'] - parties[PARTIES].sum(axis=1))
+    split['Other'] = split['Other'].mask(total_hidden)
+    split.index = pd.MultiIndex.from_arrays([parties['Year'], category])
+    grid = pd.MultiIndex.from_product([sorted(parties['Year'].unique()), sorted(category.unique())])
+    array = split.reindex(grid).to_numpy(dtype=float).reshape(len(grid.levels[0]), len(grid.levels[1]), -1)
+    split_primary, split_complementary = (pd.DataFrame(mask.reshape(len(grid), -1), index=grid, columns=split.columns)
+                                          .reindex(split.index)[PARTIES].to_numpy()
+                                          for mask in suppress(array, threshold))
+    party_primary = np.column_stack([split_primary, total_primary])
+    party_hidden = np.column_stack([split_primary | split_complementary, total_hidden])
+    protected['df_party_categories'] = (*_apply('df_party_categories', parties, PARTIES + ['Total'], party_hidden),
+                                        _report_row('party_categories', party_primary, party_hidden & ~party_primary))
+    return protected
+
+
+def protect_dataset(data, threshold=THRESHOLD):
+    """Returns a `Protected` copy of `data` with small cells and their complements set to NaN."""
+    start = time.perf_counter()
+    tables = data._asdict()
+    protected, cells, report = _protect_registry_lists(tables, threshold)
+    linked = _protect_categories(tables, threshold)
+    for field in Dataset._fields:
+        if field in protected:
+            continue
+        protected[field], table_cells, row = linked.get(field) or _protect_table(field, tables[field], threshold)
+        cells.append(table_cells)
+        report.append(row)
+    return Protected(Dataset(**protected), pd.concat(cells, ignore_index=True),
+                     pd.DataFrame(report, columns=REPORT_COLUMNS), time.perf_counter() - start)
+
+
+def unprotected_rows(cells, protected):
+    """Drops rows of a cell frame (`Table`, `Row`, `Column`, e.g. `SnapshotStore.diff`) hidden in any of `protected`."""
+    hidden = pd.concat([p.cells for p in protected], ignore_index=True)
+    keys = pd.MultiIndex.from_frame(cells[CELL_COLUMNS].astype(str))
+    return cells[~keys.isin(pd.MultiIndex.from_frame(hidden.astype(str)))]
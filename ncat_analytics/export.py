@@ -0,0 +1,275 @@
+"""Static snapshot bundle of the dashboard for read-only audiences.
+
+`build_bundle` renders views of the dashboard headlessly (the same
+`AppTest` sessions as `ncat_analytics.loadtest`), one view per task in a
+process pool, and writes a self-contained bundle that any static file server
+can host:
+
+    <out>/index.html        links to every view
+    <out>/plotly.min.js     Plotly, shared by every view
+    <out>/<view>.html       the view, with its figures embedded
+    <out>/<view>.json       the same content as data (figure specs, metrics, tables)
+    <out>/manifest.json
+
+A view is a page in its default state, optionally followed by widget steps
+`(kind, label, value)`. Every page's default view is always exported; extra
+views come from `DEFAULT_VIEWS` or a JSON file such as
+
+    [{"name": "Tenancy 2020-2024", "page": "📈 Tenancy Trends",
+      "steps": [["slider", "Select Year Range", [2020, 2024]]]}]
+
+    python -m ncat_analytics.export --out snapshot --views views.json
+
+This module imports Streamlit and Plotly, so it is not imported by
+`ncat_analytics` itself.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+from plotly.offline import get_plotlyjs
+
+from .access import Scope
+from .data import data_version, load_data
+from .loadtest import APP, PAGE, apply_step, find_widget, new_session, share_script_cache
+
+# Views are rendered as an unrestricted, non-admin reader would see them
+EXPORT_SCOPE = Scope('export', 'executive', None, None)
+
+DEFAULT_VIEWS = [
+    {'name': 'Geographic Distribution - Individual List Types', 'page': '🗺️ Geographic Distribution',
+     'steps': [('selectbox', 'Select Analysis Type:', '📊 Individual List Types by Office')]},
+    {'name': 'NCAT Lists Comparison - List Types by Registry', 'page': '⚖️ NCAT Lists Comparison',
+     'steps': [('selectbox', 'Select Analysis Type:', '🗺️ List Types by Registry')]},
+]
+
+WIDGETS = {'selectbox', 'multiselect', 'slider', 'select_slider', 'number_input', 'checkbox',
+           'radio', 'text_input', 'date_input', 'toggle'}
+
+CSS = """
+body { font-family: system-ui, sans-serif; margin: 0; color: #1e293b; }
+nav { background: #1e3a8a; padding: 0.6rem 1rem; }
+nav a { color: #e2e8f0; margin-right: 1rem; text-decoration: none; }
+nav a.current { color: #fff; font-weight: bold; }
+main { max-width: 1200px; margin: 0 auto; padding: 1rem; }
+.row { display: flex; gap: 1rem; }
+.col { flex: 1; min-width: 0; }
+.metric { background: #f8fafc; border-left: 4px solid #3b82f6; padding: 0.6rem 1rem; }
+.metric .label { font-size: 0.85rem; color: #64748b; }
+.metric .value { font-size: 1.6rem; font-weight: 600; }
+.alert { padding: 0.6rem 1rem; border-radius: 4px; margin: 0.5rem 0; }
+.info { background: #eff6ff; } .warning { background: #fffbeb; }
+.success { background: #f0fdf4; } .error { background: #fef2f2; }
+.filter { display: inline-block; background: #f1f5f9; border-radius: 4px; padding: 0.2rem 0.5rem;
+          margin: 0.2rem; font-size: 0.85rem; }
+.caption, .stamp { color: #64748b; font-size: 0.85rem; }
+table { border-collapse: collapse; font-size: 0.85rem; margin: 0.5rem 0; }
+td, th { padding: 0.25rem 0.6rem; border-bottom: 1px solid #e2e8f0; text-align: right; }
+"""
+
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'view'
+
+
+def _inline(text):
+    text = escape(text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<![*\w])\*(?!\*)(.+?)\*', r'<em>\1</em>', text)
+    return re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+
+
+def markdown_html(text):
+    """Renders the Markdown the dashboard uses: headings, emphasis, code, bullet lists and rules."""
+    html, in_list = [], False
+    for line in text.splitlines():
+        stripped = line.strip()
+        item = re.match(r'[-*] (.*)', stripped)
+        heading = re.match(r'(#{1,6}) (.*)', stripped)
+        if in_list and not item:
+            html.append('</ul>')
+            in_list = False
+        if item:
+            if not in_list:
+                html.append('<ul>')
+                in_list = True
+            html.append(f'<li>{_inline(item.group(1))}</li>')
+        elif re.fullmatch(r'-{3,}|\*{3,}', stripped):
+            html.append('<hr>')
+        elif heading:
+            level = len(heading.group(1))
+            html.append(f'<h{level}>{_inline(heading.group(2))}</h{level}>')
+        elif stripped:
+            html.append(f'<p>{_inline(stripped)}</p>')
+    if in_list:
+        html.append('</ul>')
+    return '\n'.join(html)
+
+
+def _widget_value(value):
+    if isinstance(value, tuple):
+        return ' – '.join(map(str, value))
+    if isinstance(value, list):
+        return ', '.join(map(str, value)) or 'none'
+    return str(value)
+
+
+def _number(value):
+    return f'{value:,.0f}' if float(value).is_integer() else f'{value:,.1f}'
+
+
+def _render(node, content):
+    """Returns the HTML for `node`, collecting figures, metrics and tables into `content`."""
+    kind = getattr(node, 'type', None)
+    children = getattr(node, 'children', {})
+
+    def inner():
+        return ''.join(_render(child, content) for child in children.values())
+
+    if kind == 'markdown':
+        return node.body if node.proto.allow_html else markdown_html(node.body)
+    if kind in ('title', 'header', 'subheader'):
+        level = {'title': 1, 'header': 2, 'subheader': 3}[kind]
+        return f'<h{level}>{escape(node.value)}</h{level}>'
+    if kind == 'caption':
+        return f'<div class="caption">{markdown_html(node.value)}</div>'
+    if kind in ('info', 'warning', 'success', 'error'):
+        return f'<div class="alert {kind}">{markdown_html(node.value)}</div>'
+    if kind == 'metric':
+        content['metrics'].append({'label': node.label, 'value': node.value, 'delta': node.delta})
+        delta = f'<div class="delta">{escape(node.delta)}</div>' if node.delta else ''
+        return (f'<div class="metric"><div class="label">{escape(node.label)}</div>'
+                f'<div class="value">{escape(node.value)}</div>{delta}</div>')
+    if kind == 'plotly_chart':
+        content['figures'].append(json.loads(node.proto.spec))
+        return f'<div class="chart" id="chart-{len(content["figures"]) - 1}"></div>'
+    if kind == 'dataframe':
+        df = node.value
+        content['tables'].append(json.loads(df.to_json(orient='split', default_handler=str)))
+        return df.to_html(border=0, na_rep='', float_format=_number)
+    if kind in WIDGETS:
+        return f'<span class="filter">{escape(node.label.rstrip(":"))}: {escape(_widget_value(node.value))}</span>'
+    if kind == 'tab':
+        return f'<section><h3 class="tab">{escape(node.label)}</h3>{inner()}</section>'
+    if kind == 'expandable':
+        return f'<details><summary>{escape(node.label)}</summary>{inner()}</details>'
+    if kind == 'flex_container' and children and all(getattr(c, 'type', None) == 'column' for c in children.values()):
+        return '<div class="row">' + ''.join(f'<div class="col">{_render(c, content)}</div>'
+                                             for c in children.values()) + '</div>'
+    return inner()
+
+
+def page_names(app=APP):
+    """Returns the dashboard's navigation pages."""
+    return list(find_widget(new_session(app, scope=EXPORT_SCOPE), 'selectbox', PAGE).options)
+
+
+def render_view(view, app=APP):
+    """Renders one view in a fresh session; returns its HTML body and content."""
+    at = new_session(app, scope=EXPORT_SCOPE)
+    errors = []
+    for kind, label, value in [('selectbox', PAGE, view['page'])] + [tuple(step) for step in view.get('steps', ())]:
+        try:
+            apply_step(at, kind, label, tuple(value) if kind in ('slider', 'select_slider') and
+                       isinstance(value, list) else value)
+        except LookupError as exc:
+            errors.append(str(exc))
+    errors += [exception.message for exception in at.exception]
+    content = {'figures': [], 'metrics': [], 'tables': []}
+    body = _render(at.main, content)
+    return {'name': view['name'], 'page': view['page'], 'steps': [list(s) for s in view.get('steps', ())],
+            'errors': errors, 'body': body, **content}
+
+
+def _render_task(task):
+    return render_view(*task)
+
+
+def _page_html(view, views, stamp):
+    links = ''.join(f'<a href="{v["file"]}.html"{" class=current" if v is view else ""}>{escape(v["name"])}</a>'
+                    for v in views)
+    figures = json.dumps(view['figures']).replace('</', '<\\/')
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8">
+<title>{escape(view['name'])} · NCAT Operations Dashboard</title>
+<script src="plotly.min.js"></script><style>{CSS}</style></head>
+<body><nav>{links}</nav><main>{view['body']}<p class="stamp">{escape(stamp)}</p></main>
+<script type="application/json" id="figures">{figures}</script>
+<script>
+JSON.parse(document.getElementById('figures').textContent).forEach(function (fig, i) {{
+  Plotly.newPlot('chart-' + i, fig.data, fig.layout, {{responsive: true, displaylogo: false}});
+}});
+</script></body></html>
+"""
+
+
+def build_bundle(out, views=None, app=APP, max_workers=None):
+    """Renders every page's default view plus `views` (default `DEFAULT_VIEWS`) into `out`.
+
+    Returns the manifest (one entry per view with its file, figure count and errors).
+    """
+    start = time.perf_counter()
+    share_script_cache()
+    views = [{'name': re.sub(r'^\W+', '', page), 'page': page} for page in page_names(app)] + \
+        list(DEFAULT_VIEWS if views is None else views)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=share_script_cache) as pool:
+        rendered = list(pool.map(_render_task, [(view, app) for view in views]))
+
+    os.makedirs(out, exist_ok=True)
+    with open(os.path.join(out, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    used = set()
+    for view in rendered:
+        slug = _slug(view['name'])
+        while slug in used:
+            slug += '-2'
+        used.add(slug)
+        view['file'] = slug
+    stamp = f"Static snapshot · data version {data_version(load_data())} · generated {time.strftime('%Y-%m-%d %H:%M')}"
+    for view in rendered:
+        with open(os.path.join(out, f"{view['file']}.html"), 'w', encoding='utf-8') as f:
+            f.write(_page_html(view, rendered, stamp))
+        with open(os.path.join(out, f"{view['file']}.json"), 'w', encoding='utf-8') as f:
+            json.dump({k: v for k, v in view.items() if k != 'body'}, f, ensure_ascii=False)
+    index = {'name': 'Index', 'body': '<h1>NCAT Operations Dashboard</h1><ul>' + ''.join(
+        f'<li><a href="{v["file"]}.html">{escape(v["name"])}</a></li>' for v in rendered) + '</ul>', 'figures': []}
+    with open(os.path.join(out, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(_page_html(index, rendered, stamp))
+
+    manifest = [{'name': v['name'], 'page': v['page'], 'steps': v['steps'], 'file': f"{v['file']}.html",
+                 'figures': len(v['figures']), 'errors': v['errors']} for v in rendered]
+    with open(os.path.join(out, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'generated': stamp, 'seconds': time.perf_counter() - start, 'views': manifest},
+                  f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the dashboard as a static HTML/JSON bundle.')
+    parser.add_argument('--out', default='snapshot', help='output directory')
+    parser.add_argument('--views', help='JSON file of extra views (default: DEFAULT_VIEWS)')
+    parser.add_argument('--workers', type=int, help='render processes (default: one per CPU)')
+    parser.add_argument('--app', default=APP)
+    args = parser.parse_args(argv)
+
+    views = None
+    if args.views:
+        with open(args.views, encoding='utf-8') as f:
+            views = json.load(f)
+    start = time.perf_counter()
+    manifest = build_bundle(args.out, views, args.app, args.workers)
+    for view in manifest:
+        status = '; '.join(view['errors']) or 'ok'
+        print(f"{view['file']:<55} {view['figures']:>3} figures  {status}")
+    print(f"{len(manifest)} views written to {args.out} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    # AppTest replaces `__main__` with the dashboard script, so run the
+    # package module's `main` for pool tasks to pickle by an importable name
+    from ncat_analytics.export import main as package_main
+    package_main()
@@ -0,0 +1,178 @@
+"""Registry catchment geometries for the map view.
+
+Geometries come from a local GeoJSON file (`NCAT_GEOJSON`, default
+`<data dir>/registries.geojson`). Each feature carries a `Registry` property
+matching the registry names in the data, and is a `Polygon` or
+`MultiPolygon` (a catchment) or a `Point` (a venue).
+
+Full-resolution boundaries are far larger than a dashboard map needs, so
+`RegistryShapes.from_geojson` simplifies every ring once per detail level in
+`LEVELS` (Douglas-Peucker) and stores the result as integer coordinates at
+the level's precision, delta-encoded in the smallest integer type that
+holds them. A built `RegistryShapes` is a handful of small arrays that
+pickles compactly into the disk cache; `geojson(level, registries)` decodes
+one level back into a FeatureCollection for Plotly.
+"""
+import json
+import os
+
+import numpy as np
+
+from .cases import data_dir
+
+# Detail level -> (simplification tolerance in degrees, decimal places kept)
+LEVELS = {
+    'State': (0.02, 3),
+    'Region': (0.005, 4),
+    'Local': (0.001, 5),
+}
+
+DEFAULT_LEVEL = 'Region'
+
+
+def geojson_path():
+    return os.environ.get('NCAT_GEOJSON', os.path.join(data_dir(), 'registries.geojson'))
+
+
+def geojson_signature(path=None):
+    """Returns ((path, size, mtime),) for the GeoJSON file, or () when there is none."""
+    path = path or geojson_path()
+    if not os.path.exists(path):
+        return ()
+    return ((path, os.path.getsize(path), os.path.getmtime(path)),)
+
+
+def simplify(points, tolerance):
+    """Returns the Douglas-Peucker simplification of an (n, 2) line; the end points are kept."""
+    n = len(points)
+    if n <= 2:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        segment = end - start
+        inner = points[first + 1:last] - start
+        length = np.hypot(*segment)
+        if length == 0:
+            distance = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distance = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        farthest = int(distance.argmax())
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack += [(first, split), (split, last)]
+    return points[keep]
+
+
+def _simplify_ring(ring, tolerance):
+    """Simplifies a closed ring, keeping at least a triangle."""
+    simplified = simplify(ring, tolerance)
+    if len(simplified) < 4:
+        simplified = ring[np.linspace(0, len(ring) - 1, 4).round().astype(int)]
+    return simplified
+
+
+def _polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+def _centroid(ring):
+    """Returns the area-weighted centroid of a closed ring (its vertex mean if degenerate)."""
+    x, y = ring[:-1, 0], ring[:-1, 1]
+    x1, y1 = np.roll(x, -1), np.roll(y, -1)
+    cross = x * y1 - x1 * y
+    area = cross.sum() / 2
+    if abs(area) < 1e-12:
+        return ring[:-1].mean(axis=0)
+    return np.array([((x + x1) * cross).sum(), ((y + y1) * cross).sum()]) / (6 * area)
+
+
+def _encode(rings, decimals):
+    """Returns rings as one delta-encoded integer array and ring offsets."""
+    coords = np.concatenate(rings) if rings else np.empty((0, 2))
+    quantised = np.round(coords * 10 ** decimals).astype(np.int64)
+    deltas = np.diff(quantised, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    # The first delta is absolute and usually the largest
+    dtype = np.int16 if len(deltas) <= 1 or np.abs(deltas[1:]).max() < 2 ** 15 else np.int32
+    start = quantised[:1].astype(np.int64)
+    offsets = np.cumsum([0] + [len(ring) for ring in rings]).astype(np.int32)
+    return start, deltas[1:].astype(dtype), offsets
+
+
+class RegistryShapes:
+    """Simplified, quantised registry geometries at every detail level."""
+
+    def __init__(self, names, polygon_counts, ring_counts, levels, points, centroids, source_vertices):
+        self.names = names
+        # Per feature: polygons; per polygon: rings (outer first)
+        self.polygon_counts = polygon_counts
+        self.ring_counts = ring_counts
+        # Level -> (start, deltas, ring offsets, decimals)
+        self.levels = levels
+        # Registry -> (lon, lat) of point features and polygon centroids
+        self.points = points
+        self.centroids = centroids
+        self.source_vertices = source_vertices
+
+    @classmethod
+    def from_geojson(cls, path=None, levels=LEVELS):
+        with open(path or geojson_path(), encoding='utf-8') as f:
+            collection = json.load(f)
+        names, polygon_counts, ring_counts, rings, points, centroids = [], [], [], [], {}, {}
+        for feature in collection.get('features', []):
+            registry = (feature.get('properties') or {}).get('Registry')
+            geometry = feature.get('geometry') or {}
+            if registry is None:
+                continue
+            if geometry.get('type') == 'Point':
+                points[registry] = tuple(float(v) for v in geometry['coordinates'][:2])
+                continue
+            polygons = [[np.asarray(ring, dtype=float)[:, :2] for ring in polygon] for polygon in _polygons(geometry)]
+            if not polygons:
+                continue
+            names.append(registry)
+            polygon_counts.append(len(polygons))
+            ring_counts += [len(polygon) for polygon in polygons]
+            rings += [ring for polygon in polygons for ring in polygon]
+            # The centroid of the largest outer ring labels the catchment
+            outer = max((polygon[0] for polygon in polygons), key=len)
+            centroids[registry] = tuple(float(v) for v in _centroid(outer))
+        encoded = {level: (*_encode([_simplify_ring(ring, tolerance) for ring in rings], decimals), decimals)
+                   for level, (tolerance, decimals) in levels.items()}
+        return cls(names, np.array(polygon_counts, dtype=np.int32), np.array(ring_counts, dtype=np.int32),
+                   encoded, points, centroids, int(sum(len(ring) for ring in rings)))
+
+    @property
+    def nbytes(self):
+        return {level: start.nbytes + deltas.nbytes + offsets.nbytes
+                for level, (start, deltas, offsets, _) in self.levels.items()}
+
+    def vertices(self, level):
+        return len(self.levels[level][1]) + 1 if len(self.levels[level][2]) > 1 else 0
+
+    def geojson(self, level=DEFAULT_LEVEL, registries=None):
+        """Returns a FeatureCollection of the polygon features at `level`, optionally only `registries`."""
+        start, deltas, offsets, decimals = self.levels[level]
+        coords = (np.cumsum(np.concatenate([start, deltas.astype(np.int64)]), axis=0) / 10 ** decimals).round(decimals)
+        wanted = None if registries is None else set(registries)
+        features, ring, polygon = [], 0, 0
+        for name, n_polygons in zip(self.names, self.polygon_counts):
+            polygons = []
+            for count in self.ring_counts[polygon:polygon + n_polygons]:
+                polygons.append([coords[offsets[i]:offsets[i + 1]].tolist() for i in range(ring, ring + count)])
+                ring += count
+            polygon += n_polygons
+            if wanted is None or name in wanted:
+                features.append({'type': 'Feature', 'properties': {'Registry': name},
+                                 'geometry': {'type': 'MultiPolygon', 'coordinates': polygons}})
+        return {'type': 'FeatureCollection', 'features': features}
@@ -0,0 +1,341 @@
+"""Property-level dispute linkage over the `cases` extract.
+
+The `cases` extract carries the rented property's `Address` and the
+`Applicant`. Addresses are typed free-form, so one property shows up as
+"Unit 3, 12 King Street Newtown NSW 2042", "3/12 KING ST, NEWTOWN" or with
+a misspelt street. `PropertyLinks.from_extract` resolves them in four steps:
+
+1. `parse_addresses` normalises each distinct address (case, punctuation,
+   street types, unit spellings, state and postcode) into unit, number,
+   street and locality. Addresses that normalise to the same text are one
+   property without any comparison.
+2. Blocking: only addresses with the same locality and street number are
+   ever compared.
+3. Sorted neighbourhood: the normalised addresses are sorted by block,
+   street and unit, and again by block, unit and street. Each address is
+   compared with the next `window - 1` in each order. A pair links when the
+   units agree and the street names are at least `STREET_SIMILARITY`
+   alike. A pair between `PARTY_SIMILARITY` and that links only when both
+   addresses share an applicant.
+4. The links are merged into connected components, one per property.
+
+A blank address, or one with neither a street number nor a street type
+(e.g. "unknown"), cannot be resolved; each case at one is a property of
+its own, so it never counts as a repeat dispute.
+
+Comparisons grow with distinct addresses x window rather than with all
+pairs, so millions of cases link in seconds.
+
+`dispute_counts` reduces the linked cases to counts per (Year, Registry,
+List, Category, Party, Prior, Prior_Party). `Prior` and `Prior_Party` are
+the category and party of the previous case at the same property within
+`repeat_days`, or `FIRST` if there was none. `repeat_rates` and
+`transitions` read those counts, so they can be scoped like the outcome
+counts.
+"""
+import time
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from .cases import iter_chunks
+
+LINK_COLUMNS = ['Case_ID', 'Lodged', 'Registry', 'List', 'Category', 'Party', 'Applicant', 'Address']
+
+CELL = ['Year', 'Registry', 'List', 'Category', 'Party', 'Prior', 'Prior_Party']
+
+FIRST = 'First dispute'
+
+WINDOW = 5
+
+STREET_SIMILARITY = 0.85
+
+PARTY_SIMILARITY = 0.7
+
+REPEAT_DAYS = 365
+
+STREET_TYPES = {
+    'street': 'st', 'road': 'rd', 'avenue': 'ave', 'av': 'ave', 'drive': 'dr', 'place': 'pl',
+    'parade': 'pde', 'highway': 'hwy', 'lane': 'ln', 'crescent': 'cres', 'cr': 'cres', 'court': 'ct',
+    'terrace': 'tce', 'close': 'cl', 'boulevard': 'bvd', 'boulevarde': 'bvd', 'circuit': 'cct',
+    'square': 'sq', 'esplanade': 'esp', 'grove': 'gr', 'way': 'way',
+}
+
+UNIT_WORDS = 'unit|u|apartment|apt|flat|villa|suite|shop|room'
+
+STATES = 'nsw|act|vic|qld|sa|wa|tas|nt'
+
+_TYPES = '|'.join(sorted(set(STREET_TYPES) | set(STREET_TYPES.values()), key=len, reverse=True))
+
+
+def parse_addresses(addresses):
+    """Returns the unit, number, street, locality and normalised `Key` of each address."""
+    s = (pd.Series(addresses, dtype=object).fillna('').astype(str).str.lower()
+         .str.replace(r"[.,;#']", ' ', regex=True)
+         .str.replace(r'\s*/\s*', '/', regex=True)
+         .str.replace(r'\s+', ' ', regex=True).str.strip())
+    postcode = s.str.extract(r'\b(\d{4})$', expand=False).fillna('')
+    s = s.str.replace(r'\s*\b\d{4}$', '', regex=True).str.replace(rf'\s*\b(?:{STATES})$', '', regex=True)
+
+    # "Unit 3", "U3", "Apt 3" anywhere, else a leading "3/12"
+    unit_pattern = rf'\b(?:{UNIT_WORDS})\s*(\d+[a-z]?|[a-z]\d+)\b'
+    unit = s.str.extract(unit_pattern, expand=False)
+    s = s.str.replace(unit_pattern, ' ', regex=True).str.strip()
+    slash = s.str.extract(r'^(\w+)/(?=\d)', expand=False)
+    s = s.str.replace(r'^\w+/(?=\d)', '', regex=True)
+    unit = unit.fillna(slash).fillna('').str.replace(r'^0+(?=\w)', '', regex=True)
+
+    number = s.str.extract(r'^(\d+[a-z]?)(?:-\d+[a-z]?)?\s', expand=False).fillna('')
+    s = s.str.replace(r'^\d+[a-z]?(?:-\d+[a-z]?)?\s', '', regex=True).str.strip()
+    # At least one word before the street type, so "st johns rd" keeps its "st"
+    parts = s.str.extract(rf'^(?P<name>\S.*?)\s(?P<type>{_TYPES})\b(?P<locality>.*)$')
+    name = parts['name'].fillna(s)
+    street_type = parts['type'].map(lambda t: STREET_TYPES.get(t, t), na_action='ignore').fillna('')
+    locality = parts['locality'].fillna('').str.strip()
+    parsed = pd.DataFrame({
+        'Unit': unit, 'Number': number, 'Street': name.str.strip(), 'Type': street_type,
+        'Locality': locality.where(locality != '', postcode), 'Postcode': postcode,
+    })
+    parsed['Key'] = (parsed['Unit'] + '/' + parsed['Number'] + ' ' + parsed['Street'] + ' ' + parsed['Type']
+                     + ' ' + parsed['Locality'])
+    return parsed
+
+
+def linkable(parsed):
+    """Returns whether each parsed address names a street with a number or a street type."""
+    return ((parsed['Street'] != '') & ((parsed['Number'] != '') | (parsed['Type'] != ''))).to_numpy()
+
+
+def _neighbours(order, block, window):
+    """Returns the (first, second) pairs within `window` of each other in `order` and in the same block."""
+    firsts, seconds = [], []
+    for step in range(1, window):
+        first, second = order[:-step], order[step:]
+        same = block[first] == block[second]
+        firsts.append(first[same])
+        seconds.append(second[same])
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def _street_similarity(parsed, first, second):
+    """Returns the similarity of the street names of each pair; 0 unless units and street types agree."""
+    unit, street, kind = (parsed[c].to_numpy() for c in ('Unit', 'Street', 'Type'))
+    comparable = (unit[first] == unit[second]) & ((kind[first] == kind[second]) | (kind[first] == '') | (kind[second] == ''))
+    similarity = np.zeros(len(first))
+    for i in np.flatnonzero(comparable):
+        similarity[i] = SequenceMatcher(None, street[first[i]], street[second[i]]).ratio()
+    return similarity
+
+
+def _shared_party(first, second, address_parties):
+    """Returns whether each (first, second) pair of addresses has an applicant in common."""
+    pairs = pd.DataFrame({'First': first, 'Second': second, 'Pair': np.arange(len(first))})
+    shared = (pairs.merge(address_parties.rename(columns={'Address': 'First'}), on='First')
+              .merge(address_parties.rename(columns={'Address': 'Second'}), on=['Second', 'Applicant']))
+    found = np.zeros(len(first), dtype=bool)
+    found[shared['Pair'].to_numpy()] = True
+    return found
+
+
+def _components(n, first, second):
+    """Returns a component id for each of `n` nodes joined by the (first, second) edges."""
+    labels = np.arange(n)
+    while len(first):
+        low = np.minimum(labels[first], labels[second])
+        if (labels[first] == low).all() and (labels[second] == low).all():
+            break
+        np.minimum.at(labels, first, low)
+        np.minimum.at(labels, second, low)
+        # Pointer jumping: every label points at a smaller or equal node
+        while True:
+            jumped = labels[labels]
+            if (jumped == labels).all():
+                break
+            labels = jumped
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def link_addresses(parsed, address_parties, window=WINDOW):
+    """Returns a property id per parsed address and the number of candidate pairs compared.
+
+    `address_parties` has one row per distinct (`Address`, `Applicant`)
+    code pair, where `Address` is a row position in `parsed`.
+    """
+    _, key_of = np.unique(parsed['Key'].to_numpy(dtype=str), return_inverse=True)
+    distinct = parsed.groupby(key_of).first().reset_index(drop=True)
+    block = (distinct['Locality'] + '|' + distinct['Number']).to_numpy()
+    first, second = [], []
+    for columns in (['Street', 'Type', 'Unit'], ['Unit', 'Street', 'Type']):
+        order = np.lexsort(tuple(distinct[c].to_numpy() for c in reversed(columns)) + (block,))
+        pair = _neighbours(order, block, window)
+        first.append(pair[0])
+        second.append(pair[1])
+    first, second = np.concatenate(first), np.concatenate(second)
+    pairs = np.unique(np.sort(np.column_stack([first, second]), axis=1), axis=0) if len(first) else np.empty((0, 2), int)
+    first, second = pairs[:, 0], pairs[:, 1]
+    resolved = linkable(distinct)
+    keep = resolved[first] & resolved[second]
+    first, second = first[keep], second[keep]
+    similarity = _street_similarity(distinct, first, second)
+    linked = similarity >= STREET_SIMILARITY
+    maybe = ~linked & (similarity >= PARTY_SIMILARITY)
+    if maybe.any():
+        # Applicants are recorded per raw address; move them onto the normalised keys
+        parties = address_parties.assign(Address=key_of[address_parties['Address'].to_numpy()]).drop_duplicates()
+        linked[maybe] = _shared_party(first[maybe], second[maybe], parties)
+    component = _components(len(distinct), first[linked], second[linked])
+    return component[key_of], len(first)
+
+
+def has_addresses(name='cases', directory=None):
+    """Returns whether extract `name` has every column in `LINK_COLUMNS`."""
+    first = next(iter_chunks(name, chunksize=1, directory=directory), None)
+    return first is not None and set(LINK_COLUMNS) <= set(first.columns)
+
+
+class _Codes:
+    """Incremental string -> int code table across chunks."""
+
+    def __init__(self):
+        self.index = pd.Index([], dtype=object)
+
+    def encode(self, values):
+        values = values.fillna('').astype(str)
+        new = pd.Index(values.unique()).difference(self.index)
+        if len(new):
+            self.index = self.index.append(new)
+        return self.index.get_indexer(values).astype(np.int32)
+
+
+class PropertyLinks:
+    """Cases linked to resolved properties."""
+
+    def __init__(self, cases, addresses, stats):
+        # One row per case sorted by property and lodgement date
+        self.cases = cases
+        # One row per raw address: `Address`, normalised `Key`, `Property` and its `Cases`
+        self.addresses = addresses
+        self.stats = stats
+
+    @classmethod
+    def from_extract(cls, name='cases', chunksize=500_000, directory=None, window=WINDOW):
+        start = time.perf_counter()
+        addresses, applicants = _Codes(), _Codes()
+        frames = []
+        for chunk in iter_chunks(name, columns=LINK_COLUMNS, chunksize=chunksize, directory=directory):
+            frames.append(pd.DataFrame({
+                'Case_ID': chunk['Case_ID'].astype(str),
+                'Lodged': pd.to_datetime(chunk['Lodged']).to_numpy(dtype='datetime64[D]'),
+                **{c: chunk[c].astype('category') for c in ('Registry', 'List', 'Category', 'Party')},
+                'Address': addresses.encode(chunk['Address']),
+                'Applicant': applicants.encode(chunk['Applicant']),
+            }))
+        if not frames:
+            return None
+        cases = pd.concat(frames, ignore_index=True)
+        for column in ('Registry', 'List', 'Category', 'Party'):
+            cases[column] = cases[column].astype(str).astype('category')
+        parsed = parse_addresses(addresses.index)
+        address_parties = cases[['Address', 'Applicant']].drop_duplicates()
+        property_of, compared = link_addresses(parsed, address_parties, window)
+        # Unresolvable addresses are no property (-1); each of their cases becomes its own below
+        resolved = linkable(parsed)
+        property_of = np.where(resolved, property_of, -1)
+        property_of[resolved] = np.unique(property_of[resolved], return_inverse=True)[1]
+        properties = int(property_of.max()) + 1 if resolved.any() else 0
+        table = pd.DataFrame({'Address': addresses.index, 'Key': parsed['Key'].to_numpy(), 'Property': property_of,
+                              'Cases': np.bincount(cases['Address'].to_numpy(), minlength=len(addresses.index))})
+        case_property = property_of[cases['Address'].to_numpy()]
+        unlinked = case_property < 0
+        case_property[unlinked] = properties + np.arange(unlinked.sum())
+        cases['Property'] = case_property.astype(np.int32)
+        cases = cases.drop(columns=['Address', 'Applicant']).sort_values(['Property', 'Lodged'], kind='stable',
+                                                                         ignore_index=True)
+        stats = {
+            'cases': len(cases), 'addresses': len(table), 'normalised': parsed['Key'].nunique(),
+            'compared': compared, 'properties': properties, 'unlinked': int(unlinked.sum()),
+            'seconds': time.perf_counter() - start,
+        }
+        return cls(cases, table, stats)
+
+    def dispute_counts(self, repeat_days=REPEAT_DAYS, case_ids=None):
+        """Returns case counts indexed by `CELL`; a case repeats a dispute within `repeat_days` of the last one.
+
+        With `case_ids` only those cases are counted, each still against the
+        previous case at its property, whether or not that one is among them.
+        """
+        cases = self.cases
+        property_id = cases['Property'].to_numpy()
+        lodged = cases['Lodged'].to_numpy()
+        repeat = np.zeros(len(cases), dtype=bool)
+        repeat[1:] = (property_id[1:] == property_id[:-1]) & (lodged[1:] - lodged[:-1] <= np.timedelta64(repeat_days, 'D'))
+        prior = {}
+        for column in ('Category', 'Party'):
+            previous = cases[column].astype(str).shift()
+            prior[f'Prior_{column}' if column == 'Party' else 'Prior'] = previous.where(repeat, FIRST)
+        cases = cases.assign(Year=cases['Lodged'].dt.year, **prior)
+        if case_ids is not None:
+            cases = cases[cases['Case_ID'].isin(case_ids)]
+        counts = cases.groupby(CELL, observed=True).size()
+        return counts.astype('int64')
+
+    def histories(self, registries=None, lists=None, min_cases=2, top=50, events=10, case_ids=None):
+        """Returns the `top` properties by number of cases, with their latest `events` disputes.
+
+        With `case_ids` only those cases are counted and listed.
+        """
+        cases = self.cases
+        if case_ids is not None:
+            cases = cases[cases['Case_ID'].isin(case_ids)]
+        if registries is not None:
+            cases = cases[cases['Registry'].isin(registries)]
+        if lists is not None:
+            cases = cases[cases['List'].isin(lists)]
+        sizes = cases.groupby('Property').size()
+        chosen = sizes[sizes >= min_cases].sort_values(ascending=False, kind='stable').head(top)
+        cases = cases[cases['Property'].isin(chosen.index)]
+        grouped = cases.groupby('Property')
+        latest = cases[grouped.cumcount(ascending=False) < events]
+        latest = latest.assign(Event=latest['Lodged'].dt.strftime('%Y-%m') + ' ' + latest['Category'].astype(str)
+                               + ' (' + latest['Party'].astype(str) + ')')
+        earlier = (chosen - events).clip(lower=0)
+        history = latest.groupby('Property')['Event'].agg(' → '.join)
+        history = np.where(earlier > 0, '… ' + earlier.astype(str) + ' earlier → ', '') + history.reindex(chosen.index)
+        # The most used spelling names the property
+        addresses = (self.addresses[self.addresses['Property'].isin(chosen.index)]
+                     .sort_values('Cases', ascending=False, kind='stable')
+                     .drop_duplicates('Property').set_index('Property')['Address'])
+        history = pd.DataFrame({
+            'Address': addresses.reindex(chosen.index),
+            'Registry': grouped['Registry'].agg(lambda r: r.astype(str).mode().iloc[0]),
+            'Cases': chosen,
+            'First': grouped['Lodged'].min().dt.date,
+            'Last': grouped['Lodged'].max().dt.date,
+            'History': history,
+        }, index=chosen.index)
+        return history.rename_axis('Property').reset_index(drop=True)
+
+
+def repeat_rates(counts, by=('Category',), years=None, categories=None):
+    """Returns cases, repeat cases and the repeat share (%) per `by` group."""
+    by = list(by)
+    df = counts.rename('Cases').reset_index()
+    if years is not None:
+        df = df[df['Year'].isin(years)]
+    if categories is not None:
+        df = df[df['Category'].isin(categories)]
+    df = df.assign(Repeat=df['Cases'].where(df['Prior'] != FIRST, 0))
+    # Suppressed (NaN) counts are left out of the sums, which are still whole numbers
+    table = df.groupby(by)[['Cases', 'Repeat']].sum().astype('int64')
+    table['Repeat_%'] = (table['Repeat'] / table['Cases'].where(table['Cases'] > 0) * 100).round(1)
+    return table
+
+
+def transitions(counts, prior='Prior', to='Category', years=None):
+    """Returns repeat cases as a `prior` x `to` table, e.g. Repairs followed by a termination."""
+    df = counts.rename('Cases').reset_index()
+    if years is not None:
+        df = df[df['Year'].isin(years)]
+    df = df[df['Prior'] != FIRST]
+    return df.pivot_table(index=prior, columns=to, values='Cases', aggfunc='sum', fill_value=0)
@@ -0,0 +1,212 @@
+"""Load test: many concurrent dashboard sessions in one worker process.
+
+Each session is a headless `streamlit.testing.v1.AppTest` that replays a
+navigation script (switching pages, moving sliders, toggling multiselects).
+Sessions run on threads of the same process, so they share the Streamlit
+caches and the GIL exactly like sessions served by one worker.
+
+    python -m ncat_analytics.loadtest --sessions 16 --repeat 3
+
+The report gives rerun throughput, p50/p95/p99 rerun latency and the
+resident memory added per session. This module imports Streamlit, so it is
+not imported by `ncat_analytics` itself.
+"""
+import argparse
+import json
+import os
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+from .access import Scope
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ncat_dashboard.py')
+
+PAGE = 'Choose a page:'
+
+# Headless sessions sign in with this scope; the dashboard refuses a session without one
+SESSION_SCOPE = Scope('loadtest', 'executive', None, None)
+
+# Script name -> steps of (widget kind, label, value)
+SCRIPTS = {
+    'analyst': [
+        ('selectbox', PAGE, '📈 Tenancy Trends'),
+        ('slider', 'Select Year Range', (2019, 2024)),
+        ('slider', 'Select Year Range', (2017, 2022)),
+        ('selectbox', PAGE, '🏢 Application Categories'),
+        ('multiselect', 'Select Years to Compare', [2022, 2023, 2024]),
+        ('selectbox', 'View Mode:', '⚖️ Terminations Only'),
+        ('selectbox', PAGE, '📋 Detailed Party Breakdown'),
+        ('multiselect', 'Select Years to Analyze:', [2023, 2024]),
+    ],
+    'registry_manager': [
+        ('selectbox', PAGE, '🗺️ Geographic Distribution'),
+        ('selectbox', 'Select Year', 2023),
+        ('selectbox', 'Select Analysis Type:', '📊 Individual List Types by Office'),
+        ('selectbox', 'Select Application Type:', 'Social Housing'),
+        ('selectbox', PAGE, '⚖️ NCAT Lists Comparison'),
+        ('slider', 'Select Year Range', (2020, 2024)),
+        ('selectbox', 'Select Analysis Type:', '🗺️ List Types by Registry'),
+        ('multiselect', 'Select List Types to Compare:', ['Private Tenancy', 'General', 'Strata Schemes']),
+    ],
+    'executive': [
+        ('selectbox', PAGE, '🏠 Overview'),
+        ('multiselect', 'Break Down By:', ['Registry']),
+        ('selectbox', PAGE, '👥 Party Analysis'),
+        ('selectbox', PAGE, '🧮 Pivot Explorer'),
+        ('multiselect', 'Rows:', ['Registry', 'List']),
+        ('selectbox', 'Sort By:', '2024'),
+    ],
+}
+
+
+def rss_bytes():
+    """Returns the current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def find_widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No {kind} labelled '{label}' on this page")
+
+
+def apply_step(at, kind, label, value):
+    """Sets one widget and reruns; raises `LookupError` if it is not on the page."""
+    widget = find_widget(at, kind, label)
+    return (widget.select if kind == 'selectbox' else widget.set_value)(value).run()
+
+
+def share_script_cache():
+    """Makes every `AppTest` run reuse one compiled script.
+
+    A Streamlit server compiles the script once per process, but `AppTest`
+    compiles it on every run, which inflates rerun latency and, across
+    threads, can fail inside `ast.parse` on Python 3.11.
+    """
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+
+def new_session(app=APP, timeout=120, scope=SESSION_SCOPE):
+    """Returns a session signed in with `scope` after its first run."""
+    at = AppTest.from_file(app, default_timeout=timeout)
+    at.session_state['password_correct'] = True
+    at.session_state['scope'] = scope
+    at.run()
+    return at
+
+
+def run_session(at, steps, repeat=1, think_time=0.0):
+    """Replays `steps` `repeat` times on `at`; returns rerun latencies in seconds and errors."""
+    latencies, errors = [], []
+    if at.exception:
+        errors.append(at.exception[0].message)
+
+    def rerun(action):
+        start = time.perf_counter()
+        action()
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            errors.append(at.exception[0].message)
+
+    for _ in range(repeat):
+        for kind, label, value in steps:
+            try:
+                find_widget(at, kind, label)
+            except LookupError as exc:
+                errors.append(str(exc))
+                continue
+            rerun(lambda: apply_step(at, kind, label, value))
+            if think_time:
+                time.sleep(think_time)
+    return latencies, errors
+
+
+def load_test(sessions=8, scripts=None, repeat=1, think_time=0.0, app=APP, timeout=120):
+    """Runs `sessions` concurrent sessions, cycling through `scripts`; returns a report dict."""
+    scripts = list(scripts or SCRIPTS)
+    share_script_cache()
+    # Warm the shared caches so the report measures steady-state reruns
+    run_session(new_session(app, timeout), SCRIPTS[scripts[0]][:1])
+    baseline = rss_bytes()
+
+    sessions_at = [new_session(app, timeout) for _ in range(sessions)]
+    lock = threading.Lock()
+    latencies, errors = [], []
+
+    def worker(i):
+        result = run_session(sessions_at[i], SCRIPTS[scripts[i % len(scripts)]], repeat, think_time)
+        with lock:
+            latencies.extend(result[0])
+            errors.extend(result[1])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(worker, range(sessions)))
+    wall = time.perf_counter() - start
+    # Sessions are still referenced here, so their state counts towards RSS
+    per_session = (rss_bytes() - baseline) / sessions
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (np.nan,) * 3
+    return {
+        'sessions': sessions,
+        'scripts': scripts,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'error_samples': sorted(set(errors))[:5],
+        'wall_seconds': wall,
+        'reruns_per_second': len(latencies) / wall,
+        'p50_ms': p50 * 1000,
+        'p95_ms': p95 * 1000,
+        'p99_ms': p99 * 1000,
+        'rss_per_session_mib': per_session / 2 ** 20,
+    }
+
+
+def format_report(report):
+    lines = [
+        f"{report['sessions']} sessions · scripts: {', '.join(report['scripts'])}",
+        f"{report['reruns']} reruns in {report['wall_seconds']:.1f} s · {report['reruns_per_second']:.2f} reruns/s",
+        f"rerun latency p50 {report['p50_ms']:.0f} ms · p95 {report['p95_ms']:.0f} ms · p99 {report['p99_ms']:.0f} ms",
+        f"memory per session {report['rss_per_session_mib']:.1f} MiB",
+        f"errors {report['errors']}",
+    ]
+    lines += [f"  {error}" for error in report['error_samples']]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Drive concurrent headless dashboard sessions.')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[8],
+                        help='concurrent sessions; several values run one test each')
+    parser.add_argument('--script', choices=list(SCRIPTS), action='append',
+                        help='navigation script(s) to cycle through (default: all)')
+    parser.add_argument('--repeat', type=int, default=1, help='times each session replays its script')
+    parser.add_argument('--think-time', type=float, default=0.0, help='seconds between interactions')
+    parser.add_argument('--app', default=APP)
+    parser.add_argument('--json', help='also write the reports to this file')
+    args = parser.parse_args(argv)
+
+    reports = []
+    for sessions in args.sessions:
+        report = load_test(sessions, args.script, args.repeat, args.think_time, args.app)
+        print(format_report(report), end='\n\n', flush=True)
+        reports.append(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
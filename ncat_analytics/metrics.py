@@ -0,0 +1,274 @@
+"""Page computations for the NCAT dashboard.
+
+Each function takes the source DataFrames (see `ncat_analytics.data`) and
+returns a plain DataFrame, Series or dict, so the same numbers can be produced
+from the dashboard, a notebook or a batch job.
+"""
+import pandas as pd
+
+from .compare import consecutive_changes
+from .data import registry_columns
+
+# Years with a complete 12 months of lodgements
+FULL_YEARS = (2017, 2024)
+
+# Category column -> display name
+CATEGORY_LABELS = {
+    'Termination_NonPayment': 'Termination (Non-Payment)',
+    'Rental_Bonds': 'Rental Bonds',
+    'General_Orders': 'General Orders',
+    'Repairs': 'Repairs',
+    'Rent_Other_Payments': 'Rent & Other Payments',
+    'Termination_Breach_s87': 'Termination (Breach s.87)',
+    'Termination_CoTenant_s102': 'Termination (Co-Tenant s.102)',
+    'Termination_Other': 'Termination (Other)'
+}
+
+TERMINATION_CATEGORIES = ['Termination (Non-Payment)', 'Termination (Breach s.87)',
+                          'Termination (Co-Tenant s.102)', 'Termination (Other)']
+NON_TERMINATION_CATEGORIES = ['Rental Bonds', 'General Orders', 'Repairs', 'Rent & Other Payments']
+
+# List column -> display name
+LIST_LABELS = {
+    'Tenancy': 'Tenancy',
+    'Social_Housing': 'Social Housing',
+    'General': 'General',
+    'Home_Building': 'Home Building',
+    'Strata_Schemes': 'Strata Schemes',
+    'Motor_Vehicles': 'Motor Vehicles'
+}
+
+# Party-category spellings differ between annual reports; applied in order
+PARTY_CATEGORY_ALIASES = [
+    ('Rental bonds', 'Rental Bonds'),
+    ('General orders', 'General Orders'),
+    ('Termination - breach', 'Termination - Breach'),
+    ('Termination - non-payment of rent', 'Termination non-payment of rent'),
+    ('Termination - other', 'Termination - Other'),
+    ('Termination by co-tenant (s102)', 'Termination by co-tenant (s.102)'),
+    ('Termination by a co-tenant (s 102)', 'Termination by co-tenant (s.102)'),
+    ('Termination - Breach (s 87)', 'Termination - Breach (s.87)'),
+]
+
+# Normalised party-category name -> category display name
+PARTY_CATEGORY_LABELS = {
+    'Rental Bonds': 'Rental Bonds',
+    'General Orders': 'General Orders',
+    'Rent and other payments': 'Rent & Other Payments',
+    'Repairs': 'Repairs',
+    'Termination - Breach (s.87)': 'Termination (Breach s.87)',
+    'Termination non-payment of rent': 'Termination (Non-Payment)',
+    'Termination by co-tenant (s.102)': 'Termination (Co-Tenant s.102)',
+    'Termination - Other': 'Termination (Other)',
+    'Termination other': 'Termination (Other)',
+}
+
+
+def _full_years(df, years=FULL_YEARS):
+    return df[df['Year'].between(years[0], years[1])]
+
+
+# Overview
+
+def overview_metrics(df_tenancy, latest_year=2024, base_year=2017, years=FULL_YEARS):
+    """Returns the headline figures shown on the Overview page."""
+    by_year = df_tenancy.set_index('Year')['Total_Applications']
+    latest = by_year.loc[latest_year]
+    base = by_year.loc[base_year]
+    return {
+        'latest_year': latest_year,
+        'latest_total': latest,
+        'peak_year': by_year.idxmax(),
+        'peak_value': by_year.max(),
+        'annual_average': _full_years(df_tenancy, years)['Total_Applications'].mean(),
+        'growth_pct': (latest - base) / base * 100,
+    }
+
+
+# Tenancy trends
+
+def yoy_changes(df, value_col='Total_Applications'):
+    """Adds `YoY_Change` (%) and `YoY_Absolute` columns between consecutive rows of `df`."""
+    out = consecutive_changes(df, measure=value_col)
+    return out.rename(columns={'Change_%': 'YoY_Change', 'Change': 'YoY_Absolute'}).drop(columns='Previous')
+
+
+# Application categories
+
+def melt_categories(df_categories):
+    """Returns the category table in long form (`Year`, `Category`, `Applications`)."""
+    df_long = df_categories.melt(id_vars=['Year'], value_vars=list(CATEGORY_LABELS),
+                                 var_name='Category', value_name='Applications')
+    df_long = df_long.dropna()
+    df_long['Category'] = df_long['Category'].map(CATEGORY_LABELS)
+    return df_long
+
+
+def filter_categories(df_cat_long, group=None):
+    """Restricts long category data to `'termination'`, `'non-termination'` or (None) all."""
+    if group == 'termination':
+        return df_cat_long[df_cat_long['Category'].isin(TERMINATION_CATEGORIES)]
+    if group == 'non-termination':
+        return df_cat_long[df_cat_long['Category'].isin(NON_TERMINATION_CATEGORIES)]
+    return df_cat_long
+
+
+def category_yoy(df_cat_long):
+    """Returns per-category percentage change between consecutive years present in the data."""
+    out = consecutive_changes(df_cat_long, dims=('Category',))
+    out = out.rename(columns={'Change_%': 'YoY_Change'}).drop(columns=['Previous', 'Change'])
+    return out.dropna(subset=['YoY_Change']).reset_index(drop=True)
+
+
+def category_summary(df_cat_long, years=FULL_YEARS):
+    """Returns per-category annual statistics over `years`, largest average first."""
+    stats = _full_years(df_cat_long, years).groupby('Category')['Applications'].agg(
+        ['mean', 'min', 'max', 'sum', 'std']).round(0)
+    stats.columns = ['Annual Average', 'Minimum', 'Maximum', f'Total ({years[0]}-{years[1]})', 'Std Deviation']
+    return stats.sort_values('Annual Average', ascending=False).astype(int)
+
+
+# Party analysis
+
+def party_ratios(df_parties):
+    """Returns years with landlord and tenant counts plus their ratio and tenant share."""
+    df = df_parties.dropna(subset=['Landlord', 'Tenant']).copy()
+    df['LL_Tenant_Ratio'] = df['Landlord'] / df['Tenant']
+    df['Tenant_Percentage'] = df['Tenant'] / (df['Landlord'] + df['Tenant']) * 100
+    return df
+
+
+def melt_parties(df_parties):
+    """Returns landlord and tenant counts in long form (`Year`, `Party`, `Applications`)."""
+    df = df_parties.dropna(subset=['Landlord', 'Tenant'])
+    return df.melt(id_vars=['Year'], value_vars=['Landlord', 'Tenant'],
+                   var_name='Party', value_name='Applications')
+
+
+def party_summary(df_party_ratios, years=FULL_YEARS):
+    """Returns average landlord, tenant and ratio figures over `years`."""
+    df = _full_years(df_party_ratios, years)
+    return {
+        'avg_landlord': df['Landlord'].mean(),
+        'avg_tenant': df['Tenant'].mean(),
+        'avg_ratio': df['LL_Tenant_Ratio'].mean(),
+    }
+
+
+# Detailed party breakdown
+
+def normalize_party_categories(df_party_categories):
+    """Harmonises category spellings and adds landlord/tenant percentage columns."""
+    df = df_party_categories.copy()
+    for old, new in PARTY_CATEGORY_ALIASES:
+        df['Category'] = df['Category'].str.replace(old, new, regex=False)
+    df['Landlord_Pct'] = (df['Landlord'] / df['Total'] * 100).round(1)
+    df['Tenant_Pct'] = (df['Tenant'] / df['Total'] * 100).round(1)
+    return df
+
+
+def party_split_groups(df_party_cat, year, threshold=70):
+    """Splits a year's categories into tenant-dominated, mixed and landlord-dominated frames."""
+    df = df_party_cat[df_party_cat['Year'] == year]
+    low = 100 - threshold
+    return {
+        'tenant': df[df['Tenant_Pct'] > threshold].sort_values('Tenant_Pct', ascending=False),
+        'mixed': df[df['Tenant_Pct'].between(low, threshold)].sort_values('Tenant_Pct', ascending=False),
+        'landlord': df[df['Landlord_Pct'] > threshold].sort_values('Landlord_Pct', ascending=False),
+    }
+
+
+# Registries
+
+def registry_values(df_registry, year, registries=None):
+    """Returns one year's counts as a Series indexed by registry (all registries by default)."""
+    row = df_registry[df_registry['Year'] == year]
+    if row.empty:
+        return pd.Series(dtype=float)
+    return row.iloc[0][registries or registry_columns(df_registry)]
+
+
+def melt_registries(df_registry, registries=None):
+    """Returns a per-registry table in long form (`Year`, `Registry`, `Applications`)."""
+    return df_registry.melt(id_vars=['Year'], value_vars=registries or registry_columns(df_registry),
+                            var_name='Registry', value_name='Applications')
+
+
+def registry_stats(df_registry_long, years=FULL_YEARS):
+    """Returns per-registry annual statistics over `years`, largest average first."""
+    stats = _full_years(df_registry_long, years).groupby('Registry')['Applications'].agg(
+        ['mean', 'min', 'max', 'std']).round(0)
+    stats.columns = ['Average', 'Minimum', 'Maximum', 'Std Dev']
+    return stats.sort_values('Average', ascending=False).astype(int)
+
+
+# NCAT lists
+
+def melt_lists(df_other_lists):
+    """Returns list volumes in long form (`Year`, `List_Type`, `Applications`) for the lists present."""
+    df_long = df_other_lists.melt(id_vars=['Year'], value_vars=[c for c in LIST_LABELS if c in df_other_lists],
+                                  var_name='List_Type', value_name='Applications')
+    df_long['List_Type'] = df_long['List_Type'].map(LIST_LABELS)
+    return df_long
+
+
+def list_shares(df_lists_long):
+    """Adds each list's yearly `Total` and `Percentage` share."""
+    totals = df_lists_long.groupby('Year')['Applications'].transform('sum')
+    out = df_lists_long.copy()
+    out['Total'] = totals
+    out['Percentage'] = out['Applications'] / totals * 100
+    return out
+
+
+def list_summary(df_lists_long, years=FULL_YEARS):
+    """Returns per-list averages, totals and overall share over `years`."""
+    total_col = f'Total ({years[0]}-{years[1]})'
+    stats = _full_years(df_lists_long, years).groupby('List_Type')['Applications'].agg(
+        ['mean', 'sum', 'std']).round(0)
+    stats.columns = ['Annual Average', total_col, 'Std Deviation']
+    stats['Market Share %'] = (stats[total_col] / stats[total_col].sum() * 100).round(1)
+    stats = stats.sort_values('Annual Average', ascending=False)
+    int_cols = ['Annual Average', total_col, 'Std Deviation']
+    stats[int_cols] = stats[int_cols].astype(int)
+    return stats
+
+
+def registry_comparison(list_frames, year, list_types=None, registries=None):
+    """Returns `List_Type`, `Registry`, `Applications` rows for one year across list tables."""
+    frames = []
+    for list_type, df_source in list_frames.items():
+        if list_types is not None and list_type not in list_types:
+            continue
+        values = registry_values(df_source, year, registries)
+        if values.empty:
+            continue
+        frames.append(pd.DataFrame({'List_Type': list_type, 'Registry': list(values.index),
+                                    'Applications': values.to_numpy()}))
+    if not frames:
+        return pd.DataFrame(columns=['List_Type', 'Registry', 'Applications'])
+    df = pd.concat(frames, ignore_index=True)
+    if list_types is not None:
+        order = {name: i for i, name in enumerate(list_types)}
+        df = df.sort_values('List_Type', key=lambda s: s.map(order), kind='stable').reset_index(drop=True)
+    return df
+
+
+def specialization(list_frames, year, registries=None):
+    """Adds each registry's share of every list type's volume for `year`."""
+    df = registry_comparison(list_frames, year, registries=registries)
+    totals = df.groupby('List_Type')['Applications'].transform('sum')
+    # Suppressed counts stay missing rather than reading as 0%
+    df['Percentage_of_Type'] = (df['Applications'] / totals.where(totals > 0) * 100).fillna(0).mask(df['Applications'].isna())
+    return df
+
+
+def top_performers(df_specialization):
+    """Returns the highest-volume registry for each list type."""
+    df_specialization = df_specialization.dropna(subset=['Applications'])
+    idx = df_specialization.groupby('List_Type')['Applications'].idxmax()
+    top = df_specialization.loc[idx, ['List_Type', 'Registry', 'Applications', 'Percentage_of_Type']]
+    top = top.sort_values('Applications', ascending=False)
+    top['Percentage_of_Type'] = top['Percentage_of_Type'].round(1)
+    top['Applications'] = top['Applications'].astype(int)
+    return top
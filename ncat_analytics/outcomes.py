@@ -0,0 +1,106 @@
+"""Outcome rates from a streaming join of lodgements to orders.
+
+The `cases` extract is joined to the `orders` extract (`Case_ID`, `Outcome`,
+`Decided`) as a sorted merge: both must be sorted by `Case_ID`, and each
+side is read in chunks, so only one chunk of cases plus the orders up to that
+chunk's last key are held in memory. The join is reduced straight into counts
+per (Year, Registry, List, Category, Party, Outcome); cases without an order count
+as `Pending`.
+"""
+import pandas as pd
+
+from .cases import iter_chunks, with_year
+
+CELL = ['Year', 'Registry', 'List', 'Category', 'Party']
+OUTCOMES = ['Orders made', 'Dismissed', 'Withdrawn', 'Conciliated']
+PENDING = 'Pending'
+
+
+def normalize_outcomes(outcomes):
+    """Maps free-text outcomes onto `OUTCOMES`, with anything else as `Other`."""
+    lookup = {outcome.lower(): outcome for outcome in OUTCOMES}
+    return outcomes.astype(str).str.strip().str.lower().map(lookup).fillna('Other')
+
+
+def _check_sorted(keys, last_key, extract):
+    if not keys.is_monotonic_increasing or (last_key is not None and len(keys) and keys.iloc[0] < last_key):
+        raise ValueError(f"The '{extract}' extract must be sorted by Case_ID for a streaming join")
+
+
+def merge_join(case_chunks, order_chunks):
+    """Yields each chunk of cases left-joined to its orders (`Outcome` is NaN when none).
+
+    When a case has several orders the latest decision wins.
+    """
+    order_chunks = iter(order_chunks)
+    buffer = pd.DataFrame(columns=['Case_ID', 'Outcome', 'Decided'])
+    exhausted = False
+    last_case = last_order = None
+    for cases in case_chunks:
+        if cases.empty:
+            continue
+        _check_sorted(cases['Case_ID'], last_case, 'cases')
+        last_case = cases['Case_ID'].iloc[-1]
+        # Pull orders until the buffer runs past this chunk's last case
+        while not exhausted and (buffer.empty or buffer['Case_ID'].iloc[-1] <= last_case):
+            try:
+                orders = next(order_chunks)
+            except StopIteration:
+                exhausted = True
+                break
+            _check_sorted(orders['Case_ID'], last_order, 'orders')
+            if len(orders):
+                last_order = orders['Case_ID'].iloc[-1]
+                buffer = pd.concat([buffer, orders], ignore_index=True) if len(buffer) else orders
+        matched = buffer['Case_ID'] <= last_case
+        current = (buffer[matched].sort_values(['Case_ID', 'Decided'], kind='stable')
+                   .drop_duplicates('Case_ID', keep='last'))
+        buffer = buffer[~matched]
+        yield cases.merge(current[['Case_ID', 'Outcome']], on='Case_ID', how='left')
+
+
+def outcome_counts(cases='cases', orders='orders', chunksize=500_000, directory=None):
+    """Returns application counts indexed by (Year, Registry, List, Category, Party, Outcome)."""
+    case_chunks = iter_chunks(cases, columns=['Case_ID', 'Lodged', 'Registry', 'List', 'Category', 'Party'],
+                              chunksize=chunksize, directory=directory)
+    order_chunks = iter_chunks(orders, columns=['Case_ID', 'Outcome', 'Decided'],
+                               chunksize=chunksize, directory=directory)
+    totals = None
+    for joined in merge_join(case_chunks, order_chunks):
+        joined = with_year(joined)
+        outcome = normalize_outcomes(joined['Outcome']).where(joined['Outcome'].notna(), PENDING)
+        counts = joined.assign(Outcome=outcome).groupby(CELL + ['Outcome']).size()
+        totals = counts if totals is None else totals.add(counts, fill_value=0)
+    if totals is None:
+        return pd.Series(dtype='int64',
+                         index=pd.MultiIndex.from_arrays([[]] * (len(CELL) + 1), names=CELL + ['Outcome']))
+    return totals.astype('int64')
+
+
+def outcome_rates(counts, by=('Category',), years=None, registries=None, lists=None, categories=None,
+                  include_pending=False):
+    """Returns outcome percentages per `by` group, plus `Decided` and `Pending` counts.
+
+    Rates are shares of decided applications unless `include_pending`.
+    """
+    by = list(by)
+    df = counts.rename('Applications').reset_index()
+    if years is not None:
+        df = df[df['Year'].isin(years)]
+    if registries is not None:
+        df = df[df['Registry'].isin(registries)]
+    if lists is not None:
+        df = df[df['List'].isin(lists)]
+    if categories is not None:
+        df = df[df['Category'].isin(categories)]
+    table = df.pivot_table(index=by, columns='Outcome', values='Applications', aggfunc='sum', fill_value=0)
+    pending = table.pop(PENDING) if PENDING in table else pd.Series(0, index=table.index)
+    # Every outcome gets a column, even when the selection has none of it
+    table = table.reindex(columns=OUTCOMES + (['Other'] if 'Other' in table else []), fill_value=0)
+    decided = table.sum(axis=1)
+    denominator = decided + pending if include_pending else decided
+    rates = table.div(denominator.where(denominator > 0), axis=0).mul(100).round(1)
+    # Suppressed (NaN) counts are left out of the sums, which are still whole numbers
+    rates['Decided'] = decided.astype('int64')
+    rates['Pending'] = pending.astype('int64')
+    return rates
@@ -0,0 +1,209 @@
+"""Profile a single dashboard rerun.
+
+`RerunProfiler` samples the stack of the thread running the script every
+`interval` seconds. With `trace_memory` it also traces allocations: a line
+tracer on the script's own frames reads `tracemalloc` before each script line,
+giving the net and peak memory of every line (as memory_profiler does), and a
+snapshot at the end gives the largest allocations still held. Allocation
+tracing slows the run several times over, mostly in allocation-heavy Plotly
+code, so timings from such a run overstate those calls. The samples
+are attributed to the deepest line of the dashboard script on the stack (the
+call site) and the first pandas/Plotly/NumPy/Streamlit function called from
+our code (the hot call), and can be exported as folded stacks for flame-graph
+tools (flamegraph.pl, speedscope).
+
+Nothing here runs unless a profiler is started, so there is no overhead for
+unprofiled reruns.
+"""
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import pandas as pd
+
+LIBRARIES = ('pandas', 'plotly', 'numpy', 'streamlit')
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _library(filename):
+    for library in LIBRARIES:
+        if f'{os.sep}{library}{os.sep}' in filename:
+            return library
+    return None
+
+
+def _module(filename):
+    """Returns a dotted module name for library files, e.g. `pandas.core.frame`."""
+    parts = os.path.splitext(filename)[0].split(os.sep)
+    library = _library(filename)
+    return '.'.join(parts[len(parts) - 1 - parts[::-1].index(library):]) if library else os.path.basename(filename)
+
+
+class RerunProfiler:
+    """Sampling profile plus allocation snapshot of one script run."""
+
+    def __init__(self, script_path, interval=0.005, trace_memory=True):
+        self.script_path = os.path.abspath(script_path)
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.stacks = Counter()
+        self.line_net = Counter()
+        self.line_peak = Counter()
+        self.wall = None
+        self.snapshot = None
+        self.peak_bytes = None
+
+    def _is_own(self, filename):
+        return filename == self.script_path or filename.startswith(_PACKAGE_DIR)
+
+    def start(self):
+        """Starts profiling the calling thread."""
+        self._thread_id = threading.get_ident()
+        self._started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            self._line = None
+            sys.settrace(self._trace_call)
+            for frame in self._script_frames():
+                frame.f_trace = self._trace_line
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='ncat-profiler', daemon=True)
+        self._start = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def _script_frames(self):
+        frame = sys._getframe()
+        while frame is not None:
+            if frame.f_code.co_filename == self.script_path:
+                yield frame
+            frame = frame.f_back
+
+    def _trace_call(self, frame, event, arg):
+        # Only the script's own frames get a line tracer
+        if frame.f_code.co_filename == self.script_path:
+            return self._trace_line
+        return None
+
+    def _trace_line(self, frame, event, arg):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._line is not None:
+            self.line_net[self._line] += current - self._current
+            self.line_peak[self._line] = max(self.line_peak[self._line], peak - self._current)
+        tracemalloc.reset_peak()
+        self._current = current
+        if event == 'return':
+            caller = frame.f_back
+            self._line = caller.f_lineno if caller is not None and caller.f_code.co_filename == self.script_path else None
+        else:
+            self._line = frame.f_lineno
+        return self._trace_line
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append((frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self.wall = time.perf_counter() - self._start
+        self._stop.set()
+        self._sampler.join()
+        if self.trace_memory:
+            sys.settrace(None)
+            for frame in self._script_frames():
+                frame.f_trace = None
+            self._trace_line(sys._getframe(), 'line', None)
+            # Leave out the profiler's own samples
+            self.snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__)])
+            self.peak_bytes = max(self.line_peak.values(), default=0)
+        if self._started_tracing:
+            tracemalloc.stop()
+        return self
+
+    def _ms(self, samples):
+        total = sum(self.stacks.values())
+        return samples / total * self.wall * 1000 if total else 0.0
+
+    def hot_calls(self, top=25):
+        """Returns samples per (call site in the script, library or package function called)."""
+        counts = Counter()
+        for stack, n in self.stacks.items():
+            sites = [i for i, (filename, _, _) in enumerate(stack) if filename == self.script_path]
+            if not sites:
+                continue
+            own = max(i for i, (filename, _, _) in enumerate(stack) if self._is_own(filename))
+            call = next((f'{_module(f)}.{func}' for f, _, func in stack[own + 1:] if _library(f)), None)
+            if call is None:
+                filename, _, func = stack[own]
+                call = f'{func} (own code)' if own != sites[-1] else '(script line)'
+            counts[(stack[sites[-1]][1], call)] += n
+        rows = [{'Line': line, 'Call': call, 'Samples': n, 'Time_ms': self._ms(n)}
+                for (line, call), n in counts.most_common(top)]
+        return self._with_source(pd.DataFrame(rows, columns=['Line', 'Call', 'Samples', 'Time_ms']))
+
+    def hot_lines(self, top=15):
+        """Returns inclusive samples per line of the script (deepest script frame on the stack)."""
+        counts = Counter()
+        for stack, n in self.stacks.items():
+            lines = [line for filename, line, _ in stack if filename == self.script_path]
+            if lines:
+                counts[lines[-1]] += n
+        rows = [{'Line': line, 'Samples': n, 'Time_ms': self._ms(n)} for line, n in counts.most_common(top)]
+        return self._with_source(pd.DataFrame(rows, columns=['Line', 'Samples', 'Time_ms']))
+
+    def line_memory(self, top=15):
+        """Returns the peak and net traced memory of each script line, largest peaks first."""
+        rows = [{'Line': line, 'Peak_KiB': peak / 1024, 'Net_KiB': self.line_net[line] / 1024}
+                for line, peak in self.line_peak.most_common(top)]
+        return self._with_source(pd.DataFrame(rows, columns=['Line', 'Peak_KiB', 'Net_KiB']))
+
+    def largest_allocations(self, top=10):
+        """Returns the allocating source lines holding the most memory at the end of the run."""
+        rows = [{'Location': f'{_module(stat.traceback[0].filename)}:{stat.traceback[0].lineno}',
+                 'KiB': stat.size / 1024, 'Blocks': stat.count}
+                for stat in self.snapshot.statistics('lineno')[:top]]
+        return pd.DataFrame(rows, columns=['Location', 'KiB', 'Blocks'])
+
+    def _with_source(self, df):
+        df['Source'] = [linecache.getline(self.script_path, line).strip()[:80] for line in df['Line']]
+        return df
+
+    def folded_stacks(self):
+        """Returns the samples in folded-stack format (`frame;frame;frame count` per line)."""
+        lines = []
+        for stack, n in self.stacks.most_common():
+            frames = ';'.join(f'{func} ({os.path.basename(filename)}:{line})' for filename, line, func in stack)
+            lines.append(f'{frames} {n}')
+        return '\n'.join(lines) + '\n'
+
+    def report(self, title=''):
+        """Returns a plain-text report of the run."""
+        summary = f'Wall time {self.wall * 1000:.0f} ms · ' \
+                  f'{sum(self.stacks.values())} samples every {self.interval * 1000:.0f} ms'
+        if self.trace_memory:
+            summary += f' · peak line memory {self.peak_bytes / 2 ** 20:.1f} MiB (timings include tracing overhead)'
+        with pd.option_context('display.width', 200, 'display.max_colwidth', 80):
+            sections = [
+                f'Profile of one rerun{": " + title if title else ""}',
+                summary,
+                'Hottest calls by call site in the script',
+                self.hot_calls().round(1).to_string(index=False),
+                'Hottest script lines (inclusive)',
+                self.hot_lines().round(1).to_string(index=False),
+            ]
+            if self.trace_memory:
+                sections += ['Memory by script line (peak while the line ran, net still held after it)',
+                             self.line_memory().round(1).to_string(index=False),
+                             'Largest allocations still held at the end of the run',
+                             self.largest_allocations().round(1).to_string(index=False)]
+        return '\n\n'.join(sections) + '\n'
@@ -0,0 +1,280 @@
+"""Cross-table reconciliation of the source tables.
+
+The annual-report tables restate the same volumes at different grains, and
+they do not always agree (party-category `Repairs` 2018 is Landlord 0 +
+Tenant 284 against a Total of 308). Every identity below says that some
+*parts* sum to a *total*:
+
+    categories_sum        category columns sum to `Total_Applications`
+    parties_sum           Landlord + Tenant + Other sum to `Total_Applications`
+    tenancy_list          `df_other_lists['Tenancy']` equals `Total_Applications`
+    party_split           Landlord + Tenant equal the party-category `Total`
+    party_category_total  the party-category `Total` equals the category volume
+    registry_sum          a list's registry columns sum to its `df_other_lists` total
+    ccd_sum               a registry's per-list volumes sum to its Total CCD
+
+`reconcile` checks any number of identities in one batch: the parts of all
+identities are one flat array summed per group with `np.bincount`, so the
+cost is linear in the number of cells and stays well under a second for
+case-level aggregates with millions of cells. It returns one row per group
+(`checks`) and one quality flag per cell that takes part in a failing group
+(`flags`, keyed by table, row and column like `SnapshotStore.diff`).
+
+`QualityMonitor` reconciles each new data version in a background thread
+and keeps the results in the disk cache, so user reruns only read them.
+"""
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .data import REGISTRY_LISTS, data_version, registry_columns
+from .metrics import CATEGORY_LABELS, LIST_LABELS, PARTY_CATEGORY_LABELS, normalize_party_categories
+
+CHECKS = {
+    'categories_sum': 'Category columns sum to Total_Applications',
+    'parties_sum': 'Landlord + Tenant + Other sum to Total_Applications',
+    'tenancy_list': 'Tenancy list volume equals Total_Applications',
+    'party_split': 'Landlord + Tenant equal the party-category Total',
+    'party_category_total': 'Party-category Total equals the category volume',
+    'registry_sum': "Registry volumes sum to the list's total",
+    'ccd_sum': "Per-list volumes sum to the registry's Total CCD",
+}
+
+# A group passes when |actual - expected| <= max(1, TOLERANCE x expected)
+TOLERANCE = 0.005
+
+STATUSES = ('ok', 'mismatch', 'incomplete')
+
+CELL_COLUMNS = ['Check', 'Key', 'Table', 'Row', 'Column', 'Value']
+
+CHECK_COLUMNS = ['Check', 'Row', 'Table', 'Column', 'Expected', 'Actual', 'Difference', 'Difference_%', 'Status']
+
+FLAG_COLUMNS = ['Check', 'Key', 'Table', 'Row', 'Column', 'Status']
+
+Reconciliation = namedtuple('Reconciliation', ['checks', 'flags', 'seconds'])
+
+# List name -> its `df_other_lists` column
+_LIST_TOTALS = {label: column for column, label in {**LIST_LABELS, 'Tenancy': 'Private Tenancy'}.items()}
+
+
+def _cells(table, df, columns, keys, rows=None):
+    """Returns `columns` of `df` as long cells (`Check` is filled in by the caller).
+
+    `keys` gives each cell's group within the identity: one value per row, or
+    a (rows x columns) array. `rows` labels the rows (default the year).
+    """
+    columns = list(columns)
+    n, k = len(df), len(columns)
+    keys = np.asarray(keys, dtype=object)
+    rows = df['Year'].astype(str).to_numpy() if rows is None else np.asarray(rows, dtype=object)
+    return pd.DataFrame({
+        'Check': None,
+        'Key': keys.ravel() if keys.ndim == 2 else np.repeat(keys, k),
+        'Table': table.removeprefix('df_'),
+        'Row': np.repeat(rows, k),
+        'Column': np.tile(np.asarray(columns, dtype=object), n),
+        'Value': df[columns].to_numpy(dtype=float).ravel(),
+    }, columns=CELL_COLUMNS)
+
+
+def dataset_identities(data):
+    """Returns (parts, totals) long cell frames for every identity over `data`."""
+    years = data.df_tenancy['Year'].astype(str).to_numpy()
+    tenancy_total = _cells('df_tenancy', data.df_tenancy, ['Total_Applications'], years)
+    parts, totals = [], []
+
+    def identity(check, part_cells, total_cells):
+        parts.append(part_cells.assign(Check=check))
+        totals.append(total_cells.assign(Check=check))
+
+    category_years = data.df_categories['Year'].astype(str).to_numpy()
+    identity('categories_sum',
+             _cells('df_categories', data.df_categories, list(CATEGORY_LABELS), category_years), tenancy_total)
+    party_years = data.df_parties['Year'].astype(str).to_numpy()
+    identity('parties_sum', _cells('df_parties', data.df_parties, registry_columns(data.df_parties), party_years),
+             tenancy_total)
+    list_years = data.df_other_lists['Year'].astype(str).to_numpy()
+    if 'Tenancy' in data.df_other_lists:
+        identity('tenancy_list', _cells('df_other_lists', data.df_other_lists, ['Tenancy'], list_years),
+                 tenancy_total)
+
+    pc = data.df_party_categories
+    pc_rows = (pc['Year'].astype(str) + ' · ' + pc['Category']).to_numpy()
+    identity('party_split', _cells('df_party_categories', pc, ['Landlord', 'Tenant'], pc_rows, pc_rows),
+             _cells('df_party_categories', pc, ['Total'], pc_rows, pc_rows))
+    labels = normalize_party_categories(pc)['Category'].map(PARTY_CATEGORY_LABELS)
+    category_keys = np.char.add(np.char.add(category_years[:, None].astype(str), ' · '),
+                                np.array([CATEGORY_LABELS[c] for c in CATEGORY_LABELS])[None, :])
+    identity('party_category_total',
+             _cells('df_party_categories', pc, ['Total'], (pc['Year'].astype(str) + ' · ' + labels).to_numpy(),
+                    pc_rows),
+             _cells('df_categories', data.df_categories, list(CATEGORY_LABELS), category_keys, category_years))
+
+    for list_type, field in REGISTRY_LISTS.items():
+        df = getattr(data, field)
+        total_column = _LIST_TOTALS.get(list_type)
+        if total_column not in data.df_other_lists or not registry_columns(df):
+            continue
+        keys = (df['Year'].astype(str) + ' · ' + list_type).to_numpy()
+        identity('registry_sum', _cells(field, df, registry_columns(df), keys),
+                 _cells('df_other_lists', data.df_other_lists, [total_column],
+                        (data.df_other_lists['Year'].astype(str) + ' · ' + list_type).to_numpy()))
+
+    def by_registry(df):
+        columns = registry_columns(df)
+        years = df['Year'].astype(str).to_numpy()
+        return np.char.add(np.char.add(years[:, None].astype(str), ' · '), np.array(columns, dtype=str)[None, :])
+
+    lists = [getattr(data, field) for field in REGISTRY_LISTS.values()]
+    ccd = [_cells(field, df, registry_columns(df), by_registry(df))
+           for field, df in zip(REGISTRY_LISTS.values(), lists) if registry_columns(df)]
+    if ccd and registry_columns(data.df_total_ccd):
+        identity('ccd_sum', pd.concat(ccd, ignore_index=True),
+                 _cells('df_total_ccd', data.df_total_ccd, registry_columns(data.df_total_ccd),
+                        by_registry(data.df_total_ccd)))
+    return pd.concat(parts, ignore_index=True), pd.concat(totals, ignore_index=True)
+
+
+def _group_codes(parts, totals):
+    """Returns integer (Check, Key) group codes of `parts` and `totals` in one shared numbering."""
+    codes = []
+    for column in ('Check', 'Key'):
+        column_codes, uniques = pd.factorize(np.concatenate([parts[column].to_numpy(object),
+                                                             totals[column].to_numpy(object)]))
+        codes.append((column_codes, len(uniques)))
+    (check, _), (key, n_keys) = codes
+    combined, _ = pd.factorize(check.astype(np.int64) * max(n_keys, 1) + key)
+    return combined[:len(parts)], combined[len(parts):]
+
+
+def reconcile(parts, totals, tolerance=TOLERANCE):
+    """Checks that the parts of every (Check, Key) group sum to its total, in one batch.
+
+    `parts` and `totals` are long cell frames with `CELL_COLUMNS`. Groups
+    without parts are ignored; a group with a missing part or total is
+    `incomplete`. Returns a `Reconciliation`.
+    """
+    start = time.perf_counter()
+    part_codes, total_codes = _group_codes(parts, totals)
+    # Part codes are numbered first, so every group with parts has a code below `n`
+    n = part_codes.max() + 1 if len(part_codes) else 0
+    values = parts['Value'].to_numpy(dtype=float)
+    missing = np.isnan(values)
+    actual = np.bincount(part_codes, weights=np.where(missing, 0.0, values), minlength=n)
+    incomplete = np.bincount(part_codes, weights=missing, minlength=n) > 0
+
+    matched = np.flatnonzero(total_codes < n)
+    # The first total of a group wins, like a lookup
+    matched = matched[np.unique(total_codes[matched], return_index=True)[1]]
+    expected = np.full(n, np.nan)
+    expected[total_codes[matched]] = totals['Value'].to_numpy(dtype=float)[matched]
+    first_part = np.unique(part_codes, return_index=True)[1]
+
+    difference = actual - expected
+    incomplete |= np.isnan(expected)
+    failed = np.abs(difference) > np.maximum(1.0, tolerance * np.abs(expected))
+    status = np.select([incomplete, failed], ['incomplete', 'mismatch'], 'ok').astype(object)
+
+    table = np.full(n, None, dtype=object)
+    column = np.full(n, None, dtype=object)
+    table[total_codes[matched]] = totals['Table'].to_numpy(object)[matched]
+    column[total_codes[matched]] = totals['Column'].to_numpy(object)[matched]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = difference / expected * 100
+    checks = pd.DataFrame({
+        'Check': parts['Check'].to_numpy(object)[first_part], 'Row': parts['Key'].to_numpy(object)[first_part],
+        'Table': table, 'Column': column, 'Expected': expected, 'Actual': actual, 'Difference': difference,
+        'Difference_%': percent.round(1), 'Status': status,
+    }, columns=CHECK_COLUMNS)
+
+    # Only cells of failing groups become flags, so the frames built here stay small
+    flagged = status != 'ok'
+    part_flags = np.flatnonzero(flagged[part_codes])
+    total_flags = matched[flagged[total_codes[matched]]]
+    flags = pd.concat([parts.iloc[part_flags].assign(Status=status[part_codes[part_flags]]),
+                       totals.iloc[total_flags].assign(Status=status[total_codes[total_flags]])],
+                      ignore_index=True)[FLAG_COLUMNS].drop_duplicates(ignore_index=True)
+    return Reconciliation(checks, flags, time.perf_counter() - start)
+
+
+def reconcile_dataset(data, tolerance=TOLERANCE):
+    """Runs every identity over `data`."""
+    return reconcile(*dataset_identities(data), tolerance=tolerance)
+
+
+def failing_checks(result):
+    """Returns the groups that did not reconcile, largest relative differences first."""
+    failing = result.checks[result.checks['Status'] != 'ok']
+    return failing.iloc[np.argsort(-failing['Difference_%'].abs().fillna(np.inf).to_numpy(), kind='stable')]
+
+
+class QualityMonitor:
+    """Reconciles each new data version in a background thread.
+
+    `load` returns the live `Dataset`; versions in `store` (a `SnapshotStore`)
+    are checked too, so every version the dashboard can show has results.
+    Results go to `cache` (a `DiskCache`) keyed by data version and
+    `code_version`, so other processes and restarts reuse them.
+    """
+
+    def __init__(self, load, cache, code_version='', store=None, interval=300):
+        self.load = load
+        self.cache = cache
+        self.code_version = code_version
+        self.store = store
+        self.interval = interval
+        self.last_error = None
+        self._results = {}
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _key(self, version):
+        return self.cache.key('reconcile', version, self.code_version)
+
+    def results(self, version):
+        """Returns the `Reconciliation` of `version`, or None if it has not been checked yet."""
+        if version not in self._results:
+            result = self.cache.get(self._key(version))
+            if result is None:
+                return None
+            self._results[version] = result
+        return self._results[version]
+
+    def _reconcile(self, version, load):
+        if self.results(version) is None:
+            result = reconcile_dataset(load())
+            self.cache.set(self._key(version), result)
+            self._results[version] = result
+
+    def check(self):
+        """Reconciles every version without results; returns True if all are done."""
+        try:
+            data = self.load()
+            self._reconcile(data_version(data), lambda: data)
+            if self.store is not None:
+                for version in self.store.versions()['Version']:
+                    self._reconcile(version, lambda version=version: self.store.load(version))
+            self.last_error = None
+            return True
+        except Exception as exc:  # keep the thread alive; the dashboard shows the error
+            self.last_error = exc
+            return False
+
+    def _run(self):
+        while True:
+            self.check()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def notify(self):
+        """Wakes the monitor so a new version is checked without waiting for `interval`."""
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='ncat-quality', daemon=True)
+            self._thread.start()
+        return self
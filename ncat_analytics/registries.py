@@ -0,0 +1,70 @@
+"""Registry dimension table and per-capita rates.
+
+The dimension is read from a `registries` extract (CSV or Parquet, see
+`ncat_analytics.cases`) with columns
+
+    Registry                registry / hearing venue name, as in the data
+    Region                  reporting region
+    Catchment_Population    residents served by the registry
+    Rental_Bonds            rental-bond lodgements in the catchment
+    Staff_FTE               registry staffing (full-time equivalent)
+
+An optional `Year` column gives year-specific values; rows without a year
+apply to every year. Registries are discovered from the data, so a new venue
+only needs a row in the file (or none at all, in which case its rates are
+blank and its region is "Unassigned").
+"""
+import pandas as pd
+
+from .cases import iter_chunks
+
+ATTRIBUTES = ['Region', 'Catchment_Population', 'Rental_Bonds', 'Staff_FTE']
+
+# Rate column -> (denominator column, per how many)
+RATES = {
+    'Per_100k_Population': ('Catchment_Population', 100_000),
+    'Per_1k_Bonds': ('Rental_Bonds', 1_000),
+    'Per_Staff_FTE': ('Staff_FTE', 1),
+}
+
+
+def load_registry_dimension(names, name='registries', directory=None):
+    """Returns one row per registry in `names` (plus any extra in the file)."""
+    frames = list(iter_chunks(name, directory=directory))
+    if frames:
+        dimension = pd.concat(frames, ignore_index=True)
+    else:
+        dimension = pd.DataFrame(columns=['Registry', *ATTRIBUTES])
+    for col in ATTRIBUTES:
+        if col not in dimension:
+            dimension[col] = None
+    missing = sorted(set(names) - set(dimension['Registry']))
+    if missing:
+        dimension = pd.concat([dimension, pd.DataFrame({'Registry': missing})], ignore_index=True)
+    dimension['Region'] = dimension['Region'].fillna('Unassigned')
+    for col in ATTRIBUTES[1:]:
+        dimension[col] = pd.to_numeric(dimension[col], errors='coerce')
+    return dimension.reset_index(drop=True)
+
+
+def available_rates(dimension):
+    """Returns the rate columns whose denominators are present for at least one registry."""
+    return [rate for rate, (col, _) in RATES.items() if dimension[col].notna().any()]
+
+
+def with_rates(df_long, dimension, value_col='Applications'):
+    """Joins `Region` and every rate in `RATES` onto long (`Year`, `Registry`, value) data."""
+    keys = ['Registry']
+    if 'Year' in dimension and dimension['Year'].notna().any():
+        # Year-specific rows win over all-year rows
+        annual = dimension.dropna(subset=['Year']).astype({'Year': df_long['Year'].dtype})
+        default = dimension[dimension['Year'].isna()].drop(columns='Year')
+        out = df_long.merge(annual, on=['Registry', 'Year'], how='left')
+        out = out.merge(default, on=keys, how='left', suffixes=('', '_default'))
+        for col in ATTRIBUTES:
+            out[col] = out[col].fillna(out.pop(f'{col}_default'))
+    else:
+        out = df_long.merge(dimension.drop(columns='Year', errors='ignore'), on=keys, how='left')
+    for rate, (col, per) in RATES.items():
+        out[rate] = out[value_col] / out[col].where(out[col] > 0) * per
+    return out
@@ -0,0 +1,325 @@
+"""Full-text search over case descriptions.
+
+A `SearchIndex` under `NCAT_SEARCH_DIR` (default `<data dir>/search`) is an
+inverted index over the `Description` of every case in the `cases`
+extract, kept as
+
+    segments/<id>/            one segment per chunk of an extract file
+        terms.npy             sorted vocabulary (words and adjacent word pairs)
+        offsets.npy           start of each term's postings
+        postings.npy          sorted document numbers of each term
+        lodged.npy, ...       per-document case number, date and codes
+        text.bin, text.npy    descriptions as one UTF-8 blob plus offsets
+    index.json                extract file -> signature and segments
+
+`update` indexes only extract files that are new or whose size or mtime
+changed and drops segments of files that are gone, so new lodgements
+(a new monthly file, or rows appended to one) cost one file's worth of
+work. Segments are written to a temporary directory and renamed into
+place, and `index.json` is swapped atomically, so readers never see a
+partial index. Segment arrays are memory-mapped.
+
+Text is lower-cased and split into runs of letters and runs of digits, so
+"s87", "s.87" and "s 87" are all the words `s` and `87`. Adjacent word
+pairs are indexed too. A query matches the cases containing every one of
+its parts:
+
+    mould               a word
+    repair*             any word starting with "repair"
+    "bond claim"        a phrase (consecutive word pairs), as is s87
+
+`search` returns the match count, counts per (Year, Registry, List,
+Category, Party), the latest matching cases and the `Case_ID`s of all
+matches, in milliseconds. Case-level views filter on those IDs (see
+`LifecycleDigests.from_extract` and `PropertyLinks.dispute_counts`).
+
+    python -m ncat_analytics.search update
+    python -m ncat_analytics.search query '"bond claim" mould'
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .cases import data_dir, extract_files, iter_chunks, iter_file_chunks
+
+SEARCH_COLUMNS = ['Case_ID', 'Lodged', 'Registry', 'List', 'Category', 'Party', 'Description']
+
+CELL = ['Year', 'Registry', 'List', 'Category', 'Party']
+
+CODED = ['Registry', 'List', 'Category', 'Party']
+
+RESULT_COLUMNS = ['Case_ID', 'Lodged', 'Registry', 'List', 'Category', 'Party', 'Description']
+
+SearchResult = namedtuple('SearchResult', ['matches', 'counts', 'cases', 'case_ids', 'seconds'])
+
+_TOKEN = re.compile(r'[a-z]+|\d+')
+
+
+def search_dir():
+    return os.environ.get('NCAT_SEARCH_DIR', os.path.join(data_dir(), 'search'))
+
+
+def has_descriptions(name='cases', directory=None):
+    """Returns whether extract `name` has every column in `SEARCH_COLUMNS`."""
+    first = next(iter_chunks(name, chunksize=1, directory=directory), None)
+    return first is not None and set(SEARCH_COLUMNS) <= set(first.columns)
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower())
+
+
+def parse_query(query):
+    """Returns the parts of `query` as (kind, term) pairs, kind being `term` or `prefix`."""
+    parts = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        if word.endswith('*') and len(tokenize(word)) == 1:
+            parts.append(('prefix', tokenize(word)[0]))
+            continue
+        tokens = tokenize(phrase or word)
+        if len(tokens) == 1:
+            parts.append(('term', tokens[0]))
+        # A phrase is all of its consecutive word pairs
+        parts += [('term', f'{a} {b}') for a, b in zip(tokens, tokens[1:])]
+    return parts
+
+
+def _postings(descriptions):
+    """Returns (terms, offsets, postings) for a Series of texts; document numbers are row positions."""
+    words = descriptions.fillna('').astype(str).str.lower().str.findall(_TOKEN).explode().dropna()
+    docs = words.index.to_numpy(dtype=np.int64)
+    words = words.to_numpy(dtype=str)
+    # Adjacent pairs within a document
+    same = docs[1:] == docs[:-1]
+    pairs = np.char.add(np.char.add(words[:-1][same], ' '), words[1:][same])
+    terms = np.concatenate([words, pairs])
+    docs = np.concatenate([docs, docs[1:][same]])
+    vocabulary, term_ids = np.unique(terms, return_inverse=True)
+    entries = np.unique(term_ids.astype(np.int64) * (len(descriptions) + 1) + docs)
+    term_ids, docs = np.divmod(entries, len(descriptions) + 1)
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(vocabulary)))])
+    return vocabulary, offsets.astype(np.int64), docs.astype(np.int32)
+
+
+def _write_segment(directory, chunk):
+    """Writes one chunk of cases as a segment directory."""
+    chunk = chunk.reset_index(drop=True)
+    terms, offsets, postings = _postings(chunk['Description'])
+    text = chunk['Description'].fillna('').astype(str).str.encode('utf-8')
+    text_offsets = np.concatenate([[0], np.cumsum(text.str.len().to_numpy())]).astype(np.int64)
+    labels = {}
+    arrays = {'terms': terms, 'offsets': offsets, 'postings': postings, 'text': text_offsets,
+              'case_id': chunk['Case_ID'].astype(str).to_numpy(dtype=str),
+              'lodged': pd.to_datetime(chunk['Lodged']).to_numpy(dtype='datetime64[D]')}
+    for column in CODED:
+        codes, labels[column] = pd.factorize(chunk[column].astype(str))
+        arrays[column.lower()] = codes.astype(np.int16)
+    for name, values in arrays.items():
+        np.save(os.path.join(directory, f'{name}.npy'), values)
+    with open(os.path.join(directory, 'text.bin'), 'wb') as f:
+        f.write(b''.join(text))
+    with open(os.path.join(directory, 'labels.json'), 'w') as f:
+        json.dump({column: list(values) for column, values in labels.items()}, f)
+
+
+class _Segment:
+    """A memory-mapped index segment."""
+
+    def __init__(self, directory):
+        self.arrays = {name[:-4]: np.load(os.path.join(directory, name), mmap_mode='r')
+                       for name in os.listdir(directory) if name.endswith('.npy')}
+        self.text = np.memmap(os.path.join(directory, 'text.bin'), dtype=np.uint8, mode='r') \
+            if os.path.getsize(os.path.join(directory, 'text.bin')) else np.zeros(0, dtype=np.uint8)
+        with open(os.path.join(directory, 'labels.json')) as f:
+            self.labels = {column: np.array(values, dtype=object) for column, values in json.load(f).items()}
+        self.size = len(self.arrays['lodged'])
+
+    def _range(self, start, stop):
+        offsets = self.arrays['offsets']
+        return np.unique(self.arrays['postings'][offsets[start]:offsets[stop]])
+
+    def match(self, kind, term):
+        terms = self.arrays['terms']
+        start = np.searchsorted(terms, term)
+        if kind == 'prefix':
+            return self._range(start, np.searchsorted(terms, term + '\uffff'))
+        if start < len(terms) and terms[start] == term:
+            return np.asarray(self.arrays['postings'][self.arrays['offsets'][start]:self.arrays['offsets'][start + 1]])
+        return np.zeros(0, dtype=np.int32)
+
+    def allowed(self, column, values):
+        """Returns a mask over documents whose `column` is in `values`."""
+        return np.isin(self.labels[column], list(values))[self.arrays[column.lower()]]
+
+    def counts(self, docs):
+        """Returns the number of `docs` per `CELL`, counted on the integer codes."""
+        years = self.arrays['lodged'][docs].astype('datetime64[Y]').astype(np.int64)
+        first = years.min()
+        shape = [years.max() - first + 1] + [len(self.labels[column]) for column in CODED]
+        keys = np.ravel_multi_index(
+            [years - first] + [self.arrays[column.lower()][docs] for column in CODED], shape)
+        cells, counts = np.unique(keys, return_counts=True)
+        cells = np.unravel_index(cells, shape)
+        index = pd.MultiIndex.from_arrays(
+            [cells[0] + first + 1970] + [self.labels[column][codes] for column, codes in zip(CODED, cells[1:])],
+            names=CELL)
+        return pd.Series(counts, index=index, dtype='int64')
+
+    def frame(self, docs, text=False):
+        df = pd.DataFrame({'Case_ID': self.arrays['case_id'][docs], 'Lodged': self.arrays['lodged'][docs]})
+        for column in CODED:
+            df[column] = self.labels[column][self.arrays[column.lower()][docs]]
+        if text:
+            offsets = self.arrays['text']
+            df['Description'] = [bytes(self.text[offsets[d]:offsets[d + 1]]).decode('utf-8') for d in docs]
+        return df
+
+
+class SearchIndex:
+    """On-disk inverted index over the `Description` of the `cases` extract."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or search_dir()
+        os.makedirs(os.path.join(self.directory, 'segments'), exist_ok=True)
+        self._segments = {}
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, 'index.json')
+
+    def manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update(self, name='cases', chunksize=500_000, extract_dir=None):
+        """Indexes new or changed files of extract `name`; returns counts of files built, kept and dropped."""
+        start = time.perf_counter()
+        old = self.manifest()
+        manifest, built = {}, 0
+        for path in extract_files(name, extract_dir):
+            signature = [os.path.getsize(path), os.path.getmtime(path)]
+            entry = old.get(path)
+            if entry and entry['signature'] == signature and all(
+                    os.path.isdir(self._segment_path(s)) for s in entry['segments']):
+                manifest[path] = entry
+                continue
+            stem = hashlib.sha1(json.dumps([path] + signature).encode()).hexdigest()[:16]
+            segments = []
+            for i, chunk in enumerate(iter_file_chunks(path, SEARCH_COLUMNS, chunksize)):
+                segment = f'{stem}-{i}'
+                target = self._segment_path(segment)
+                if not os.path.isdir(target):
+                    tmp = tempfile.mkdtemp(dir=os.path.join(self.directory, 'segments'), suffix='.tmp')
+                    try:
+                        _write_segment(tmp, chunk)
+                        os.replace(tmp, target)
+                    except BaseException:
+                        shutil.rmtree(tmp, ignore_errors=True)
+                        raise
+                segments.append(segment)
+            manifest[path] = {'signature': signature, 'segments': segments}
+            built += 1
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, self._manifest_path())
+        # Segments no longer listed; readers that still map them keep their open files
+        live = {s for entry in manifest.values() for s in entry['segments']}
+        for segment in os.listdir(os.path.join(self.directory, 'segments')):
+            if segment not in live and not segment.endswith('.tmp'):
+                shutil.rmtree(self._segment_path(segment), ignore_errors=True)
+                self._segments.pop(segment, None)
+        return {'built': built, 'kept': len(manifest) - built, 'dropped': len(set(old) - set(manifest)),
+                'seconds': time.perf_counter() - start}
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, 'segments', segment)
+
+    def segments(self):
+        names = [s for entry in self.manifest().values() for s in entry['segments']]
+        for segment in names:
+            if segment not in self._segments:
+                self._segments[segment] = _Segment(self._segment_path(segment))
+        return [self._segments[s] for s in names]
+
+    def stats(self):
+        segments = self.segments()
+        return {'segments': len(segments), 'cases': sum(s.size for s in segments),
+                'terms': sum(len(s.arrays['terms']) for s in segments)}
+
+    def totals(self):
+        """Returns the number of indexed cases per `CELL`, the denominator for match shares."""
+        counts = [segment.counts(np.arange(segment.size)) for segment in self.segments() if segment.size]
+        if not counts:
+            return _no_counts()
+        return pd.concat(counts).groupby(level=CELL).sum()
+
+    def search(self, query, registries=None, lists=None, limit=100):
+        """Returns a `SearchResult` of the cases matching every part of `query`, optionally within `registries` and `lists`."""
+        start = time.perf_counter()
+        parts = parse_query(query)
+        counts, latest, case_ids, matches = [], [], [], 0
+        for segment in self.segments() if parts else []:
+            docs = None
+            for kind, term in parts:
+                found = segment.match(kind, term)
+                docs = found if docs is None else np.intersect1d(docs, found, assume_unique=True)
+                if not len(docs):
+                    break
+            if registries is not None and len(docs):
+                docs = docs[segment.allowed('Registry', registries)[docs]]
+            if lists is not None and len(docs):
+                docs = docs[segment.allowed('List', lists)[docs]]
+            if not len(docs):
+                continue
+            matches += len(docs)
+            counts.append(segment.counts(docs))
+            case_ids.append(segment.arrays['case_id'][docs])
+            # Text is only decoded for the latest `limit` matches of each segment
+            recent = docs[np.argsort(segment.arrays['lodged'][docs], kind='stable')[::-1][:limit]]
+            latest.append(segment.frame(recent, text=True))
+        if not counts:
+            return SearchResult(0, _no_counts(), pd.DataFrame(columns=RESULT_COLUMNS), np.array([], dtype=str),
+                                time.perf_counter() - start)
+        counts = pd.concat(counts).groupby(level=CELL).sum()
+        cases = (pd.concat(latest, ignore_index=True).sort_values('Lodged', ascending=False, kind='stable')
+                 .head(limit).reset_index(drop=True)[RESULT_COLUMNS])
+        return SearchResult(matches, counts, cases, np.concatenate(case_ids), time.perf_counter() - start)
+
+
+def _no_counts():
+    return pd.Series(dtype='int64', index=pd.MultiIndex.from_arrays([[]] * len(CELL), names=CELL))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build and query the case description search index.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('update', help='index new or changed case extract files')
+    query = commands.add_parser('query', help='search case descriptions')
+    query.add_argument('query')
+    query.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = SearchIndex()
+    with pd.option_context('display.width', 200, 'display.max_colwidth', 80):
+        if args.command == 'update':
+            print(index.update())
+        else:
+            result = index.search(args.query, limit=args.limit)
+            print(f"{result.matches:,} cases in {result.seconds * 1000:.1f} ms")
+            print(result.cases.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""Immutable, versioned snapshots of the dashboard tables.
+
+Published figures get revised between releases (the 2024 `General_Orders`
+count fell from 5,571 to 2,623), so every `Dataset` the dashboard loads is
+kept as a snapshot that can be reopened later. A `SnapshotStore` under
+`NCAT_VERSIONS_DIR` (default `<data dir>/versions`) holds
+
+    columns/<ab>/<hash>.npy   one file per table column, named by its content
+    <version>.json            created, label and the column hashes of each table
+
+Versions are named by `data_version`. A column is stored once however many
+versions contain it, so a revision that changes one column of one table adds
+one file. Numeric columns are memory-mapped on load and columns already open
+in this process are reused, so versions share unchanged columns in memory
+as well as on disk. Manifests and column files are written once and never
+modified.
+
+    python -m ncat_analytics.versions commit --label "2024 annual report"
+    python -m ncat_analytics.versions diff <old> <new>
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .cases import data_dir
+from .data import Dataset, data_version, load_data
+
+# Columns identifying a row of each table; every other table has one row per `Year`
+ROW_KEYS = {'df_party_categories': ['Year', 'Category']}
+
+DIFF_COLUMNS = ['Table', 'Row', 'Column', 'Before', 'After', 'Change']
+
+
+def versions_dir():
+    return os.environ.get('NCAT_VERSIONS_DIR', os.path.join(data_dir(), 'versions'))
+
+
+def _encode(series):
+    """Returns (array, digest) for one column; numeric arrays are hashed by their raw bytes."""
+    values = series.to_numpy()
+    digest = hashlib.sha1(str(series.dtype).encode())
+    if values.dtype.kind in 'biuf':
+        values = np.ascontiguousarray(values)
+        digest.update(values.dtype.str.encode())
+        digest.update(values.tobytes())
+    else:
+        values = values.astype(object)
+        digest.update(pickle.dumps(values.tolist(), protocol=4))
+    return values, digest.hexdigest()
+
+
+def _write_once(path, write):
+    """Writes `path` through a temporary file unless it already exists."""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class SnapshotStore:
+    """Content-addressed column store of `Dataset` versions."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or versions_dir()
+        os.makedirs(os.path.join(self.directory, 'columns'), exist_ok=True)
+        # Columns open in this process, shared by every version that contains them
+        self._open = weakref.WeakValueDictionary()
+
+    def _column_path(self, digest):
+        return os.path.join(self.directory, 'columns', digest[:2], f'{digest}.npy')
+
+    def _manifest_path(self, version):
+        return os.path.join(self.directory, f'{version}.json')
+
+    def commit(self, data, label=''):
+        """Stores `data` as a version unless it already exists; returns its version."""
+        version = data_version(data)
+        if os.path.exists(self._manifest_path(version)):
+            return version
+        tables = {}
+        for field, df in zip(data._fields, data):
+            columns = []
+            for name in df.columns:
+                values, digest = _encode(df[name])
+                _write_once(self._column_path(digest),
+                            lambda f, values=values: np.save(f, values, allow_pickle=values.dtype == object))
+                columns.append({'name': name, 'dtype': str(df[name].dtype), 'hash': digest,
+                                'bytes': int(df[name].memory_usage(index=False, deep=True))})
+            tables[field] = columns
+        manifest = {'version': version, 'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'label': label,
+                    'tables': tables}
+        # The manifest goes last, so it never names a column that is not on disk
+        _write_once(self._manifest_path(version), lambda f: f.write(json.dumps(manifest, indent=1).encode()))
+        return version
+
+    def manifest(self, version):
+        try:
+            with open(self._manifest_path(version), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"No data version '{version}' in {self.directory}") from None
+
+    def versions(self):
+        """Returns every stored version, newest first, with the columns it added to the store."""
+        manifests = []
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            with open(path, encoding='utf-8') as f:
+                manifests.append(json.load(f))
+        manifests.sort(key=lambda m: (m['created'], m['version']))
+        seen, rows = set(), []
+        for m in manifests:
+            digests = {c['hash'] for columns in m['tables'].values() for c in columns}
+            rows.append({'Version': m['version'], 'Created': m['created'], 'Label': m['label'],
+                         'Columns': len(digests), 'New_Columns': len(digests - seen)})
+            seen |= digests
+        return pd.DataFrame(rows[::-1], columns=['Version', 'Created', 'Label', 'Columns', 'New_Columns'])
+
+    def _column(self, entry):
+        values = self._open.get(entry['hash'])
+        if values is None:
+            path = self._column_path(entry['hash'])
+            try:
+                # A plain ndarray view of the map, so pandas sees an ordinary array
+                values = np.load(path, mmap_mode='r').view(np.ndarray)
+            except ValueError:
+                # Object columns cannot be memory-mapped
+                values = np.load(path, allow_pickle=True)
+            self._open[entry['hash']] = values
+        return values
+
+    def _table(self, columns):
+        df = pd.DataFrame({c['name']: self._column(c) for c in columns}, copy=False)
+        return df.astype({c['name']: c['dtype'] for c in columns if df[c['name']].dtype == object})
+
+    def load(self, version):
+        """Returns version `version` as a `Dataset`."""
+        tables = self.manifest(version)['tables']
+        return Dataset(*(self._table(tables[field]) for field in Dataset._fields))
+
+    def _cells(self, columns, keys, names):
+        """Returns columns `names` of a table in long form (`keys`, Column, Value)."""
+        if not columns:
+            return pd.DataFrame(columns=keys + ['Column', 'Value'])
+        return self._table(list(columns.values())).melt(
+            id_vars=keys, value_vars=[name for name in names if name in columns],
+            var_name='Column', value_name='Value').astype({'Value': object})
+
+    def diff(self, old, new):
+        """Returns the cells that differ between versions `old` and `new`, one row per cell.
+
+        Only columns whose content hashes differ are read, so unchanged tables
+        cost nothing. Added or removed rows and columns show a missing side.
+        """
+        before, after = self.manifest(old)['tables'], self.manifest(new)['tables']
+        frames = []
+        for field in Dataset._fields:
+            old_columns = {c['name']: c for c in before.get(field, [])}
+            new_columns = {c['name']: c for c in after.get(field, [])}
+            keys = ROW_KEYS.get(field, ['Year'])
+            changed = [name for name in dict.fromkeys([*old_columns, *new_columns])
+                       if name not in keys and (old_columns.get(name) or {}).get('hash') !=
+                       (new_columns.get(name) or {}).get('hash')]
+            if not changed and all(old_columns.get(k) == new_columns.get(k) for k in keys):
+                continue
+            cells = self._cells(old_columns, keys, changed).merge(
+                self._cells(new_columns, keys, changed), on=keys + ['Column'], how='outer',
+                suffixes=('_before', '_after'))
+            before_value, after_value = cells['Value_before'], cells['Value_after']
+            same = (before_value == after_value) | (before_value.isna() & after_value.isna())
+            cells = cells[~same.astype(bool)]
+            if cells.empty:
+                continue
+            frames.append(pd.DataFrame({
+                'Table': field.removeprefix('df_'),
+                'Row': cells[keys].astype(str).agg(' · '.join, axis=1),
+                'Column': cells['Column'],
+                'Before': cells['Value_before'],
+                'After': cells['Value_after'],
+                'Change': pd.to_numeric(cells['Value_after'], errors='coerce') -
+                pd.to_numeric(cells['Value_before'], errors='coerce'),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=DIFF_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def stats(self):
+        """Returns bytes on disk against the bytes the stored versions would take without sharing."""
+        files = glob.glob(os.path.join(self.directory, 'columns', '*', '*.npy'))
+        logical = 0
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            with open(path, encoding='utf-8') as f:
+                logical += sum(c['bytes'] for columns in json.load(f)['tables'].values() for c in columns)
+        return {'columns': len(files), 'bytes': sum(os.path.getsize(path) for path in files),
+                'logical_bytes': logical}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage versioned snapshots of the dashboard data.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commit = commands.add_parser('commit', help='store the current data as a version')
+    commit.add_argument('--label', default='')
+    commands.add_parser('list', help='list stored versions')
+    diff = commands.add_parser('diff', help='show the cells that changed between two versions')
+    diff.add_argument('old')
+    diff.add_argument('new')
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore()
+    with pd.option_context('display.width', 200, 'display.max_rows', 500):
+        if args.command == 'commit':
+            print(store.commit(load_data(), args.label))
+        elif args.command == 'list':
+            print(store.versions().to_string(index=False))
+        else:
+            print(store.diff(args.old, args.new).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,51 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 import os
+from concurrent.futures import as_completed
+
+import ncat_analytics as ncat
+from ncat_analytics import cases
+from ncat_analytics.access import (
+    Scope,
+    TENANCY_LIST,
+    authenticate,
+    parse_users,
+    scope_alerts,
+    scope_cells,
+    scope_changes,
+    scope_counts,
+    scope_data,
+    scope_reconciliation,
+)
+from ncat_analytics.alerts import (
+    AlertScheduler,
+    latest_alerts,
+    load_rules,
+    log_path,
+    logged_versions,
+    read_alert_log,
+    rules_path,
+    rules_version,
+)
+from ncat_analytics.applicants import CELL as APPLICANT_CELL, ApplicantSketches
+from ncat_analytics.cache import DiskCache, code_version
+from ncat_analytics.capacity import DEFAULT_EFFORT, OTHER, SITTING_HOURS, Effort, registry_volumes, simulate
+from ncat_analytics.charts import CachedExpress, FigureScheduler, optimize_figure, payload_bytes
+from ncat_analytics.compare import PeriodComparator, period_label
+from ncat_analytics.correlation import annual_series, lag_profile, lead_lag, monthly_counts, monthly_series
+from ncat_analytics.cube import DIMENSIONS, build_cube
+from ncat_analytics.disclosure import THRESHOLD, protect_cells, protect_counts, protect_dataset, unprotected_rows
+from ncat_analytics.geo import DEFAULT_LEVEL, LEVELS, RegistryShapes, geojson_path, geojson_signature
+from ncat_analytics.lifecycle import CELL as LIFECYCLE_CELL, STAGES, LifecycleDigests
+from ncat_analytics.linkage import FIRST, PropertyLinks, has_addresses, repeat_rates, transitions
+from ncat_analytics.metrics import PARTY_CATEGORY_LABELS
+from ncat_analytics.outcomes import OUTCOMES, outcome_counts, outcome_rates
+from ncat_analytics.pivot import LABEL, MEASURES, TOTAL, PivotIndex
+from ncat_analytics.profiling import RerunProfiler
+from ncat_analytics.quality import CHECKS, TOLERANCE, QualityMonitor, failing_checks
+from ncat_analytics.registries import available_rates, load_registry_dimension, with_rates
+from ncat_analytics.search import SearchIndex, has_descriptions
+from ncat_analytics.versions import SnapshotStore
 
 # Configure the page
 st.set_page_config(
@@ -16,32 +61,55 @@ st.set_page_config(
 
 # Authentication function
 def check_password():
-    """Returns `True` if the user had the correct password."""
+    """Returns `True` once the user has signed in; their `Scope` is then in the session."""
+    
+    def configured_users():
+        # Only read while signing in; signed-in reruns use the scope in the session
+        return parse_users(st.secrets.get("users", {}))
     
     def password_entered():
-        """Checks whether a password entered by the user is correct."""
-        if st.session_state["password"] == st.secrets.get("dashboard_password", "ncat2024admin"):
-            st.session_state["password_correct"] = True
-            del st.session_state["password"]  # don't store password
+        """Resolves the entered credentials to a scope, once per login."""
+        username = st.session_state.get("username", "")
+        password = st.session_state["password"]
+        users = configured_users()
+        if users:
+            # With per-user roles configured every login is scoped; the shared passwords are ignored
+            scope = authenticate(users, username, password)
         else:
-            st.session_state["password_correct"] = False
+            # Shared passwords of the single-password login; nothing signs in unless one is set
+            scope = None
+            for secret, shared_scope in (("admin_password", Scope("admin", "admin", None, None)),
+                                         ("dashboard_password", Scope("shared", "executive", None, None))):
+                expected = st.secrets.get(secret)
+                if expected and scope is None:
+                    scope = authenticate({secret: (str(expected), shared_scope)}, secret, password)
+        st.session_state["password_correct"] = scope is not None
+        st.session_state["scope"] = scope
+        del st.session_state["password"]  # don't store password
 
-    if "password_correct" not in st.session_state:
-        # First run, show input for password.
+    def login_form(intro=False):
         st.markdown("### 🔐 NCAT Dashboard Access")
-        st.markdown("This dashboard contains sensitive tribunal data. Please enter the access password.")
+        if intro:
+            st.markdown("This dashboard contains sensitive tribunal data. Please enter your access credentials.")
+        if configured_users():
+            st.text_input("Username", key="username")
         st.text_input(
             "Password", type="password", on_change=password_entered, key="password"
         )
+
+    if st.session_state.get("password_correct") and st.session_state.get("scope") is None:
+        # Signed in without a resolved scope (e.g. a session set up by hand): sign in again
+        del st.session_state["password_correct"]
+    
+    if "password_correct" not in st.session_state:
+        # First run, show input for password.
+        login_form(intro=True)
         st.info("💡 Contact the administrator for access credentials.")
         return False
     elif not st.session_state["password_correct"]:
         # Password not correct, show input + error.
-        st.markdown("### 🔐 NCAT Dashboard Access")
-        st.text_input(
-            "Password", type="password", on_change=password_entered, key="password"
-        )
-        st.error("😞 Password incorrect. Please try again.")
+        login_form()
+        st.error("😞 Username or password incorrect. Please try again.")
         return False
     else:
         # Password correct.
@@ -51,11 +119,30 @@ def check_password():
 if not check_password():
     st.stop()  # Do not continue if check_password is not True.
 
+# Resolved once at login; every table below is read through it
+scope = st.session_state["scope"]
+
 # Add logout button in sidebar
+st.sidebar.caption(f"Signed in as **{scope.user}** · {scope.describe()}")
 if st.sidebar.button("🚪 Logout"):
     st.session_state["password_correct"] = False
+    st.session_state["scope"] = None
     st.rerun()
 
+# Admin profiler: the rerun after arming is profiled from here to the footer
+rerun_profiler = st.session_state.pop("active_profiler", None)
+if rerun_profiler is not None:
+    # The profiled rerun did not reach the footer (error or interrupted rerun)
+    rerun_profiler.stop()
+    rerun_profiler = None
+if st.session_state.get("profile_rerun") == "armed":
+    st.session_state["profile_rerun"] = None
+    rerun_profiler = RerunProfiler(__file__, trace_memory=st.session_state.get("profile_rerun_memory", False)).start()
+    st.session_state["active_profiler"] = rerun_profiler
+elif st.session_state.get("profile_rerun") == "next":
+    # This is the rerun triggered by the arm button itself
+    st.session_state["profile_rerun"] = "armed"
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -78,314 +165,572 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Persistent cache shared by every worker on the host, so restarts come back warm
+@st.cache_resource
+def load_disk_cache():
+    return DiskCache()
+
+disk_cache = load_disk_cache()
+package_version = code_version()
+
+# Figures from identical plotly.express calls are rebuilt from the disk cache
+px = CachedExpress(disk_cache)
+
+# One bounded pool for every session, so concurrent reruns cannot pile up threads
+@st.cache_resource
+def load_figure_scheduler():
+    return FigureScheduler(max_workers=int(os.environ.get('NCAT_FIGURE_WORKERS', 4)))
+
+figure_scheduler = load_figure_scheduler()
+
 # Data definitions
 @st.cache_data
-def load_data():
-    # Annual Tenancy Applications Data
-    tenancy_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Total_Applications': [7173, 27954, 29780, 28849, 29167, 29905, 29798, 32654, 27720, 27873, 7496],
-        'Data_Completeness': ['Q4 Only', 'Q2, Q3, Q4', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Full Year', 'Q1 Only']
-    }
-    
-    # Tenancy Applications by Category (Updated with granular data from Table 2.2)
-    category_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Termination_NonPayment': [2981, 11646, 15224, 14380, 13695, 10462, 9851, 10833, 10599, 9108, 2731],
-        'Rental_Bonds': [1236, 4190, 4787, 4747, 4809, 5403, 5219, 5477, 5460, 6879, 1668],
-        'General_Orders': [1276, 5325, 5618, 5344, 5806, 6388, 6407, 6871, 5571, 2623, 515],
-        'Repairs': [101, 268, 351, 308, 320, 394, 464, 464, 479, 1128, 278],
-        'Rent_Other_Payments': [375, 740, 768, 699, 717, 900, 947, 1153, 1373, 3796, 886],
-        'Termination_Breach_s87': [None, 734, 845, 690, 660, 614, 700, 765, 744, None, None],
-        'Termination_CoTenant_s102': [None, 60, 74, 88, 47, 74, 64, 54, 48, None, None],
-        'Termination_Other': [1030, 2791, 3589, 3148, 3323, 4535, 5119, 5340, 5110, 4418, 1247]
-    }
-    
-    # Lodgements by Party
-    party_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Landlord': [5634, 20662, 23476, 22545, 22448, 20816, 23284, 23265, 21512, 18367, 5256],
-        'Tenant': [1387, 5562, 6304, 6304, 6719, 7568, 6514, 7995, 6208, 7505, 1950],
-        'Other': [152, 1730, None, None, None, 1521, None, 1394, None, 2001, 290]
-    }
-    
-    # Geographic Distribution (Private Tenancy)
-    geo_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [1226, 4049, 5993, 5887, 5994, 6140, 5972, 6607, 6574, 5599, 1820],
-        'Newcastle': [1273, 3768, 5026, 4913, 4610, 4182, 4485, 4424, 4289, 3844, 1161],
-        'Penrith': [1206, 3830, 5892, 5868, 6076, 5533, 4311, 4241, 4135, 3148, 869],
-        'Sydney': [1902, 5845, 8429, 7953, 8064, 11122, 11080, 12768, 10885, 11483, 2963],
-        'Tamworth': [633, 1825, 2217, 2182, 2060, 1643, 2080, 2017, 1845, 1661, 482],
-        'Wollongong': [664, 1939, 2502, 2442, 2435, 1930, 2465, 2425, 2240, 2138, 538]
-    }
-    
-    # Other NCAT Lists Data
-    other_lists_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Tenancy': [7173, 27954, 29780, 28849, 29167, 29905, 29798, 32654, 27720, 27873, 7496],
-        'Social_Housing': [3405, 10448, 12588, 12702, 12782, 9682, 11126, 13001, 12002, 12277, 3507],
-        'General': [1334, 4204, 5103, 4632, 4550, 4895, 4492, 4948, 4961, 4855, 1165],
-        'Home_Building': [693, 2300, 2860, 2870, 2943, 2874, 2980, 3806, 3807, 2983, 497],
-        'Strata_Schemes': [384, 1125, 736, 1192, 1328, 1609, 1498, 1612, 1490, 1417, 298],
-        'Motor_Vehicles': [365, 1218, 1636, 1504, 1531, 1585, 1704, 1735, 1738, 1605, 351]
-    }
-    
-    # Total CCD Applications by Registry
-    total_ccd_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [2182, 6751, 9938, 9845, 9820, 8463, 8146, 9481, 9564, 9315, 2721],
-        'Newcastle': [2567, 6897, 9326, 9143, 8750, 7064, 7691, 8368, 8414, 7837, 2359],
-        'Penrith': [2194, 6598, 10020, 10253, 10651, 8690, 7085, 7353, 6761, 5950, 2900],
-        'Sydney': [3755, 11711, 15869, 15494, 15664, 21122, 21020, 22424, 19934, 20202, 4305],
-        'Tamworth': [1345, 3600, 4607, 4613, 4570, 3890, 4707, 4710, 4606, 4501, 1247],
-        'Wollongong': [1425, 4162, 5216, 5362, 5523, 4489, 4981, 5127, 5094, 4950, 1427]
-    }
-    
-    # Social Housing by Registry
-    social_housing_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [613, 1767, 2469, 2538, 2472, 1566, 1731, 1954, 2094, 2002, 562],
-        'Newcastle': [766, 1805, 2475, 2168, 2272, 1545, 2030, 2382, 2264, 2089, 513],
-        'Penrith': [503, 1409, 2209, 2279, 2441, 1875, 1580, 1612, 1436, 1159, 398],
-        'Sydney': [570, 1640, 2612, 2397, 2433, 1955, 2800, 2962, 2922, 2847, 777],
-        'Tamworth': [499, 1222, 1651, 1521, 1433, 1424, 1635, 1962, 2027, 1980, 670],
-        'Wollongong': [454, 1240, 1647, 1715, 1772, 1317, 1350, 1883, 1838, 1900, 587]
-    }
-    
-    # General List by Registry
-    general_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [143, 478, 602, 578, 542, 550, 595, 602, 616, 662, 155],
-        'Newcastle': [174, 566, 619, 640, 588, 566, 682, 706, 651, 658, 177],
-        'Penrith': [228, 624, 861, 819, 783, 717, 628, 528, 470, 405, 110],
-        'Sydney': [557, 1833, 2123, 1911, 1850, 2188, 1976, 2158, 2230, 2289, 570],
-        'Tamworth': [92, 239, 261, 250, 228, 333, 332, 304, 256, 249, 59],
-        'Wollongong': [140, 351, 401, 434, 428, 501, 485, 420, 399, 432, 94]
-    }
-    
-    # Home Building by Registry
-    home_building_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [81, 266, 359, 358, 401, 370, 384, 457, 467, 396, 61],
-        'Newcastle': [94, 291, 381, 420, 428, 416, 457, 526, 546, 458, 90],
-        'Penrith': [121, 421, 501, 483, 526, 462, 339, 387, 367, 288, 56],
-        'Sydney': [273, 895, 1061, 1064, 1146, 1099, 1161, 1345, 1558, 1181, 205],
-        'Tamworth': [50, 149, 178, 172, 167, 163, 181, 172, 185, 142, 33],
-        'Wollongong': [74, 226, 269, 305, 275, 302, 334, 297, 334, 310, 52]
-    }
-    
-    # Strata Schemes by Registry
-    strata_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [35, 98, 67, 79, 95, 129, 123, 118, 131, 136, 34],
-        'Newcastle': [34, 96, 94, 89, 105, 136, 136, 119, 118, 109, 18],
-        'Penrith': [28, 58, 64, 56, 60, 74, 57, 47, 51, 48, 16],
-        'Sydney': [245, 797, 630, 892, 981, 1131, 1086, 1108, 1039, 1051, 206],
-        'Tamworth': [15, 37, 45, 45, 42, 55, 46, 46, 52, 49, 14],
-        'Wollongong': [27, 73, 50, 50, 61, 63, 78, 75, 61, 53, 10]
-    }
-    
-    # Motor Vehicles by Registry
-    motor_vehicles_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [71, 263, 324, 321, 331, 298, 308, 309, 325, 335, 75],
-        'Newcastle': [46, 170, 223, 215, 210, 206, 206, 234, 233, 225, 60],
-        'Penrith': [78, 256, 331, 341, 367, 345, 345, 256, 221, 216, 31],
-        'Sydney': [97, 360, 462, 453, 461, 471, 483, 524, 527, 489, 127],
-        'Tamworth': [32, 83, 115, 116, 115, 109, 108, 100, 105, 104, 22],
-        'Wollongong': [41, 100, 133, 138, 122, 106, 122, 118, 117, 121, 36]
-    }
-    
-    # Commercial by Registry
-    commercial_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [10, 51, 74, 72, 63, 67, 66, 72, 82, 86, 24],
-        'Newcastle': [29, 70, 110, 115, 121, 101, 90, 104, 118, 129, 39],
-        'Penrith': [27, 67, 85, 90, 86, 98, 72, 60, 63, 64, 10],
-        'Sydney': [104, 331, 430, 420, 415, 430, 391, 394, 366, 372, 83],
-        'Tamworth': [9, 49, 67, 72, 60, 49, 56, 55, 64, 60, 13],
-        'Wollongong': [18, 58, 74, 77, 82, 85, 66, 70, 74, 81, 25]
-    }
-    
-    # Residential Communities by Registry
-    residential_communities_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [2, 5, 5, 10, 25, 14, 20, 17, 15, 15, 9],
-        'Newcastle': [40, 94, 109, 164, 244, 104, 169, 129, 114, 91, 129],
-        'Penrith': [1, 11, 8, 71, 95, 30, 19, 25, 16, 18, 3],
-        'Sydney': [3, 18, 31, 24, 31, 20, 39, 40, 54, 65, 17],
-        'Tamworth': [12, 41, 53, 96, 239, 101, 108, 88, 81, 53, 8],
-        'Wollongong': [2, 59, 70, 57, 129, 61, 74, 127, 61, 43, 9]
-    }
-    
-    # Retirement Villages by Registry
-    retirement_villages_data = {
-        'Year': [2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025],
-        'Liverpool': [1, 1, 4, 3, 4, 6, 2, 2, 1, 1, 1],
-        'Newcastle': [2, 18, 24, 27, 24, 26, 23, 18, 19, 20, 2],
-        'Penrith': [0, 9, 3, 7, 5, 4, 3, 4, 2, 1, 0],
-        'Sydney': [4, 12, 14, 13, 15, 19, 19, 22, 16, 15, 0],
-        'Tamworth': [1, 3, 2, 1, 1, 4, 3, 4, 1, 5, 4],
-        'Wollongong': [0, 7, 7, 5, 7, 4, 5, 5, 12, 5, 2]
-    }
-    
-    # Party Category Data - Landlord vs Tenant breakdown by application type
-    party_category_data = []
-    
-    # 2017 data
-    party_category_data.extend([
-        {'Year': 2017, 'Category': 'Rental Bonds', 'Landlord': 1527, 'Tenant': 3117, 'Total': 4787},
-        {'Year': 2017, 'Category': 'General Orders', 'Landlord': 3411, 'Tenant': 1872, 'Total': 5618},
-        {'Year': 2017, 'Category': 'Rent and other payments', 'Landlord': 380, 'Tenant': 355, 'Total': 768},
-        {'Year': 2017, 'Category': 'Repairs', 'Landlord': 6, 'Tenant': 329, 'Total': 351},
-        {'Year': 2017, 'Category': 'Termination - Breach (s.87)', 'Landlord': 845, 'Tenant': 0, 'Total': 845},
-        {'Year': 2017, 'Category': 'Termination non-payment of rent', 'Landlord': 15224, 'Tenant': 0, 'Total': 15224},
-        {'Year': 2017, 'Category': 'Termination by co-tenant (s102)', 'Landlord': 0, 'Tenant': 74, 'Total': 74},
-        {'Year': 2017, 'Category': 'Termination - Other', 'Landlord': 2506, 'Tenant': 1023, 'Total': 3589}
-    ])
-    
-    # 2018 data
-    party_category_data.extend([
-        {'Year': 2018, 'Category': 'Rental bonds', 'Landlord': 1496, 'Tenant': 3124, 'Total': 4747},
-        {'Year': 2018, 'Category': 'General orders', 'Landlord': 3292, 'Tenant': 1746, 'Total': 5344},
-        {'Year': 2018, 'Category': 'Rent and other payments', 'Landlord': 332, 'Tenant': 322, 'Total': 699},
-        {'Year': 2018, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 284, 'Total': 308},
-        {'Year': 2018, 'Category': 'Termination - breach (s.87)', 'Landlord': 690, 'Tenant': 0, 'Total': 690},
-        {'Year': 2018, 'Category': 'Termination - non-payment of rent', 'Landlord': 14380, 'Tenant': 0, 'Total': 14380},
-        {'Year': 2018, 'Category': 'Termination by co-tenant (s102)', 'Landlord': 0, 'Tenant': 88, 'Total': 88},
-        {'Year': 2018, 'Category': 'Termination - other', 'Landlord': 2303, 'Tenant': 798, 'Total': 3148}
-    ])
-    
-    # 2019 data
-    party_category_data.extend([
-        {'Year': 2019, 'Category': 'Rental bonds', 'Landlord': 1483, 'Tenant': 3194, 'Total': 4809},
-        {'Year': 2019, 'Category': 'General orders', 'Landlord': 3615, 'Tenant': 1870, 'Total': 5806},
-        {'Year': 2019, 'Category': 'Rent and other payments', 'Landlord': 304, 'Tenant': 367, 'Total': 717},
-        {'Year': 2019, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 293, 'Total': 320},
-        {'Year': 2019, 'Category': 'Termination - breach (s.87)', 'Landlord': 660, 'Tenant': 0, 'Total': 660},
-        {'Year': 2019, 'Category': 'Termination - non-payment of rent', 'Landlord': 13695, 'Tenant': 0, 'Total': 13695},
-        {'Year': 2019, 'Category': 'Termination by co-tenant (s102)', 'Landlord': 0, 'Tenant': 47, 'Total': 47},
-        {'Year': 2019, 'Category': 'Termination - other', 'Landlord': 2274, 'Tenant': 993, 'Total': 3323}
-    ])
-    
-    # 2020 data
-    party_category_data.extend([
-        {'Year': 2020, 'Category': 'Rental Bonds', 'Landlord': 1694, 'Tenant': 3504, 'Total': 5403},
-        {'Year': 2020, 'Category': 'General Orders', 'Landlord': 3935, 'Tenant': 2095, 'Total': 6388},
-        {'Year': 2020, 'Category': 'Rent and other payments', 'Landlord': 360, 'Tenant': 490, 'Total': 900},
-        {'Year': 2020, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 366, 'Total': 394},
-        {'Year': 2020, 'Category': 'Termination - Breach (s 87)', 'Landlord': 614, 'Tenant': 0, 'Total': 614},
-        {'Year': 2020, 'Category': 'Termination non-payment of rent', 'Landlord': 10462, 'Tenant': 0, 'Total': 10462},
-        {'Year': 2020, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 74, 'Total': 74},
-        {'Year': 2020, 'Category': 'Termination - Other', 'Landlord': 3067, 'Tenant': 1386, 'Total': 4535}
-    ])
-    
-    # 2021 data
-    party_category_data.extend([
-        {'Year': 2021, 'Category': 'Rental Bonds', 'Landlord': 1664, 'Tenant': 3363, 'Total': 5219},
-        {'Year': 2021, 'Category': 'General Orders', 'Landlord': 3988, 'Tenant': 2080, 'Total': 6407},
-        {'Year': 2021, 'Category': 'Rent and other payments', 'Landlord': 416, 'Tenant': 479, 'Total': 947},
-        {'Year': 2021, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 430, 'Total': 464},
-        {'Year': 2021, 'Category': 'Termination - Breach (s 87)', 'Landlord': 700, 'Tenant': 0, 'Total': 700},
-        {'Year': 2021, 'Category': 'Termination non-payment of rent', 'Landlord': 9851, 'Tenant': 0, 'Total': 9851},
-        {'Year': 2021, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 64, 'Total': 64},
-        {'Year': 2021, 'Category': 'Termination - Other', 'Landlord': 3501, 'Tenant': 1530, 'Total': 5119}
-    ])
-    
-    # 2022 data
-    party_category_data.extend([
-        {'Year': 2022, 'Category': 'Rental Bonds', 'Landlord': 1771, 'Tenant': 3456, 'Total': 5477},
-        {'Year': 2022, 'Category': 'General Orders', 'Landlord': 4303, 'Tenant': 2193, 'Total': 6871},
-        {'Year': 2022, 'Category': 'Rent and other payments', 'Landlord': 480, 'Tenant': 608, 'Total': 1153},
-        {'Year': 2022, 'Category': 'Repairs', 'Landlord': 0, 'Tenant': 435, 'Total': 464},
-        {'Year': 2022, 'Category': 'Termination - Breach (s 87)', 'Landlord': 765, 'Tenant': 0, 'Total': 765},
-        {'Year': 2022, 'Category': 'Termination non-payment of rent', 'Landlord': 10833, 'Tenant': 0, 'Total': 10833},
-        {'Year': 2022, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 54, 'Total': 54},
-        {'Year': 2022, 'Category': 'Termination - Other', 'Landlord': 3677, 'Tenant': 1559, 'Total': 5340}
-    ])
-    
-    # 2023 data
-    party_category_data.extend([
-        {'Year': 2023, 'Category': 'Rental Bonds', 'Landlord': 1708, 'Tenant': 3555, 'Total': 5460},
-        {'Year': 2023, 'Category': 'General Orders', 'Landlord': 3454, 'Tenant': 1831, 'Total': 5571},
-        {'Year': 2023, 'Category': 'Rent and other payments', 'Landlord': 752, 'Tenant': 546, 'Total': 1373},
-        {'Year': 2023, 'Category': 'Repairs', 'Landlord': 116, 'Tenant': 328, 'Total': 479},
-        {'Year': 2023, 'Category': 'Termination - Breach (s 87)', 'Landlord': 744, 'Tenant': 0, 'Total': 744},
-        {'Year': 2023, 'Category': 'Termination non-payment of rent', 'Landlord': 10599, 'Tenant': 0, 'Total': 10599},
-        {'Year': 2023, 'Category': 'Termination by a co-tenant (s 102)', 'Landlord': 0, 'Tenant': 48, 'Total': 48},
-        {'Year': 2023, 'Category': 'Termination - Other', 'Landlord': 3513, 'Tenant': 1455, 'Total': 5110}
-    ])
-    
-    # 2024 data
-    party_category_data.extend([
-        {'Year': 2024, 'Category': 'Rental Bonds', 'Landlord': 2938, 'Tenant': 3745, 'Total': 6879},
-        {'Year': 2024, 'Category': 'General Orders', 'Landlord': 1521, 'Tenant': 937, 'Total': 2623},
-        {'Year': 2024, 'Category': 'Rent and other payments', 'Landlord': 2249, 'Tenant': 1379, 'Total': 3796},
-        {'Year': 2024, 'Category': 'Repairs', 'Landlord': 416, 'Tenant': 668, 'Total': 1128},
-        {'Year': 2024, 'Category': 'Termination non-payment of rent', 'Landlord': 8512, 'Tenant': 106, 'Total': 9108},
-        {'Year': 2024, 'Category': 'Termination other', 'Landlord': 3714, 'Tenant': 534, 'Total': 4418}
-    ])
-    
-    # Convert to DataFrames
-    df_tenancy = pd.DataFrame(tenancy_data)
-    df_categories = pd.DataFrame(category_data)
-    df_parties = pd.DataFrame(party_data)
-    df_geo = pd.DataFrame(geo_data)
-    df_other_lists = pd.DataFrame(other_lists_data)
-    df_total_ccd = pd.DataFrame(total_ccd_data)
-    df_social_housing = pd.DataFrame(social_housing_data)
-    df_general = pd.DataFrame(general_data)
-    df_home_building = pd.DataFrame(home_building_data)
-    df_strata = pd.DataFrame(strata_data)
-    df_motor_vehicles = pd.DataFrame(motor_vehicles_data)
-    df_commercial = pd.DataFrame(commercial_data)
-    df_residential_communities = pd.DataFrame(residential_communities_data)
-    df_retirement_villages = pd.DataFrame(retirement_villages_data)
-    df_party_categories = pd.DataFrame(party_category_data)
-    
-    return (df_tenancy, df_categories, df_parties, df_geo, df_other_lists, df_total_ccd, 
-            df_social_housing, df_general, df_home_building, df_strata, df_motor_vehicles, 
-            df_commercial, df_residential_communities, df_retirement_villages, df_party_categories)
+def load_data(signature):
+    # Table extracts are read concurrently; a load where any of them failed is not kept on disk,
+    # so it is retried on restart as well as whenever an extract changes
+    key = disk_cache.key('load_data', signature, package_version)
+    loaded = disk_cache.get(key)
+    if loaded is None:
+        loaded = ncat.load_sources(max_workers=int(os.environ.get('NCAT_SOURCE_WORKERS', 4)),
+                                   timeout=float(os.environ.get('NCAT_SOURCE_TIMEOUT', 60)))
+        if (loaded.sources['Status'] == 'ok').all():
+            disk_cache.set(key, loaded)
+    return loaded
+
+@st.cache_resource
+def load_snapshot_store():
+    return SnapshotStore()
+
+snapshot_store = load_snapshot_store()
+
+@st.cache_resource
+def commit_snapshot(version, _data):
+    # Every data version the dashboard serves is kept, so it can be reopened after a revision
+    return snapshot_store.commit(_data)
+
+@st.cache_resource(max_entries=8)
+def load_snapshot(version):
+    # Memory-mapped columns, shared by every session viewing a past version
+    return snapshot_store.load(version)
+
+@st.cache_data
+def load_versions(mtime):
+    return snapshot_store.versions()
+
+@st.cache_data
+def load_version_diff(old, new):
+    # Versions are immutable, so a diff never goes stale
+    return snapshot_store.diff(old, new)
+
+@st.cache_resource(max_entries=8)
+def load_protected_data(version, _data):
+    # Small cells are suppressed once per data version; every page reads the protected tables
+    return disk_cache.get_or_compute('protected', (version, THRESHOLD, package_version), lambda: protect_dataset(_data))
+
+@st.cache_resource(max_entries=32)
+def load_scoped_data(version, scope, _data):
+    # One scoped copy per data version and scope, shared by every session holding that scope
+    return scope_data(_data, scope)
 
 # Load data
+loaded = load_data(ncat.table_signature())
+live_data = loaded.data
+live_version = commit_snapshot(ncat.data_version(live_data), live_data)
+data_versions = load_versions(os.path.getmtime(snapshot_store.directory))
+# The "Data as of" selector is drawn in the sidebar below; its value picks the tables here
+as_of = st.session_state.get("as_of", live_version)
+if as_of not in set(data_versions['Version']):
+    as_of = live_version
+source_data = live_data if as_of == live_version else load_snapshot(as_of)
+protection = load_protected_data(as_of, source_data)
+# Admins may switch suppression off under 🔒 Disclosure Control in the sidebar
+show_unsuppressed = scope.is_admin and st.session_state.get("show_unsuppressed", False)
+data = load_scoped_data((as_of, show_unsuppressed), scope, source_data if show_unsuppressed else protection.data)
 (df_tenancy, df_categories, df_parties, df_geo, df_other_lists, df_total_ccd, 
  df_social_housing, df_general, df_home_building, df_strata, df_motor_vehicles, 
- df_commercial, df_residential_communities, df_retirement_villages, df_party_categories) = load_data()
+ df_commercial, df_residential_communities, df_retirement_villages, df_party_categories) = data
+list_frames = ncat.registry_lists(data)
+
+@st.cache_resource
+def load_cube(_data, version):
+    # Built once per data and code version; `_data` is not hashed
+    return disk_cache.get_or_compute('cube', (version, package_version), lambda: build_cube(_data))
+
+@st.cache_resource
+def load_comparator(_cube, version):
+    # Memoised comparisons live as long as the cube they read from
+    return PeriodComparator(_cube)
+
+# Shown under any figure answered from the cube's estimate source
+ESTIMATE_NOTE = ("Registry figures by category or party are estimates: each registry's private tenancy volume "
+                 "is split by the state-wide category and party shares of its year.")
+
+data_version = ncat.data_version(data)
+cube = load_cube(data, data_version)
+comparator = load_comparator(cube, data_version)
+
+@st.cache_data
+def load_registry_table(names, signature):
+    return load_registry_dimension(list(names))
+
+registry_signature = cases.extract_signature('registries')
+registry_dim = load_registry_table(tuple(ncat.registry_names(data)), registry_signature)
+
+@st.cache_data
+def registry_measures(list_type, version, dimension_signature, _cube, _dimension):
+    # Registry counts joined to the dimension table; `list_type=None` gives total CCD
+    if list_type is None:
+        counts = _cube.query(['Year', 'Registry'], source='registry_totals')
+    else:
+        counts = _cube.query(['Year', 'Registry'], List=list_type)
+    return with_rates(counts, _dimension)
+
+def measure_label(measure):
+    return measure.replace('_', ' ').replace('Per 1k', 'per 1,000').replace('Per', 'per')
+
+@st.cache_resource
+def load_registry_shapes(signature):
+    # Simplified and quantised once per GeoJSON file; reruns only decode one detail level
+    if not signature:
+        return None
+    return disk_cache.get_or_compute('registry_shapes', (signature, package_version),
+                                     lambda: RegistryShapes.from_geojson(signature[0][0]))
+
+@st.cache_resource(max_entries=32)
+def registry_geojson(signature, level, registries):
+    # The decoded FeatureCollection is the same for every year, list type and measure
+    return load_registry_shapes(signature).geojson(level, registries)
+
+def show_registry_map(year_data, measure, title):
+    # Catchments as a choropleth, venues without a catchment as sized points
+    signature = geojson_signature()
+    shapes = load_registry_shapes(signature)
+    if shapes is None:
+        st.info(f"💡 Add registry catchments as GeoJSON at {geojson_path()} (one feature per registry with a "
+                "`Registry` property) to map them here.")
+        return
+    
+    level = st.selectbox("Map Detail:", list(LEVELS), index=list(LEVELS).index(DEFAULT_LEVEL), key="map_detail")
+    year_data = year_data.dropna(subset=[measure])
+    areas = year_data[year_data['Registry'].isin(shapes.centroids)]
+    points = year_data[year_data['Registry'].isin(shapes.points) & ~year_data['Registry'].isin(shapes.centroids)]
+    if areas.empty and points.empty:
+        st.info("💡 None of these registries are in the GeoJSON file.")
+        return
+    
+    zmin, zmax = year_data[measure].min(), year_data[measure].max()
+    fig_map = go.Figure()
+    if not areas.empty:
+        fig_map.add_trace(go.Choropleth(
+            geojson=registry_geojson(signature, level, tuple(areas['Registry'])),
+            featureidkey='properties.Registry', locations=areas['Registry'], z=areas[measure],
+            zmin=zmin, zmax=zmax, colorscale='Viridis', marker_line_color='white',
+            colorbar_title=measure_label(measure), hovertemplate='%{location}: %{z:,.1f}<extra></extra>'))
+        centroids = [shapes.centroids[r] for r in areas['Registry']]
+        fig_map.add_trace(go.Scattergeo(lon=[c[0] for c in centroids], lat=[c[1] for c in centroids],
+                                        text=areas['Registry'], mode='text', hoverinfo='skip', showlegend=False))
+    if not points.empty:
+        venues = [shapes.points[r] for r in points['Registry']]
+        sizes = 10 + 30 * (points[measure] - zmin) / ((zmax - zmin) or 1)
+        fig_map.add_trace(go.Scattergeo(
+            lon=[v[0] for v in venues], lat=[v[1] for v in venues], text=points['Registry'],
+            mode='markers+text', textposition='top center', showlegend=False,
+            marker=dict(size=sizes, color=points[measure], cmin=zmin, cmax=zmax, colorscale='Viridis',
+                        showscale=areas.empty, colorbar_title=measure_label(measure)),
+            customdata=points[measure], hovertemplate='%{text}: %{customdata:,.1f}<extra></extra>'))
+    # No basemap tiles: the map renders offline from the catchments alone
+    fig_map.update_geos(fitbounds='locations', visible=False)
+    fig_map.update_layout(title=title, height=550, margin=dict(l=0, r=0, t=50, b=0))
+    show_chart(fig_map)
+    
+    missing = sorted(set(year_data['Registry']) - set(shapes.centroids) - set(shapes.points))
+    st.caption(f"{level} detail: {shapes.vertices(level):,} of {shapes.source_vertices:,} boundary vertices "
+               f"({shapes.nbytes[level] / 1024:,.0f} KiB packed)."
+               + (f" Not in the GeoJSON file: {', '.join(missing)}." if missing else ""))
+
+@st.cache_resource
+def load_applicant_sketches(signature):
+    # Rebuilt only when the case-level extract changes
+    if not signature:
+        return None
+    return disk_cache.get_or_compute('applicant_sketches', (signature, package_version), ApplicantSketches.from_extract)
+
+@st.cache_resource(max_entries=8)
+def load_lifecycle_digests(signature, query=None):
+    # Rebuilt only when the case or event extracts change; a pinned case search gets digests of its matches
+    if not all(signature):
+        return None
+    if query is None:
+        return disk_cache.get_or_compute('lifecycle_digests', (signature, package_version),
+                                         LifecycleDigests.from_extract)
+    case_ids = load_search_matches(signature[0], query)
+    if case_ids is None:
+        return None
+    return disk_cache.get_or_compute('lifecycle_digests', (signature, query, package_version),
+                                     lambda: LifecycleDigests.from_extract(case_ids=case_ids))
+
+@st.cache_resource
+def load_outcome_counts(signature):
+    # Streaming join of lodgements to orders, rebuilt only when either extract changes
+    if not all(signature):
+        return None
+    return disk_cache.get_or_compute('outcome_counts', (signature, package_version), outcome_counts)
+
+def outcome_signature():
+    return (cases.extract_signature('cases'), cases.extract_signature('orders'))
+
+@st.cache_resource(max_entries=32)
+def load_scoped_cells(cell, signature, scope, _store):
+    # A per-cell case store cut down to the scope once, shared by every session holding it
+    return scope_cells(_store, scope, cell)
+
+@st.cache_resource(max_entries=32)
+def load_scoped_counts(signature, scope, _counts):
+    return scope_counts(_counts, scope)
+
+@st.cache_resource(max_entries=32)
+def load_protected_counts(signature, _counts):
+    # Case-level counts are suppressed like the published tables, once per extract version
+    return protect_counts(_counts)
+
+@st.cache_resource(max_entries=8)
+def load_protected_cells(cell, signature, _store):
+    # Cells with few cases are dropped, so neither their counts nor their percentiles show
+    return protect_cells(_store, _store.counts(), levels=cell)
+
+def disclosed_counts(signature, counts):
+    # Admins may switch suppression off under 🔒 Disclosure Control in the sidebar
+    return counts if counts is None or show_unsuppressed else load_protected_counts(signature, counts)
+
+def scoped_outcome_counts():
+    signature = outcome_signature()
+    return load_scoped_counts((signature, show_unsuppressed), scope,
+                              disclosed_counts(('outcomes', signature), load_outcome_counts(signature)))
+
+@st.cache_resource
+def load_property_links(signature):
+    # Address entity resolution, rebuilt only when the case extract changes
+    if not signature or not has_addresses():
+        return None
+    return disk_cache.get_or_compute('property_links', (signature, package_version), PropertyLinks.from_extract)
+
+@st.cache_resource(max_entries=8)
+def load_dispute_counts(signature, repeat_days, query=None):
+    links = load_property_links(signature)
+    if links is None:
+        return None
+    return links.dispute_counts(repeat_days, case_ids=None if query is None else load_search_matches(signature, query))
+
+def scoped_dispute_counts(repeat_days):
+    signature = cases.extract_signature('cases')
+    query = pinned_search()
+    return load_scoped_counts(('disputes', signature, repeat_days, query, show_unsuppressed), scope,
+                              disclosed_counts(('disputes', signature, repeat_days, query),
+                                               load_dispute_counts(signature, repeat_days, query)))
+
+def scoped_histories(links, **kwargs):
+    # Property histories name addresses, so they stay within the user's registries and lists
+    query = pinned_search()
+    if query is not None:
+        kwargs['case_ids'] = load_search_matches(cases.extract_signature('cases'), query)
+    if scope.unrestricted:
+        return links.histories(**kwargs)
+    return links.histories(registries=[r for r in links.cases['Registry'].cat.categories if scope.allows_registry(r)],
+                           lists=[l for l in links.cases['List'].cat.categories if scope.allows_list(l)], **kwargs)
+
+REPEAT_WINDOWS = {"6 months": 183, "12 months": 365, "2 years": 730, "3 years": 1096}
+
+@st.cache_resource
+def load_search_index(signature):
+    # Only extract files added or changed since the last build are indexed; segments are memory-mapped
+    if not signature or not has_descriptions():
+        return None
+    index = SearchIndex()
+    index.update()
+    return index
+
+@st.cache_resource
+def load_search_totals(signature):
+    index = load_search_index(signature)
+    return None if index is None else index.totals()
+
+def scoped_search(index, signature, query, limit):
+    # Matching cases name parties and describe properties, so only the user's registries and lists are searched
+    if scope.unrestricted:
+        return index.search(query, limit=limit)
+    totals = load_scoped_counts(('search', signature), scope, load_search_totals(signature))
+    return index.search(query, limit=limit,
+                        registries=totals.index.get_level_values('Registry').unique().tolist(),
+                        lists=totals.index.get_level_values('List').unique().tolist())
+
+@st.cache_resource(max_entries=16)
+def load_search_matches(signature, query):
+    # Every matching Case_ID, unscoped; the stores built from them are scoped like the unfiltered ones
+    index = load_search_index(signature)
+    return None if index is None else index.search(query, limit=0).case_ids
+
+def pinned_search():
+    # The search pinned on the Case Search page; case-level pages re-aggregate over its matches
+    query = st.session_state.get("case_search")
+    return query if query and load_search_index(cases.extract_signature('cases')) is not None else None
+
+def show_pinned_search():
+    query = pinned_search()
+    if query is None:
+        return
+    signature = cases.extract_signature('cases')
+    matches = scoped_search(load_search_index(signature), signature, query, limit=0).matches
+    col1, col2 = st.columns([4, 1])
+    
+    with col1:
+        st.info(f"🔎 Only the {matches:,} cases whose description matches **{query}** (pinned on 🔎 Case Search).")
+    
+    with col2:
+        st.button("Clear Search Filter", on_click=st.session_state.pop, args=("case_search", None),
+                  key=f"clear_case_search_{page}")
+
+SEARCH_EXAMPLES = ['mould', '"bond claim"', 's87', 'repair*', 'rent arrears']
+
+@st.cache_resource
+def load_monthly_counts(signature):
+    # Lodgements per list, registry and month, rebuilt only when the case extract changes
+    if not signature:
+        return None
+    return disk_cache.get_or_compute('monthly_counts', (signature, package_version), monthly_counts)
+
+@st.cache_resource(max_entries=16)
+def load_lead_lag(source, version, max_lag, changes, _series):
+    # One batched computation per data version and settings, shared by every session
+    return lead_lag(_series, max_lag=max_lag, changes=changes)
+
+@st.cache_data(max_entries=64)
+def load_capacity(version, year, include_other, effort, draws, growth, sitting_hours, max_workers, _volumes):
+    # Keyed by the parameter set; the pool size does not change the draws, so it is not part of the disk key
+    return disk_cache.get_or_compute(
+        'capacity', (version, year, include_other, effort, draws, growth, sitting_hours, package_version),
+        lambda: simulate(_volumes, dict(effort), draws, growth, sitting_hours, max_workers=max_workers))
+
+@st.cache_resource(max_entries=32)
+def load_pivot(rows, columns, years, lists, version, _cube):
+    # Factorised once per layout; paging and sorting reuse the codes
+    facts = _cube.query(rows + columns, Year=list(years), **({'List': list(lists)} if lists else {}))
+    return PivotIndex(facts, rows, columns)
+
+@st.cache_resource
+def start_alert_scheduler():
+    # One evaluator thread per server process; reruns only read its log
+    return AlertScheduler(ncat.load_data).start()
+
+@st.cache_data
+def load_alert_log(path, mtime):
+    return read_alert_log(path)
+
+alert_scheduler = start_alert_scheduler()
+
+@st.cache_resource
+def start_quality_monitor():
+    # Reconciliation runs off the rerun path; pages only read the stored results
+    return QualityMonitor(ncat.load_data, disk_cache, package_version, snapshot_store).start()
+
+quality_monitor = start_quality_monitor()
+quality = scope_reconciliation(quality_monitor.results(as_of), scope, data)
+
+# Tables (Dataset fields without `df_`) each page is built from
+REGISTRY_TABLES = [field.removeprefix('df_') for field in ncat.REGISTRY_LISTS.values()]
+PAGE_TABLES = {
+    "🏠 Overview": ['tenancy', 'other_lists', *REGISTRY_TABLES],
+    "📈 Tenancy Trends": ['tenancy'],
+    "🏢 Application Categories": ['categories'],
+    "👥 Party Analysis": ['parties'],
+    "📋 Detailed Party Breakdown": ['party_categories'],
+    "🗺️ Geographic Distribution": ['total_ccd', *REGISTRY_TABLES],
+    "⚖️ NCAT Lists Comparison": ['other_lists', 'total_ccd', *REGISTRY_TABLES],
+    "🔗 Cross-List Correlation": REGISTRY_TABLES,
+    "👷 Capacity Planner": ['total_ccd', *REGISTRY_TABLES],
+    "🧮 Pivot Explorer": ['other_lists', *REGISTRY_TABLES],
+}
+
+# Bytes shipped per chart on this rerun
+chart_payloads = []
+
+def show_chart(fig):
+    # Typed arrays, LTTB downsampling and WebGL for long series
+    fig = optimize_figure(fig)
+    chart_payloads.append({'Chart': fig.layout.title.text or 'Untitled', 'KiB': payload_bytes(fig) / 1024})
+    st.plotly_chart(fig, use_container_width=True)
+
+# Figures being built on the pool and the placeholders reserved for them
+scheduled_charts = {}
+
+def schedule_chart(build):
+    # `build()` returns a figure and must not call Streamlit; the chart is drawn by the section's
+    # `draw_scheduled_charts`.
+    # It runs while the script goes on, so names it reads must not be reassigned later in the rerun.
+    slot = st.empty()
+    slot.caption("⏳ Building chart…")
+    scheduled_charts[figure_scheduler.submit(build)] = slot
+
+def draw_scheduled_charts():
+    # Called at the end of each page section, so a section's charts stream in before the next section runs.
+    # Each chart is sent as soon as it is built, so the section waits for its slowest chart, not the sum
+    pending = dict(scheduled_charts)
+    scheduled_charts.clear()
+    for future in as_completed(pending):
+        try:
+            built = future.result()
+        except Exception as error:
+            pending[future].exception(error)
+            continue
+        chart_payloads.append({'Chart': built.figure.layout.title.text or 'Untitled',
+                               'KiB': built.payload_bytes / 1024, 'Build ms': built.seconds * 1000})
+        pending[future].plotly_chart(built.figure, use_container_width=True)
 
 # Sidebar navigation
 st.sidebar.title("📊 Navigation")
+pages = ["🏠 Overview", "📈 Tenancy Trends", "🏢 Application Categories", "👥 Party Analysis", "📋 Detailed Party Breakdown", "🗺️ Geographic Distribution", "⚖️ NCAT Lists Comparison", "🔗 Cross-List Correlation", "👷 Capacity Planner", "⏱️ Case Lifecycle", "🔎 Case Search", "🧮 Pivot Explorer"]
+if not scope.allows_list(TENANCY_LIST):
+    # These pages are built on the state-wide tenancy tables
+    pages = [p for p in pages if p not in ("🏠 Overview", "📈 Tenancy Trends", "🏢 Application Categories",
+                                          "👥 Party Analysis", "📋 Detailed Party Breakdown")]
 page = st.sidebar.selectbox(
     "Choose a page:",
-    ["🏠 Overview", "📈 Tenancy Trends", "🏢 Application Categories", "👥 Party Analysis", "📋 Detailed Party Breakdown", "🗺️ Geographic Distribution", "⚖️ NCAT Lists Comparison"]
+    pages
 )
 
+with st.sidebar.expander("🧊 Data Cube"):
+    cube_stats = cube.stats()
+    st.caption(f"Built in {cube.build_seconds * 1000:.0f} ms · {len(cube_stats)} roll-ups · "
+               f"{cube_stats['Cells'].sum():,} cells · {cube.nbytes / 1024:.1f} KiB")
+    st.caption(f"Disk cache: {disk_cache.hits:,} hits · {disk_cache.misses:,} misses in this process")
+
+alert_log_path = log_path()
+alert_log = load_alert_log(alert_log_path, os.path.getmtime(alert_log_path) if os.path.exists(alert_log_path) else None)
+# Alerts of the data and rules being served; an older version's alerts are not shown once it is replaced
+alert_versions = (live_version, rules_version(load_rules()))
+alerts = latest_alerts(alert_log, *alert_versions)
+alerts = scope_alerts(alerts, scope, ncat.registry_names(live_data), list(ncat.REGISTRY_LISTS))
+with st.sidebar.expander(f"🔔 Alerts ({len(alerts)})" if len(alerts) else "🔔 Alerts"):
+    if alert_scheduler.last_error is not None:
+        st.error(f"Alert evaluation failed: {alert_scheduler.last_error}")
+    elif alerts.empty:
+        st.caption("No alerts for the latest data." if alert_versions in logged_versions(alert_log)
+                   else "Alert rules are being evaluated in the background.")
+    else:
+        rules_source = f"`{rules_path()}`" if os.path.exists(rules_path()) else "default rules"
+        st.caption(f"Evaluated {alerts['Evaluated'].iloc[0]} · {rules_source}")
+        st.dataframe(alerts[['Rule', 'Series', 'Year', 'Value', 'Baseline', 'Score']].round(1),
+                     hide_index=True, use_container_width=True)
+
+def version_label(version):
+    row = data_versions[data_versions['Version'] == version].iloc[0]
+    name = "Latest" if version == live_version else row['Created']
+    return f"{name} · {version}" + (f" · {row['Label']}" if row['Label'] else "")
+
+with st.sidebar.expander("🕰️ Data Versions"):
+    version_options = [live_version] + [v for v in data_versions['Version'] if v != live_version]
+    st.selectbox("Data as of:", version_options, format_func=version_label, key="as_of")
+    store_stats = snapshot_store.stats()
+    st.caption(f"{len(data_versions)} versions · {store_stats['columns']} distinct columns · "
+               f"{store_stats['bytes'] / 1024:.0f} KiB on disk for {store_stats['logical_bytes'] / 1024:.0f} KiB of tables")
+
+failed_sources = loaded.sources[loaded.sources['Status'] != 'ok']
+with st.sidebar.expander(f"📥 Data Sources ({len(failed_sources)} failed)" if len(failed_sources) else "📥 Data Sources"):
+    extract_count = (loaded.sources['Source'] != 'published').sum()
+    st.caption(f"{extract_count} of {len(loaded.sources)} tables from extracts · loaded in {loaded.seconds * 1000:.0f} ms")
+    st.dataframe(loaded.sources[['Table', 'Source', 'Status', 'Rows', 'Seconds']].round(3),
+                 hide_index=True, use_container_width=True)
+    if len(failed_sources):
+        st.caption(" · ".join(f"**{row.Table}**: {row.Error}" for row in failed_sources.itertuples()))
+
+failing = failing_checks(quality) if quality is not None else None
+with st.sidebar.expander(f"🧪 Data Quality ({len(failing)})" if failing is not None and len(failing)
+                         else "🧪 Data Quality"):
+    if quality_monitor.last_error is not None:
+        st.error(f"Reconciliation failed: {quality_monitor.last_error}")
+    elif quality is None:
+        st.caption("Reconciliation checks are running in the background.")
+    else:
+        st.caption(f"{len(failing)} failing checks · {len(quality.flags):,} flagged cells · "
+                   f"checked in {quality.seconds * 1000:.0f} ms")
+        if len(failing):
+            # Raw expected and actual sums could undo small-cell suppression
+            check_columns = ['Check', 'Row'] + (['Expected', 'Actual'] if show_unsuppressed else []) + ['Difference_%', 'Status']
+            st.dataframe(failing[check_columns], hide_index=True, use_container_width=True)
+            st.caption(" · ".join(f"**{check}**: {CHECKS[check]}" for check in failing['Check'].unique()))
+
+with st.sidebar.expander("🔒 Disclosure Control"):
+    protection_report = protection.report[protection.report['Primary'] + protection.report['Complementary'] > 0]
+    st.caption(f"Counts from 1 to {THRESHOLD} are suppressed, with complementary cells so they cannot be "
+               f"recovered from totals · {len(protection.cells):,} cells hidden · "
+               f"protected in {protection.seconds * 1000:.0f} ms")
+    if len(protection_report):
+        st.dataframe(protection_report[['Table', 'Primary', 'Complementary']], hide_index=True, use_container_width=True)
+    if scope.is_admin:
+        st.checkbox("Show unsuppressed counts", key="show_unsuppressed")
+
 # Main title
 st.markdown('<h1 class="main-header">⚖️ NCAT Operations Dashboard</h1>', unsafe_allow_html=True)
 
+if as_of != live_version:
+    st.warning(f"Viewing the data as of {version_label(as_of)}. Choose **Latest** under 🕰️ Data Versions "
+               "in the sidebar to return to the current figures.")
+    with st.expander("🔍 Changed cells between versions"):
+        col1, col2 = st.columns(2)
+        with col1:
+            diff_old = st.selectbox("From:", version_options, index=version_options.index(as_of),
+                                    format_func=version_label)
+        with col2:
+            diff_new = st.selectbox("To:", version_options, format_func=version_label)
+        changes = scope_changes(load_version_diff(diff_old, diff_new), data)
+        if not show_unsuppressed:
+            # Versions are diffed unprotected; drop cells suppressed in either version
+            changes = unprotected_rows(changes, [load_protected_data(v, live_data if v == live_version else load_snapshot(v))
+                                                 for v in (diff_old, diff_new)])
+        if changes.empty:
+            st.info("No cells differ between these versions.")
+        else:
+            st.caption(f"{len(changes)} cells changed")
+            st.dataframe(changes, hide_index=True, use_container_width=True)
+
+page_failed_sources = failed_sources[failed_sources['Table'].isin(PAGE_TABLES.get(page, []))]
+if as_of == live_version and len(page_failed_sources):
+    st.warning(f"⚠️ {', '.join(page_failed_sources['Table'])} could not be loaded from "
+               f"{', '.join(page_failed_sources['Source'])}; this page shows the published annual-report "
+               "figures for them. See 📥 Data Sources in the sidebar.")
+
+page_suppressed = 0 if show_unsuppressed else protection.cells['Table'].isin(PAGE_TABLES.get(page, [])).sum()
+if page_suppressed:
+    st.caption(f"🔒 {page_suppressed} small counts behind this page are suppressed; they show as gaps and "
+               "are left out of totals.")
+
+if quality is not None:
+    page_flags = quality.flags[quality.flags['Table'].isin(PAGE_TABLES.get(page, []))]
+    if len(page_flags):
+        with st.expander(f"🧪 {len(page_flags):,} cells on this page do not reconcile with the other tables"):
+            st.caption(f"Flagged cells take part in a cross-table identity that does not hold within "
+                       f"{TOLERANCE:.1%}; see 🧪 Data Quality in the sidebar for the failing checks.")
+            st.dataframe(page_flags.assign(Check=page_flags['Check'].map(CHECKS))
+                         [['Table', 'Row', 'Column', 'Check', 'Status']],
+                         hide_index=True, use_container_width=True)
+
 if page == "🏠 Overview":
     st.header("Executive Summary")
     
     # Key metrics
+    overview = ncat.overview_metrics(df_tenancy)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_apps_2024 = df_tenancy[df_tenancy['Year'] == 2024]['Total_Applications'].iloc[0]
-        st.metric("2024 Tenancy Applications", f"{total_apps_2024:,}")
+        st.metric("2024 Tenancy Applications", f"{overview['latest_total']:,}")
     
     with col2:
-        peak_year = df_tenancy.loc[df_tenancy['Total_Applications'].idxmax(), 'Year']
-        peak_value = df_tenancy['Total_Applications'].max()
-        st.metric("Peak Year", f"{peak_year} ({peak_value:,})")
+        st.metric("Peak Year", f"{overview['peak_year']} ({overview['peak_value']:,})")
     
     with col3:
-        avg_apps = df_tenancy[df_tenancy['Year'].between(2017, 2024)]['Total_Applications'].mean()
-        st.metric("Annual Average (2017-2024)", f"{avg_apps:,.0f}")
+        st.metric("Annual Average (2017-2024)", f"{overview['annual_average']:,.0f}")
     
     with col4:
-        growth_rate = ((total_apps_2024 - df_tenancy[df_tenancy['Year'] == 2017]['Total_Applications'].iloc[0]) / 
-                      df_tenancy[df_tenancy['Year'] == 2017]['Total_Applications'].iloc[0]) * 100
-        st.metric("Growth 2017-2024", f"{growth_rate:.1f}%")
+        st.metric("Growth 2017-2024", f"{overview['growth_pct']:.1f}%")
     
     # Overview chart
     fig = px.line(df_tenancy[df_tenancy['Year'].between(2017, 2024)], 
@@ -393,7 +738,7 @@ if page == "🏠 Overview":
                   title='Total Tenancy Applications Over Time (2017-2024)',
                   markers=True)
     fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig)
     
     # Key insights
     st.subheader("Key Insights")
@@ -414,6 +759,52 @@ if page == "🏠 Overview":
         - Core business function requiring dedicated resources
         - Sensitive to economic conditions (COVID-19 impact visible)
         """)
+    
+    # Any-dimension period comparison
+    st.subheader("Period Comparison")
+    
+    comparison_years = sorted(df_other_lists['Year'].unique())
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        base_range = st.select_slider("Base Period", options=comparison_years, value=(2022, 2022))
+    
+    with col2:
+        target_range = st.select_slider("Target Period", options=comparison_years, value=(2024, 2024))
+    
+    with col3:
+        compare_dims = st.multiselect("Break Down By:", ['Registry', 'List', 'Category', 'Party'], default=['List'])
+    
+    with col4:
+        compare_list = st.selectbox("List Filter:", ["All Lists"] + list(list_frames))
+    
+    compare_filters = {} if compare_list == "All Lists" else {'List': compare_list}
+    
+    try:
+        period_changes = comparator.compare(base_range, target_range, dims=tuple(compare_dims),
+                                            agg='mean', **compare_filters)
+    except KeyError:
+        breakdown_label = "applications" if compare_list == "All Lists" else f"{compare_list} applications"
+        st.warning(f"No published table breaks {breakdown_label} down by {' × '.join(compare_dims)}.")
+    else:
+        base_label, target_label = period_label(base_range), period_label(target_range)
+        period_changes = period_changes.reset_index()
+        group_col = ' × '.join(compare_dims) if compare_dims else 'Slice'
+        if len(compare_dims) > 1:
+            period_changes[group_col] = period_changes[compare_dims].astype(str).agg(' / '.join, axis=1)
+        
+        fig_period = px.bar(period_changes, x=group_col, y='Change',
+                            title=f'Change in Annual Applications: {base_label} vs {target_label}',
+                            color='Change_%',
+                            color_continuous_scale='RdBu_r',
+                            hover_data=['Base', 'Target', 'Contribution_%'])
+        fig_period.update_layout(height=400, xaxis_tickangle=-45)
+        show_chart(fig_period)
+        
+        st.dataframe(period_changes.set_index(group_col)[['Base', 'Target', 'Change', 'Change_%', 'Contribution_%']].round(1),
+                     use_container_width=True, height=300)
+        if cube.is_estimate(('Year', *compare_dims), **compare_filters):
+            st.caption(ESTIMATE_NOTE)
 
 elif page == "📈 Tenancy Trends":
     st.header("Tenancy Application Trends")
@@ -437,15 +828,13 @@ elif page == "📈 Tenancy Trends":
         yaxis_title='Number of Applications',
         height=400
     )
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig)
     
     # Annual change analysis
     st.subheader("Year-over-Year Changes")
     
     # Calculate percentage changes
-    filtered_df_copy = filtered_df.copy()
-    filtered_df_copy['YoY_Change'] = filtered_df_copy['Total_Applications'].pct_change() * 100
-    filtered_df_copy['YoY_Absolute'] = filtered_df_copy['Total_Applications'].diff()
+    filtered_df_copy = ncat.yoy_changes(filtered_df)
     
     col1, col2 = st.columns(2)
     
@@ -455,7 +844,7 @@ elif page == "📈 Tenancy Trends":
                            color='YoY_Change',
                            color_continuous_scale='RdBu_r')
         fig_change.update_layout(height=300)
-        st.plotly_chart(fig_change, use_container_width=True)
+        show_chart(fig_change)
     
     with col2:
         fig_abs = px.bar(filtered_df_copy[1:], x='Year', y='YoY_Absolute',
@@ -463,30 +852,13 @@ elif page == "📈 Tenancy Trends":
                         color='YoY_Absolute',
                         color_continuous_scale='RdBu_r')
         fig_abs.update_layout(height=300)
-        st.plotly_chart(fig_abs, use_container_width=True)
+        show_chart(fig_abs)
 
 elif page == "🏢 Application Categories":
     st.header("Application Categories Analysis (Detailed Breakdown)")
     
     # Data preparation for categories
-    df_cat_melted = df_categories.melt(id_vars=['Year'], 
-                                      value_vars=['Termination_NonPayment', 'Rental_Bonds', 'General_Orders', 'Repairs', 
-                                                'Rent_Other_Payments', 'Termination_Breach_s87', 'Termination_CoTenant_s102', 'Termination_Other'],
-                                      var_name='Category', value_name='Applications')
-    df_cat_melted = df_cat_melted.dropna()
-    
-    # Category names mapping
-    category_mapping = {
-        'Termination_NonPayment': 'Termination (Non-Payment)',
-        'Rental_Bonds': 'Rental Bonds',
-        'General_Orders': 'General Orders',
-        'Repairs': 'Repairs',
-        'Rent_Other_Payments': 'Rent & Other Payments',
-        'Termination_Breach_s87': 'Termination (Breach s.87)',
-        'Termination_CoTenant_s102': 'Termination (Co-Tenant s.102)',
-        'Termination_Other': 'Termination (Other)'
-    }
-    df_cat_melted['Category'] = df_cat_melted['Category'].map(category_mapping)
+    df_cat_melted = ncat.melt_categories(df_categories)
     
     # Category selection
     col1, col2 = st.columns(2)
@@ -507,12 +879,9 @@ elif page == "🏢 Application Categories":
         
         # Apply view mode filter
         if view_mode == "⚖️ Terminations Only":
-            termination_cats = ['Termination (Non-Payment)', 'Termination (Breach s.87)', 
-                              'Termination (Co-Tenant s.102)', 'Termination (Other)']
-            filtered_cat = filtered_cat[filtered_cat['Category'].isin(termination_cats)]
+            filtered_cat = ncat.filter_categories(filtered_cat, 'termination')
         elif view_mode == "🏠 Non-Terminations Only":
-            non_termination_cats = ['Rental Bonds', 'General Orders', 'Repairs', 'Rent & Other Payments']
-            filtered_cat = filtered_cat[filtered_cat['Category'].isin(non_termination_cats)]
+            filtered_cat = ncat.filter_categories(filtered_cat, 'non-termination')
         
         col1, col2 = st.columns(2)
         
@@ -522,7 +891,7 @@ elif page == "🏢 Application Categories":
                                title=f'Applications by Category - {view_mode} (Stacked)',
                                color_discrete_sequence=px.colors.qualitative.Set3)
             fig_stacked.update_layout(height=400)
-            st.plotly_chart(fig_stacked, use_container_width=True)
+            show_chart(fig_stacked)
         
         with col2:
             # Line chart for trends
@@ -531,13 +900,13 @@ elif page == "🏢 Application Categories":
                                markers=True,
                                color_discrete_sequence=px.colors.qualitative.Set3)
             fig_lines.update_layout(height=400)
-            st.plotly_chart(fig_lines, use_container_width=True)
+            show_chart(fig_lines)
         
         # Detailed analysis section
         st.subheader("Detailed Category Analysis")
         
         # Create tabs for different analyses
-        tab1, tab2, tab3 = st.tabs(["📈 Trends Over Time", "🥧 Proportions", "📊 Year-over-Year Changes"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Trends Over Time", "🥧 Proportions", "📊 Year-over-Year Changes", "✅ Outcomes", "🔁 Repeat Disputes"])
         
         with tab1:
             # All categories trend (full years only)
@@ -548,7 +917,7 @@ elif page == "🏢 Application Categories":
                                    markers=True,
                                    color_discrete_sequence=px.colors.qualitative.Set3)
             fig_all_trends.update_layout(height=500)
-            st.plotly_chart(fig_all_trends, use_container_width=True)
+            show_chart(fig_all_trends)
         
         with tab2:
             # Proportion analysis for selected years
@@ -562,27 +931,128 @@ elif page == "🏢 Application Categories":
                     
                     col1, col2, col3 = st.columns([1, 2, 1])
                     with col2:
-                        st.plotly_chart(fig_pie, use_container_width=True)
+                        show_chart(fig_pie)
         
         with tab3:
             # Year-over-Year percentage changes
-            yoy_data = []
-            for category in filtered_cat['Category'].unique():
-                cat_data = filtered_cat[filtered_cat['Category'] == category].sort_values('Year')
-                cat_data['YoY_Change'] = cat_data['Applications'].pct_change() * 100
-                yoy_data.append(cat_data)
+            yoy_combined = ncat.category_yoy(filtered_cat)
             
-            if yoy_data:
-                yoy_combined = pd.concat(yoy_data, ignore_index=True)
-                yoy_combined = yoy_combined.dropna(subset=['YoY_Change'])
+            if not yoy_combined.empty:
+                fig_yoy = px.bar(yoy_combined, x='Year', y='YoY_Change', color='Category',
+                               title='Year-over-Year Percentage Change by Category',
+                               color_discrete_sequence=px.colors.qualitative.Set3)
+                fig_yoy.update_layout(height=400)
+                fig_yoy.add_hline(y=0, line_dash="dash", line_color="red")
+                show_chart(fig_yoy)
+        
+        with tab4:
+            # Outcome rates from the lodgement-to-order join
+            outcomes = scoped_outcome_counts()
+            
+            if outcomes is None:
+                st.info("💡 Outcome rates need the case-level `cases` and `orders` extracts "
+                        f"(sorted by Case_ID) in `{cases.data_dir()}`.")
+            else:
+                view_categories = list(filtered_cat['Category'].unique())
+                category_outcomes = outcome_rates(outcomes, by=['Category'], years=selected_years,
+                                                  categories=view_categories)
                 
-                if not yoy_combined.empty:
-                    fig_yoy = px.bar(yoy_combined, x='Year', y='YoY_Change', color='Category',
-                                   title='Year-over-Year Percentage Change by Category',
-                                   color_discrete_sequence=px.colors.qualitative.Set3)
-                    fig_yoy.update_layout(height=400)
-                    fig_yoy.add_hline(y=0, line_dash="dash", line_color="red")
-                    st.plotly_chart(fig_yoy, use_container_width=True)
+                if category_outcomes.empty:
+                    st.warning("No outcomes recorded for the selected years.")
+                else:
+                    outcome_cols = [c for c in category_outcomes.columns if c not in ('Decided', 'Pending')]
+                    outcomes_melted = category_outcomes.reset_index().melt(
+                        id_vars=['Category'], value_vars=outcome_cols, var_name='Outcome', value_name='Rate')
+                    
+                    fig_outcomes = px.bar(outcomes_melted, x='Category', y='Rate', color='Outcome',
+                                          title='Outcome Rates by Category (% of decided applications)',
+                                          category_orders={'Outcome': OUTCOMES},
+                                          color_discrete_sequence=px.colors.qualitative.Set2)
+                    fig_outcomes.update_layout(height=450, xaxis_tickangle=-45)
+                    show_chart(fig_outcomes)
+                    
+                    # Orders-made rate by registry and category
+                    registry_outcomes = outcome_rates(outcomes, by=['Registry', 'Category'], years=selected_years,
+                                                      categories=view_categories)
+                    orders_pivot = registry_outcomes['Orders made'].unstack('Category')
+                    
+                    fig_orders = px.imshow(orders_pivot.values,
+                                           x=orders_pivot.columns,
+                                           y=orders_pivot.index,
+                                           color_continuous_scale='viridis',
+                                           title='Orders Made Rate (%) by Registry and Category',
+                                           text_auto='.1f')
+                    fig_orders.update_layout(height=400)
+                    show_chart(fig_orders)
+                    
+                    st.dataframe(category_outcomes, use_container_width=True, height=300)
+        
+        with tab5:
+            # Cases at a property that was already before the Tribunal, from address entity resolution
+            repeat_window = st.select_slider("Counts as a repeat if within:", list(REPEAT_WINDOWS), value="12 months",
+                                             key="category_repeat_window")
+            disputes = scoped_dispute_counts(REPEAT_WINDOWS[repeat_window])
+            show_pinned_search()
+            
+            if disputes is None:
+                st.info("💡 Repeat-dispute analysis needs a case-level `cases` extract with an `Address` column "
+                        f"in `{cases.data_dir()}`.")
+            else:
+                view_categories = list(filtered_cat['Category'].unique())
+                category_repeats = repeat_rates(disputes, by=['Category'], years=selected_years, categories=view_categories)
+                overall_repeats = category_repeats[['Cases', 'Repeat']].sum()
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Cases", f"{overall_repeats['Cases']:,}")
+                
+                with col2:
+                    st.metric("Repeat Disputes", f"{overall_repeats['Repeat']:,}")
+                
+                with col3:
+                    st.metric("Repeat Share", f"{overall_repeats['Repeat'] / max(overall_repeats['Cases'], 1) * 100:.1f}%")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    fig_repeat = px.bar(category_repeats.reset_index(), x='Category', y='Repeat_%',
+                                        title=f'Cases at a Property Disputed in the Previous {repeat_window} (%)',
+                                        color='Repeat_%', color_continuous_scale='Oranges')
+                    fig_repeat.update_layout(height=450, xaxis_tickangle=-45)
+                    show_chart(fig_repeat)
+                
+                with col2:
+                    repeat_trends = repeat_rates(disputes, by=['Year', 'Category'], categories=view_categories).reset_index()
+                    fig_repeat_trends = px.line(repeat_trends, x='Year', y='Repeat_%', color='Category',
+                                                title='Repeat Share (%) by Year', markers=True,
+                                                color_discrete_sequence=px.colors.qualitative.Set3)
+                    fig_repeat_trends.update_layout(height=450)
+                    show_chart(fig_repeat_trends)
+                
+                # What came before each repeat dispute, e.g. repairs followed by a termination
+                category_transitions = transitions(disputes, years=selected_years)
+                category_transitions = category_transitions[[c for c in category_transitions.columns if c in view_categories]]
+                if not category_transitions.empty:
+                    fig_transitions = px.imshow(category_transitions.values,
+                                                x=category_transitions.columns,
+                                                y=category_transitions.index,
+                                                color_continuous_scale='Oranges',
+                                                labels={'x': 'Repeat dispute', 'y': 'Previous dispute', 'color': 'Cases'},
+                                                title='Previous Dispute at the Same Property → Repeat Dispute',
+                                                text_auto=',')
+                    fig_transitions.update_layout(height=450)
+                    show_chart(fig_transitions)
+                
+                links = load_property_links(cases.extract_signature('cases'))
+                st.caption(f"{links.stats['addresses']:,} address spellings → {links.stats['normalised']:,} normalised → "
+                           f"{links.stats['properties']:,} properties · {links.stats['unlinked']:,} cases without a usable address "
+                           f"· {links.stats['compared']:,} candidate pairs compared "
+                           f"(blocking + sorted neighbourhood) · linked in {links.stats['seconds']:.1f} s")
+                
+                if scope.is_admin:
+                    with st.expander("🏘️ Most Disputed Properties"):
+                        st.dataframe(scoped_histories(links, top=50), hide_index=True, use_container_width=True)
     
     # Key insights based on the detailed data
     st.subheader("📊 Key Insights from Detailed Analysis")
@@ -610,13 +1080,7 @@ elif page == "🏢 Application Categories":
     # Summary statistics table
     st.subheader("Category Statistics Summary (2017-2024)")
     
-    full_years_summary = df_cat_melted[df_cat_melted['Year'].between(2017, 2024)]
-    summary_stats = full_years_summary.groupby('Category')['Applications'].agg(['mean', 'min', 'max', 'sum', 'std']).round(0)
-    summary_stats.columns = ['Annual Average', 'Minimum', 'Maximum', 'Total (2017-2024)', 'Std Deviation']
-    summary_stats = summary_stats.sort_values('Annual Average', ascending=False)
-    
-    # Format to prevent juttering
-    summary_stats = summary_stats.astype(int)
+    summary_stats = ncat.category_summary(df_cat_melted)
     
     st.dataframe(summary_stats, use_container_width=True, height=400)
 
@@ -624,10 +1088,8 @@ elif page == "👥 Party Analysis":
     st.header("Applications by Party Type")
     
     # Prepare party data
-    df_party_clean = df_parties.dropna(subset=['Landlord', 'Tenant'])
-    df_party_melted = df_party_clean.melt(id_vars=['Year'], 
-                                         value_vars=['Landlord', 'Tenant'],
-                                         var_name='Party', value_name='Applications')
+    df_party_clean = ncat.party_ratios(df_parties)
+    df_party_melted = ncat.melt_parties(df_parties)
     
     # Main chart
     fig = px.bar(df_party_melted, x='Year', y='Applications', color='Party',
@@ -635,15 +1097,11 @@ elif page == "👥 Party Analysis":
                 barmode='group',
                 color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'})
     fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig)
     
     # Ratio analysis
     st.subheader("Landlord to Tenant Ratio")
     
-    df_party_clean['LL_Tenant_Ratio'] = df_party_clean['Landlord'] / df_party_clean['Tenant']
-    df_party_clean['Tenant_Percentage'] = (df_party_clean['Tenant'] / 
-                                          (df_party_clean['Landlord'] + df_party_clean['Tenant']) * 100)
-    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -651,53 +1109,145 @@ elif page == "👥 Party Analysis":
                            title='Landlord to Tenant Ratio',
                            markers=True)
         fig_ratio.update_layout(height=300)
-        st.plotly_chart(fig_ratio, use_container_width=True)
+        show_chart(fig_ratio)
     
     with col2:
         fig_percent = px.line(df_party_clean, x='Year', y='Tenant_Percentage',
                              title='Tenant Applications (%)',
                              markers=True)
         fig_percent.update_layout(height=300)
-        st.plotly_chart(fig_percent, use_container_width=True)
+        show_chart(fig_percent)
     
     # Summary statistics
     st.subheader("Summary Statistics (2017-2024)")
     
-    full_years = df_party_clean[df_party_clean['Year'].between(2017, 2024)]
+    party_summary = ncat.party_summary(df_party_clean)
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        avg_ll = full_years['Landlord'].mean()
-        st.metric("Average Landlord Applications", f"{avg_ll:,.0f}")
+        st.metric("Average Landlord Applications", f"{party_summary['avg_landlord']:,.0f}")
     
     with col2:
-        avg_tenant = full_years['Tenant'].mean()
-        st.metric("Average Tenant Applications", f"{avg_tenant:,.0f}")
+        st.metric("Average Tenant Applications", f"{party_summary['avg_tenant']:,.0f}")
     
     with col3:
-        avg_ratio = full_years['LL_Tenant_Ratio'].mean()
-        st.metric("Average LL:Tenant Ratio", f"{avg_ratio:.1f}:1")
+        st.metric("Average LL:Tenant Ratio", f"{party_summary['avg_ratio']:.1f}:1")
+    
+    # Repeat applicants from the case-level extract
+    st.subheader("Repeat Applicants")
+    
+    applicant_signature = cases.extract_signature('cases')
+    applicant_sketches = load_scoped_cells(APPLICANT_CELL, applicant_signature, scope,
+                                           load_applicant_sketches(applicant_signature))
+    
+    if applicant_sketches is None:
+        st.info("💡 Repeat-applicant analysis needs a case-level `cases` extract "
+                f"(CSV or Parquet) in `{cases.data_dir()}`.")
+    else:
+        sketch_years = sorted({key[0] for key in applicant_sketches.cells})
+        sketch_categories = sorted({key[APPLICANT_CELL.index('Category')] for key in applicant_sketches.cells})
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            applicant_years = st.slider("Select Year Range", 
+                                        min_value=sketch_years[0], max_value=sketch_years[-1], 
+                                        value=(sketch_years[0], sketch_years[-1]),
+                                        key="applicant_years")
+        
+        with col2:
+            applicant_categories = st.multiselect("Select Categories:", 
+                                                  sketch_categories,
+                                                  default=[c for c in sketch_categories if 'Termination' in c])
+        
+        applicant_filters = dict(years=range(applicant_years[0], applicant_years[1] + 1),
+                                 categories=applicant_categories or None)
+        overall = applicant_sketches.summary(**applicant_filters).iloc[0]
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Filings", f"{overall['Filings']:,}")
+        
+        with col2:
+            st.metric("Distinct Applicants (est.)", f"{overall['Distinct_Applicants']:,}")
+        
+        with col3:
+            st.metric("Filings per Applicant", f"{overall['Filings_per_Applicant']:.1f}")
+        
+        with col4:
+            st.metric("Top 10 Filers' Share", f"{overall['Top_10_Share_%']:.1f}%")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            by_registry = applicant_sketches.summary(by='Registry', **applicant_filters)
+            fig_concentration = px.bar(by_registry, x='Registry', y='Top_10_Share_%',
+                                       title='Share of Filings by Top 10 Filers per Registry (%)',
+                                       color='Filings_per_Applicant',
+                                       color_continuous_scale='Reds')
+            fig_concentration.update_layout(height=400)
+            show_chart(fig_concentration)
+        
+        with col2:
+            top_filers = applicant_sketches.top_filers(10, **applicant_filters)
+            filings = disclosed_counts(('top_filers', applicant_signature, scope, applicant_years,
+                                        tuple(applicant_categories)), top_filers.set_index('Applicant')['Filings'])
+            # A filer with few filings could be identified, so suppressed ones are left out
+            top_filers = top_filers[filings.notna().to_numpy()]
+            fig_top = px.bar(top_filers, x='Filings', y='Applicant', orientation='h',
+                             title='Top 10 Filers')
+            fig_top.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
+            show_chart(fig_top)
+        
+        st.dataframe(by_registry.set_index('Registry').round(1), use_container_width=True, height=260)
+        st.caption("Distinct counts are HyperLogLog estimates (±2%); top-filer counts are lower bounds "
+                   "and may be short by up to the listed undercount.")
+    
+    # Repeat disputes at the same property, from address entity resolution
+    st.subheader("Repeat Disputes by Party")
+    
+    party_window = st.select_slider("Counts as a repeat if within:", list(REPEAT_WINDOWS), value="12 months",
+                                    key="party_repeat_window")
+    disputes = scoped_dispute_counts(REPEAT_WINDOWS[party_window])
+    show_pinned_search()
+    
+    if disputes is None:
+        st.info("💡 Repeat-dispute analysis needs a case-level `cases` extract with an `Address` column "
+                f"in `{cases.data_dir()}`.")
+    else:
+        party_repeats = repeat_rates(disputes, by=['Party'])
+        # Who filed the previous dispute at the property
+        prior_parties = repeat_rates(disputes, by=['Party', 'Prior_Party']).reset_index()
+        prior_parties = prior_parties[prior_parties['Prior_Party'] != FIRST]
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig_party_repeat = px.bar(party_repeats.reset_index(), x='Party', y='Repeat_%',
+                                      title=f'Cases at a Property Disputed in the Previous {party_window} (%)',
+                                      color='Party',
+                                      color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'})
+            fig_party_repeat.update_layout(height=400, showlegend=False)
+            show_chart(fig_party_repeat)
+        
+        with col2:
+            fig_prior_party = px.bar(prior_parties, x='Party', y='Repeat', color='Prior_Party',
+                                     title='Repeat Disputes by Who Filed the Previous One',
+                                     labels={'Prior_Party': 'Previous applicant', 'Repeat': 'Repeat disputes'},
+                                     barmode='group',
+                                     color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'})
+            fig_prior_party.update_layout(height=400)
+            show_chart(fig_prior_party)
+        
+        st.dataframe(party_repeats, use_container_width=True)
 
 elif page == "📋 Detailed Party Breakdown":
     st.header("Detailed Party Analysis by Application Category")
     
-    # Data preparation - normalize category names
-    df_party_cat_clean = df_party_categories.copy()
-    
-    # Normalize category names for consistency
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Rental bonds', 'Rental Bonds')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('General orders', 'General Orders')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Termination - breach', 'Termination - Breach')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Termination - non-payment of rent', 'Termination non-payment of rent')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Termination - other', 'Termination - Other')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Termination by co-tenant (s102)', 'Termination by co-tenant (s.102)')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Termination by a co-tenant (s 102)', 'Termination by co-tenant (s.102)')
-    df_party_cat_clean['Category'] = df_party_cat_clean['Category'].str.replace('Termination - Breach (s 87)', 'Termination - Breach (s.87)')
-    
-    # Calculate percentages
-    df_party_cat_clean['Landlord_Pct'] = (df_party_cat_clean['Landlord'] / df_party_cat_clean['Total'] * 100).round(1)
-    df_party_cat_clean['Tenant_Pct'] = (df_party_cat_clean['Tenant'] / df_party_cat_clean['Total'] * 100).round(1)
+    # Data preparation - normalize category names and calculate percentages
+    df_party_cat_clean = ncat.normalize_party_categories(df_party_categories)
     
     # Analysis controls
     col1, col2 = st.columns(2)
@@ -745,12 +1295,14 @@ elif page == "📋 Detailed Party Breakdown":
                 
                 if not latest_data.empty:
                     # Stacked bar chart showing landlord/tenant split
-                    fig_split = px.bar(latest_data, x='Category', y=['Landlord', 'Tenant'],
-                                     title=f'{latest_year} - Applications by Category and Party',
-                                     color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'},
-                                     barmode='stack')
-                    fig_split.update_layout(height=500, xaxis_tickangle=-45)
-                    st.plotly_chart(fig_split, use_container_width=True)
+                    def build_split():
+                        fig_split = px.bar(latest_data, x='Category', y=['Landlord', 'Tenant'],
+                                         title=f'{latest_year} - Applications by Category and Party',
+                                         color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'},
+                                         barmode='stack')
+                        fig_split.update_layout(height=500, xaxis_tickangle=-45)
+                        return fig_split
+                    schedule_chart(build_split)
                     
                     # Percentage breakdown table
                     st.subheader(f"Percentage Breakdown ({latest_year})")
@@ -760,6 +1312,8 @@ elif page == "📋 Detailed Party Breakdown":
                     summary_table.columns = ['Application Category', 'Landlord %', 'Tenant %', 'Total Applications']
                     
                     st.dataframe(summary_table, use_container_width=True, hide_index=True, height=400)
+                
+                draw_scheduled_charts()
             
             with tab2:
                 st.subheader("Party Patterns Over Time")
@@ -771,31 +1325,39 @@ elif page == "📋 Detailed Party Breakdown":
                     
                     with col1:
                         # Landlord trends
-                        fig_landlord = px.line(filtered_data, x='Year', y='Landlord', color='Category',
-                                             title='Landlord Applications Trends',
-                                             markers=True)
-                        fig_landlord.update_layout(height=400)
-                        st.plotly_chart(fig_landlord, use_container_width=True)
+                        def build_landlord():
+                            fig_landlord = px.line(filtered_data, x='Year', y='Landlord', color='Category',
+                                                 title='Landlord Applications Trends',
+                                                 markers=True)
+                            fig_landlord.update_layout(height=400)
+                            return fig_landlord
+                        schedule_chart(build_landlord)
                     
                     with col2:
                         # Tenant trends
-                        fig_tenant = px.line(filtered_data, x='Year', y='Tenant', color='Category',
-                                           title='Tenant Applications Trends',
-                                           markers=True)
-                        fig_tenant.update_layout(height=400)
-                        st.plotly_chart(fig_tenant, use_container_width=True)
+                        def build_tenant():
+                            fig_tenant = px.line(filtered_data, x='Year', y='Tenant', color='Category',
+                                               title='Tenant Applications Trends',
+                                               markers=True)
+                            fig_tenant.update_layout(height=400)
+                            return fig_tenant
+                        schedule_chart(build_tenant)
                     
                     # Percentage trends
                     st.subheader("Percentage Share Trends")
                     
                     # Calculate and show how the landlord/tenant split changes over time
-                    fig_pct_trends = px.line(filtered_data, x='Year', y='Landlord_Pct', color='Category',
-                                           title='Landlord Share (%) Trends by Category',
-                                           markers=True)
-                    fig_pct_trends.update_layout(height=400)
-                    fig_pct_trends.add_hline(y=50, line_dash="dash", line_color="red", 
-                                           annotation_text="50% Split Line")
-                    st.plotly_chart(fig_pct_trends, use_container_width=True)
+                    def build_pct_trends():
+                        fig_pct_trends = px.line(filtered_data, x='Year', y='Landlord_Pct', color='Category',
+                                               title='Landlord Share (%) Trends by Category',
+                                               markers=True)
+                        fig_pct_trends.update_layout(height=400)
+                        fig_pct_trends.add_hline(y=50, line_dash="dash", line_color="red", 
+                                               annotation_text="50% Split Line")
+                        return fig_pct_trends
+                    schedule_chart(build_pct_trends)
+                
+                draw_scheduled_charts()
             
             with tab3:
                 st.subheader("Category Deep Dive")
@@ -811,21 +1373,25 @@ elif page == "📋 Detailed Party Breakdown":
                     
                     with col1:
                         # Absolute numbers over time
-                        fig_abs = px.bar(category_data, x='Year', y=['Landlord', 'Tenant'],
-                                       title=f'{focus_category} - Absolute Numbers',
-                                       color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'},
-                                       barmode='group')
-                        fig_abs.update_layout(height=400)
-                        st.plotly_chart(fig_abs, use_container_width=True)
+                        def build_abs():
+                            fig_abs = px.bar(category_data, x='Year', y=['Landlord', 'Tenant'],
+                                           title=f'{focus_category} - Absolute Numbers',
+                                           color_discrete_map={'Landlord': '#ef4444', 'Tenant': '#3b82f6'},
+                                           barmode='group')
+                            fig_abs.update_layout(height=400)
+                            return fig_abs
+                        schedule_chart(build_abs)
                     
                     with col2:
                         # Percentage composition
-                        fig_pct = px.bar(category_data, x='Year', y=['Landlord_Pct', 'Tenant_Pct'],
-                                       title=f'{focus_category} - Percentage Split',
-                                       color_discrete_map={'Landlord_Pct': '#ef4444', 'Tenant_Pct': '#3b82f6'},
-                                       barmode='stack')
-                        fig_pct.update_layout(height=400)
-                        st.plotly_chart(fig_pct, use_container_width=True)
+                        def build_pct():
+                            fig_pct = px.bar(category_data, x='Year', y=['Landlord_Pct', 'Tenant_Pct'],
+                                           title=f'{focus_category} - Percentage Split',
+                                           color_discrete_map={'Landlord_Pct': '#ef4444', 'Tenant_Pct': '#3b82f6'},
+                                           barmode='stack')
+                            fig_pct.update_layout(height=400)
+                            return fig_pct
+                        schedule_chart(build_pct)
                     
                     # Statistics for this category
                     st.subheader(f"Statistics: {focus_category}")
@@ -841,31 +1407,44 @@ elif page == "📋 Detailed Party Breakdown":
                         st.metric("Average Tenant Share", f"{avg_tenant_pct:.1f}%")
                     with col3:
                         st.metric("Total Applications", f"{total_apps:,}")
+                    
+                    # Outcomes by filing party for this category
+                    outcomes = scoped_outcome_counts()
+                    
+                    if outcomes is not None and focus_category in PARTY_CATEGORY_LABELS:
+                        party_outcomes = outcome_rates(outcomes, by=['Party'], years=selected_years,
+                                                       categories=[PARTY_CATEGORY_LABELS[focus_category]])
+                        
+                        if not party_outcomes.empty:
+                            st.subheader(f"Outcomes by Party: {focus_category}")
+                            st.dataframe(party_outcomes, use_container_width=True)
+                
+                draw_scheduled_charts()
             
             with tab4:
                 st.subheader("💡 Key Insights from Party Analysis")
                 
                 # Generate insights based on the data
-                insights_data = df_party_cat_clean[df_party_cat_clean['Year'] == 2024]  # Use latest year
+                split_groups = ncat.party_split_groups(df_party_cat_clean, 2024)  # Use latest year
                 
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     st.markdown("#### 🏠 **Tenant-Dominated Categories:**")
-                    tenant_dominated = insights_data[insights_data['Tenant_Pct'] > 70].sort_values('Tenant_Pct', ascending=False)
+                    tenant_dominated = split_groups['tenant']
                     if not tenant_dominated.empty:
                         for _, row in tenant_dominated.iterrows():
                             st.write(f"• **{row['Category']}**: {row['Tenant_Pct']:.1f}% tenant-filed")
                     
                     st.markdown("#### 📊 **Mixed Categories:**")
-                    mixed = insights_data[(insights_data['Tenant_Pct'] >= 30) & (insights_data['Tenant_Pct'] <= 70)].sort_values('Tenant_Pct', ascending=False)
+                    mixed = split_groups['mixed']
                     if not mixed.empty:
                         for _, row in mixed.iterrows():
                             st.write(f"• **{row['Category']}**: {row['Landlord_Pct']:.1f}% LL / {row['Tenant_Pct']:.1f}% T")
                 
                 with col2:
                     st.markdown("#### 🏢 **Landlord-Dominated Categories:**")
-                    landlord_dominated = insights_data[insights_data['Landlord_Pct'] > 70].sort_values('Landlord_Pct', ascending=False)
+                    landlord_dominated = split_groups['landlord']
                     if not landlord_dominated.empty:
                         for _, row in landlord_dominated.iterrows():
                             st.write(f"• **{row['Category']}**: {row['Landlord_Pct']:.1f}% landlord-filed")
@@ -903,6 +1482,13 @@ elif page == "🗺️ Geographic Distribution":
     geo_page = st.selectbox("Select Analysis Type:", 
                            ["🏢 Total Applications by Office", "📊 Individual List Types by Office"])
     
+    # Raw counts or rates against the registry dimension table
+    measure = st.selectbox("Measure:", ['Applications'] + available_rates(registry_dim), format_func=measure_label)
+    measure_suffix = '' if measure == 'Applications' else f' ({measure_label(measure)})'
+    
+    with st.expander("📋 Registry Reference Data"):
+        st.dataframe(registry_dim.set_index('Registry'), use_container_width=True)
+    
     if geo_page == "🏢 Total Applications by Office":
         st.subheader("Total CCD Applications by Registry")
         
@@ -911,83 +1497,75 @@ elif page == "🗺️ Geographic Distribution":
                                     sorted(df_total_ccd['Year'].unique()),
                                     index=len(df_total_ccd['Year'].unique())-2)  # Default to 2024
         
-        year_data = df_total_ccd[df_total_ccd['Year'] == selected_year]
+        df_total_melted = registry_measures(None, data_version, registry_signature, cube, registry_dim)
+        year_data = df_total_melted[df_total_melted['Year'] == selected_year]
         
         if not year_data.empty:
             # Prepare data for visualization
-            registries = ['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong']
-            values = [year_data[reg].iloc[0] for reg in registries]
+            registries = list(year_data['Registry'])
+            values = list(year_data[measure])
             
             col1, col2 = st.columns(2)
             
             with col1:
                 # Bar chart
                 fig_bar = px.bar(x=registries, y=values,
-                               title=f'{selected_year} - Total Applications by Registry',
+                               title=f'{selected_year} - Total Applications by Registry{measure_suffix}',
                                color=values,
                                color_continuous_scale='viridis')
                 fig_bar.update_layout(height=400)
-                st.plotly_chart(fig_bar, use_container_width=True)
+                show_chart(fig_bar)
             
             with col2:
                 # Pie chart
-                fig_pie = px.pie(values=values, names=registries,
+                fig_pie = px.pie(values=list(year_data['Applications']), names=registries,
                                title=f'{selected_year} - Registry Distribution')
                 fig_pie.update_layout(height=400)
-                st.plotly_chart(fig_pie, use_container_width=True)
+                show_chart(fig_pie)
+            
+            show_registry_map(year_data, measure, f'{selected_year} - Total Applications by Registry Catchment{measure_suffix}')
         
         # Time series for all registries - Total CCD
         st.subheader("Total Application Trends by Registry Over Time")
         
-        # Melt the total CCD data
-        df_total_melted = df_total_ccd.melt(id_vars=['Year'], 
-                                           value_vars=['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong'],
-                                           var_name='Registry', value_name='Applications')
-        
         # Filter for full years
         full_year_data = df_total_melted[df_total_melted['Year'].between(2017, 2024)]
         
-        fig_trends = px.line(full_year_data, x='Year', y='Applications', color='Registry',
-                            title='Total Application Trends by Registry (2017-2024)',
+        fig_trends = px.line(full_year_data, x='Year', y=measure, color='Registry',
+                            title=f'Total Application Trends by Registry (2017-2024){measure_suffix}',
                             markers=True)
         fig_trends.update_layout(height=500)
-        st.plotly_chart(fig_trends, use_container_width=True)
+        show_chart(fig_trends)
         
         # Registry comparison table - Total
         st.subheader("Registry Statistics - Total Applications (2017-2024)")
         
-        registry_stats = full_year_data.groupby('Registry')['Applications'].agg(['mean', 'min', 'max', 'std']).round(0)
-        registry_stats.columns = ['Average', 'Minimum', 'Maximum', 'Std Dev']
-        registry_stats = registry_stats.sort_values('Average', ascending=False)
-        
-        # Format as integers to prevent juttering
-        registry_stats = registry_stats.astype(int)
+        registry_stats = ncat.registry_stats(df_total_melted)
         
         st.dataframe(registry_stats, use_container_width=True, height=300)
+        
+        # Drill-down from registry to list type
+        st.subheader("Registry Drill-Down by List Type")
+        
+        drill_registry = st.selectbox("Select Registry", sorted(df_total_melted['Registry'].unique()))
+        drill_data = cube.drill(Registry=drill_registry, Year=selected_year)
+        
+        fig_drill = px.bar(drill_data.sort_values('Applications', ascending=False),
+                           x='List', y='Applications',
+                           title=f'{selected_year} - {drill_registry} Applications by List Type',
+                           color='Applications',
+                           color_continuous_scale='viridis')
+        fig_drill.update_layout(height=400)
+        show_chart(fig_drill)
     
     else:  # Individual List Types by Office
         st.subheader("Individual Application Types by Registry")
         
         # List type selector
-        list_type = st.selectbox("Select Application Type:", 
-                                ["Private Tenancy", "Social Housing", "General", "Home Building", 
-                                 "Strata Schemes", "Motor Vehicles", "Commercial", 
-                                 "Residential Communities", "Retirement Villages"])
+        list_type = st.selectbox("Select Application Type:", list(list_frames))
         
         # Map selection to dataframe
-        df_map = {
-            "Private Tenancy": df_geo,
-            "Social Housing": df_social_housing,
-            "General": df_general,
-            "Home Building": df_home_building,
-            "Strata Schemes": df_strata,
-            "Motor Vehicles": df_motor_vehicles,
-            "Commercial": df_commercial,
-            "Residential Communities": df_residential_communities,
-            "Retirement Villages": df_retirement_villages
-        }
-        
-        selected_df = df_map[list_type]
+        selected_df = list_frames[list_type]
         
         # Year selector
         selected_year = st.selectbox("Select Year for Comparison", 
@@ -995,47 +1573,45 @@ elif page == "🗺️ Geographic Distribution":
                                     index=len(selected_df['Year'].unique())-2,
                                     key="individual_year")  # Default to 2024
         
-        year_data = selected_df[selected_df['Year'] == selected_year]
+        df_selected_melted = registry_measures(list_type, data_version, registry_signature, cube, registry_dim)
+        year_data = df_selected_melted[df_selected_melted['Year'] == selected_year]
         
         if not year_data.empty:
             # Prepare data for visualization
-            registries = ['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong']
-            values = [year_data[reg].iloc[0] for reg in registries]
+            registries = list(year_data['Registry'])
+            values = list(year_data[measure])
             
             col1, col2 = st.columns(2)
             
             with col1:
                 # Bar chart
                 fig_bar = px.bar(x=registries, y=values,
-                               title=f'{selected_year} - {list_type} Applications by Registry',
+                               title=f'{selected_year} - {list_type} Applications by Registry{measure_suffix}',
                                color=values,
                                color_continuous_scale='plasma')
                 fig_bar.update_layout(height=400)
-                st.plotly_chart(fig_bar, use_container_width=True)
+                show_chart(fig_bar)
             
             with col2:
                 # Pie chart
-                fig_pie = px.pie(values=values, names=registries,
+                fig_pie = px.pie(values=list(year_data['Applications']), names=registries,
                                title=f'{selected_year} - {list_type} Distribution')
                 fig_pie.update_layout(height=400)
-                st.plotly_chart(fig_pie, use_container_width=True)
+                show_chart(fig_pie)
+            
+            show_registry_map(year_data, measure, f'{selected_year} - {list_type} Applications by Registry Catchment{measure_suffix}')
         
         # Time series for selected list type
         st.subheader(f"{list_type} Trends by Registry Over Time")
         
-        # Melt the selected data
-        df_selected_melted = selected_df.melt(id_vars=['Year'], 
-                                             value_vars=['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong'],
-                                             var_name='Registry', value_name='Applications')
-        
         # Filter for full years
         full_year_data = df_selected_melted[df_selected_melted['Year'].between(2017, 2024)]
         
-        fig_trends = px.line(full_year_data, x='Year', y='Applications', color='Registry',
-                            title=f'{list_type} Application Trends by Registry (2017-2024)',
+        fig_trends = px.line(full_year_data, x='Year', y=measure, color='Registry',
+                            title=f'{list_type} Application Trends by Registry (2017-2024){measure_suffix}',
                             markers=True)
         fig_trends.update_layout(height=500)
-        st.plotly_chart(fig_trends, use_container_width=True)
+        show_chart(fig_trends)
         
         # Comparative analysis across years
         st.subheader(f"{list_type} - Multi-Year Comparison")
@@ -1049,15 +1625,26 @@ elif page == "🗺️ Geographic Distribution":
             comparison_data = selected_df[selected_df['Year'].isin(comparison_years)]
             
             # Create grouped bar chart
-            df_comparison_melted = comparison_data.melt(id_vars=['Year'], 
-                                                       value_vars=['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong'],
-                                                       var_name='Registry', value_name='Applications')
+            df_comparison_melted = ncat.melt_registries(comparison_data)
             
             fig_comparison = px.bar(df_comparison_melted, x='Registry', y='Applications', color='Year',
                                    title=f'{list_type} Applications - Multi-Year Comparison',
                                    barmode='group')
             fig_comparison.update_layout(height=400)
-            st.plotly_chart(fig_comparison, use_container_width=True)
+            show_chart(fig_comparison)
+            
+            # Change between the first and last selected years
+            first_year, last_year = min(comparison_years), max(comparison_years)
+            registry_changes = comparator.compare(first_year, last_year, dims=('Registry',),
+                                                  List=list_type).reset_index()
+            
+            fig_change = px.bar(registry_changes, x='Registry', y='Change',
+                                title=f'{list_type} - Change {first_year} to {last_year} by Registry',
+                                color='Change_%',
+                                color_continuous_scale='RdBu_r',
+                                hover_data=['Base', 'Target', 'Contribution_%'])
+            fig_change.update_layout(height=400)
+            show_chart(fig_change)
 
 elif page == "⚖️ NCAT Lists Comparison":
     st.header("NCAT Lists Comparison")
@@ -1070,20 +1657,7 @@ elif page == "⚖️ NCAT Lists Comparison":
         st.subheader("Overall Application Volume by List Type")
         
         # Prepare other lists data
-        df_lists_melted = df_other_lists.melt(id_vars=['Year'], 
-                                             value_vars=['Tenancy', 'Social_Housing', 'General', 'Home_Building', 'Strata_Schemes', 'Motor_Vehicles'],
-                                             var_name='List_Type', value_name='Applications')
-        
-        # List name mapping
-        list_mapping = {
-            'Tenancy': 'Tenancy',
-            'Social_Housing': 'Social Housing',
-            'General': 'General',
-            'Home_Building': 'Home Building',
-            'Strata_Schemes': 'Strata Schemes',
-            'Motor_Vehicles': 'Motor Vehicles'
-        }
-        df_lists_melted['List_Type'] = df_lists_melted['List_Type'].map(list_mapping)
+        df_lists_melted = ncat.melt_lists(df_other_lists)
         
         # Year filter
         year_filter = st.slider("Select Year Range", 
@@ -1093,41 +1667,33 @@ elif page == "⚖️ NCAT Lists Comparison":
         filtered_lists = df_lists_melted[df_lists_melted['Year'].between(year_filter[0], year_filter[1])]
         
         # Stacked area chart
-        fig_area = px.area(filtered_lists, x='Year', y='Applications', color='List_Type',
-                          title='NCAT List Applications Over Time',
-                          color_discrete_sequence=px.colors.qualitative.Set3)
-        fig_area.update_layout(height=500)
-        st.plotly_chart(fig_area, use_container_width=True)
+        def build_area():
+            fig_area = px.area(filtered_lists, x='Year', y='Applications', color='List_Type',
+                              title='NCAT List Applications Over Time',
+                              color_discrete_sequence=px.colors.qualitative.Set3)
+            fig_area.update_layout(height=500)
+            return fig_area
+        schedule_chart(build_area)
         
         # Market share analysis
         st.subheader("Market Share Analysis")
         
         # Calculate proportions
-        total_by_year = filtered_lists.groupby('Year')['Applications'].sum().reset_index()
-        total_by_year.columns = ['Year', 'Total']
-        
-        filtered_lists_with_total = filtered_lists.merge(total_by_year, on='Year')
-        filtered_lists_with_total['Percentage'] = (filtered_lists_with_total['Applications'] / 
-                                                  filtered_lists_with_total['Total'] * 100)
+        filtered_lists_with_total = ncat.list_shares(filtered_lists)
         
         # Line chart for percentages
-        fig_percent = px.line(filtered_lists_with_total, x='Year', y='Percentage', color='List_Type',
-                             title='Market Share (%) by List Type',
-                             markers=True)
-        fig_percent.update_layout(height=400)
-        st.plotly_chart(fig_percent, use_container_width=True)
+        def build_percent():
+            fig_percent = px.line(filtered_lists_with_total, x='Year', y='Percentage', color='List_Type',
+                                 title='Market Share (%) by List Type',
+                                 markers=True)
+            fig_percent.update_layout(height=400)
+            return fig_percent
+        schedule_chart(build_percent)
         
         # Summary statistics
         st.subheader("List Performance Summary (2017-2024)")
         
-        full_years_lists = filtered_lists[filtered_lists['Year'].between(2017, 2024)]
-        summary_stats = full_years_lists.groupby('List_Type')['Applications'].agg(['mean', 'sum', 'std']).round(0)
-        summary_stats.columns = ['Annual Average', 'Total (2017-2024)', 'Std Deviation']
-        summary_stats['Market Share %'] = (summary_stats['Total (2017-2024)'] / summary_stats['Total (2017-2024)'].sum() * 100).round(1)
-        summary_stats = summary_stats.sort_values('Annual Average', ascending=False)
-        
-        # Format to prevent juttering
-        summary_stats[['Annual Average', 'Total (2017-2024)', 'Std Deviation']] = summary_stats[['Annual Average', 'Total (2017-2024)', 'Std Deviation']].astype(int)
+        summary_stats = ncat.list_summary(filtered_lists)
         
         st.dataframe(summary_stats, use_container_width=True, height=300)
         
@@ -1139,6 +1705,8 @@ elif page == "⚖️ NCAT Lists Comparison":
         - **Home Building** and **General** lists show steady demand
         - **Motor Vehicles** and **Strata Schemes** represent smaller but consistent workloads
         """)
+        
+        draw_scheduled_charts()
     
     else:  # List Types by Registry
         st.subheader("Application Types by Registry Analysis")
@@ -1154,125 +1722,561 @@ elif page == "⚖️ NCAT Lists Comparison":
         
         with col2:
             # Select specific list types to compare
-            available_lists = ["Private Tenancy", "Social Housing", "General", "Home Building", 
-                              "Strata Schemes", "Motor Vehicles", "Commercial", 
-                              "Residential Communities", "Retirement Villages"]
+            available_lists = list(list_frames)
             selected_lists = st.multiselect("Select List Types to Compare:", 
                                            available_lists,
                                            default=["Private Tenancy", "Social Housing"])
         
         if selected_lists:
             # Prepare data for selected lists and year
-            registry_comparison_data = []
-            
-            for list_type in selected_lists:
-                if list_type == "Private Tenancy":
-                    df_source = df_geo
-                elif list_type == "Social Housing":
-                    df_source = df_social_housing
-                elif list_type == "General":
-                    df_source = df_general
-                elif list_type == "Home Building":
-                    df_source = df_home_building
-                elif list_type == "Strata Schemes":
-                    df_source = df_strata
-                elif list_type == "Motor Vehicles":
-                    df_source = df_motor_vehicles
-                elif list_type == "Commercial":
-                    df_source = df_commercial
-                elif list_type == "Residential Communities":
-                    df_source = df_residential_communities
-                elif list_type == "Retirement Villages":
-                    df_source = df_retirement_villages
-                
-                year_data = df_source[df_source['Year'] == selected_year]
-                if not year_data.empty:
-                    for registry in ['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong']:
-                        registry_comparison_data.append({
-                            'List_Type': list_type,
-                            'Registry': registry,
-                            'Applications': year_data[registry].iloc[0]
-                        })
+            df_comparison = ncat.registry_comparison(list_frames, selected_year, selected_lists)
             
-            if registry_comparison_data:
-                df_comparison = pd.DataFrame(registry_comparison_data)
-                
+            if not df_comparison.empty:
                 # Grouped bar chart
-                fig_grouped = px.bar(df_comparison, x='Registry', y='Applications', color='List_Type',
-                                   title=f'{selected_year} - Application Types by Registry',
-                                   barmode='group',
-                                   color_discrete_sequence=px.colors.qualitative.Set2)
-                fig_grouped.update_layout(height=500)
-                st.plotly_chart(fig_grouped, use_container_width=True)
+                def build_grouped():
+                    fig_grouped = px.bar(df_comparison, x='Registry', y='Applications', color='List_Type',
+                                       title=f'{selected_year} - Application Types by Registry',
+                                       barmode='group',
+                                       color_discrete_sequence=px.colors.qualitative.Set2)
+                    fig_grouped.update_layout(height=500)
+                    return fig_grouped
+                schedule_chart(build_grouped)
                 
                 # Stacked percentage chart
-                fig_stacked = px.bar(df_comparison, x='Registry', y='Applications', color='List_Type',
-                                   title=f'{selected_year} - List Type Distribution by Registry (%)',
-                                   text='Applications',
-                                   color_discrete_sequence=px.colors.qualitative.Set2)
-                fig_stacked.update_traces(texttemplate='%{text}', textposition='inside')
-                fig_stacked.update_layout(height=400, barnorm='percent')
-                st.plotly_chart(fig_stacked, use_container_width=True)
+                def build_stacked():
+                    fig_stacked = px.bar(df_comparison, x='Registry', y='Applications', color='List_Type',
+                                       title=f'{selected_year} - List Type Distribution by Registry (%)',
+                                       text='Applications',
+                                       color_discrete_sequence=px.colors.qualitative.Set2)
+                    fig_stacked.update_traces(texttemplate='%{text}', textposition='inside')
+                    fig_stacked.update_layout(height=400, barnorm='percent')
+                    return fig_stacked
+                schedule_chart(build_stacked)
+        
+        draw_scheduled_charts()
         
         # Registry specialization analysis
         st.subheader("Registry Specialization Analysis")
         
-        # Calculate which registries handle the most of each type
-        specialization_data = []
-        list_dataframes = {
-            "Private Tenancy": df_geo,
-            "Social Housing": df_social_housing,
-            "General": df_general,
-            "Home Building": df_home_building,
-            "Strata Schemes": df_strata,
-            "Motor Vehicles": df_motor_vehicles,
-            "Commercial": df_commercial,
-            "Residential Communities": df_residential_communities,
-            "Retirement Villages": df_retirement_villages
-        }
-        
-        for list_type, df_source in list_dataframes.items():
-            # Use 2024 data for analysis
-            year_2024 = df_source[df_source['Year'] == 2024]
-            if not year_2024.empty:
-                registries = ['Liverpool', 'Newcastle', 'Penrith', 'Sydney', 'Tamworth', 'Wollongong']
-                values = [year_2024[reg].iloc[0] for reg in registries]
-                total = sum(values)
-                
-                for registry, value in zip(registries, values):
-                    percentage = (value / total * 100) if total > 0 else 0
-                    specialization_data.append({
-                        'List_Type': list_type,
-                        'Registry': registry,
-                        'Applications': value,
-                        'Percentage_of_Type': percentage
-                    })
-        
-        if specialization_data:
-            df_specialization = pd.DataFrame(specialization_data)
-            
+        # Calculate which registries handle the most of each type (2024 data)
+        df_specialization = ncat.specialization(list_frames, 2024)
+        
+        if not df_specialization.empty:
             # Heatmap showing percentage distribution
             pivot_data = df_specialization.pivot(index='Registry', columns='List_Type', values='Percentage_of_Type')
             
-            fig_heatmap = px.imshow(pivot_data.values,
-                                   x=pivot_data.columns,
-                                   y=pivot_data.index,
-                                   color_continuous_scale='viridis',
-                                   title='Registry Specialization Heatmap (% of each list type handled by registry)',
-                                   text_auto='.1f')
-            fig_heatmap.update_layout(height=400)
-            st.plotly_chart(fig_heatmap, use_container_width=True)
+            def build_heatmap():
+                fig_heatmap = px.imshow(pivot_data.values,
+                                       x=pivot_data.columns,
+                                       y=pivot_data.index,
+                                       color_continuous_scale='viridis',
+                                       title='Registry Specialization Heatmap (% of each list type handled by registry)',
+                                       text_auto='.1f')
+                fig_heatmap.update_layout(height=400)
+                return fig_heatmap
+            schedule_chart(build_heatmap)
             
             # Top performers table
             st.subheader("Registry Performance Leaders (2024)")
             
             # Find the top registry for each list type
-            top_performers = df_specialization.loc[df_specialization.groupby('List_Type')['Applications'].idxmax()]
-            top_performers = top_performers[['List_Type', 'Registry', 'Applications', 'Percentage_of_Type']].sort_values('Applications', ascending=False)
-            top_performers['Percentage_of_Type'] = top_performers['Percentage_of_Type'].round(1)
-            top_performers['Applications'] = top_performers['Applications'].astype(int)
+            top_performers = ncat.top_performers(df_specialization)
             
             st.dataframe(top_performers, use_container_width=True, hide_index=True, height=300)
+            
+            draw_scheduled_charts()
+
+elif page == "🔗 Cross-List Correlation":
+    st.header("Cross-List Correlation and Lead-Lag")
+    
+    case_signature = cases.extract_signature('cases')
+    sources = ["📅 Annual (published tables)"] + (["🗓️ Monthly (case extract)"] if case_signature else [])
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        correlation_source = st.selectbox("Series:", sources)
+    
+    monthly = correlation_source != sources[0]
+    if monthly:
+        # Scoped like the other case-level counts; ('monthly', ...) keeps the cache key apart from outcomes
+        counts = load_scoped_counts(('monthly', case_signature), scope, load_monthly_counts(case_signature))
+        series = monthly_series(counts)
+        series_version = (case_signature, scope)
+    else:
+        series = annual_series(data)
+        series_version = data_version
+    
+    with col2:
+        compare_on = st.selectbox("Compare:", ["📈 Period-on-period changes", "📊 Volumes"])
+    
+    with col3:
+        max_lag = st.slider("Maximum Lag (months)" if monthly else "Maximum Lag (years)",
+                            min_value=1, max_value=12 if monthly else 3, value=3 if monthly else 1)
+    
+    changes = compare_on == "📈 Period-on-period changes"
+    if len(series) < 2 or series.shape[1] < 6:
+        st.info("💡 Not enough series or periods to correlate for this selection.")
+    else:
+        correlations = load_lead_lag(correlation_source, series_version, max_lag, changes, series)
+        series_lists = sorted(set(series.index.get_level_values('List')))
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            focus_lists = st.multiselect("Focus on Lists:", series_lists,
+                                         default=[l for l in ("Private Tenancy", "Social Housing", "Home Building", "Strata Schemes")
+                                                  if l in series_lists])
+        
+        with col2:
+            cross_list = st.checkbox("Only pairs across lists", value=True)
+        
+        focus = focus_lists or None
+        st.caption(f"{len(correlations):,} series · {len(correlations) * (len(correlations) - 1) // 2:,} pairs at "
+                   f"{2 * max_lag + 1} lags · computed in {correlations.seconds * 1000:.0f} ms")
+        
+        st.subheader("🏆 Strongest Lead-Lag Pairs")
+        lag_unit = "months" if monthly else "years"
+        top_pairs = correlations.pairs(top=25, lists=focus, cross_list=cross_list, min_lag=1)
+        if top_pairs.empty:
+            st.info("No lagged pairs for this selection.")
+        else:
+            st.dataframe(top_pairs.rename(columns={'Lag': f'Lag ({lag_unit})', 'Same_Period': 'Same Period'}).round(2),
+                         hide_index=True, use_container_width=True)
+        
+        focus_matrix = correlations.matrix('same_period', lists=focus)
+        if len(focus_matrix) > 80:
+            st.info(f"💡 {len(focus_matrix)} series are too many for a readable heatmap; focus on fewer lists.")
+        elif len(focus_matrix):
+            matrix_kind = st.selectbox("Heatmap:", ["Same-period correlation", "Strongest lagged correlation"])
+            if matrix_kind != "Same-period correlation":
+                focus_matrix = correlations.matrix('best', lists=focus)
+            fig_matrix = px.imshow(focus_matrix.values, x=list(focus_matrix.columns), y=list(focus_matrix.index),
+                                   color_continuous_scale='RdBu', zmin=-1, zmax=1, aspect='auto',
+                                   title=f"{matrix_kind} ({compare_on[2:].lower()})")
+            fig_matrix.update_layout(height=max(400, 18 * len(focus_matrix) + 150))
+            show_chart(fig_matrix)
+        
+        st.subheader("🔍 Pair Explorer")
+        labels = {correlations.labels[i]: key for i, key in enumerate(correlations.keys)}
+        default_pair = (list(top_pairs['Leader'].iloc[:1]) + list(top_pairs['Follower'].iloc[:1])
+                        if len(top_pairs) else list(labels)[:2])
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            first_label = st.selectbox("First Series:", list(labels), index=list(labels).index(default_pair[0]))
+        
+        with col2:
+            second_label = st.selectbox("Second Series:", list(labels), index=list(labels).index(default_pair[1]))
+        
+        if first_label == second_label:
+            st.info("💡 Choose two different series.")
+        else:
+            profile = lag_profile(series, labels[first_label], labels[second_label], max_lag, changes).reset_index()
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_profile = px.bar(profile, x='Lag', y='Correlation', range_y=[-1, 1],
+                                     title=f"Correlation by Lag (positive: {first_label} leads)",
+                                     labels={'Lag': f'Lag ({lag_unit})'})
+                fig_profile.update_layout(height=400)
+                show_chart(fig_profile)
+            
+            with col2:
+                pair = series.loc[[labels[first_label], labels[second_label]]].T
+                pair.columns = [first_label, second_label]
+                pair = pair.rename_axis('Period').reset_index().melt(id_vars='Period', var_name='Series',
+                                                                     value_name='Applications')
+                fig_pair = px.line(pair, x='Period', y='Applications', color='Series', markers=not monthly,
+                                   title="Volumes")
+                fig_pair.update_layout(height=400, legend=dict(orientation='h', y=-0.2))
+                show_chart(fig_pair)
+
+elif page == "👷 Capacity Planner":
+    st.header("Capacity and Workload Planner")
+    
+    capacity_years = sorted(df_total_ccd['Year'].unique())
+    default_year = max([y for y in capacity_years if y <= ncat.FULL_YEARS[1]] or capacity_years)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        capacity_year = st.selectbox("Base Year Volumes:", capacity_years, index=capacity_years.index(default_year))
+    
+    with col2:
+        growth = st.slider("Volume Change (%)", min_value=-30, max_value=30, value=0, step=5)
+    
+    with col3:
+        draws = st.selectbox("Simulation Draws:", [10_000, 20_000, 50_000, 100_000], index=1,
+                             format_func=lambda n: f"{n:,}")
+    
+    with col4:
+        sitting_hours = st.number_input("Sitting Hours per Member FTE:", min_value=100, max_value=2000,
+                                        value=SITTING_HOURS, step=50)
+    
+    # Total CCD beyond the published lists would include lists outside a list-restricted scope
+    include_other = scope.lists is None
+    volumes = registry_volumes(data, capacity_year, include_other=include_other)
+    
+    if volumes.empty:
+        st.info(f"💡 No registry volumes for {capacity_year}.")
+    else:
+        with st.expander("⚙️ Effort Assumptions per List", expanded=False):
+            st.caption("Hearings per application (mean and coefficient of variation) and member hours per "
+                       "hearing (low, most likely, high). Replace the defaults with listing-system figures.")
+            effort_defaults = pd.DataFrame([DEFAULT_EFFORT.get(l, DEFAULT_EFFORT[OTHER]) for l in volumes.columns],
+                                           index=pd.Index(volumes.columns, name='List'))
+            effort_table = st.data_editor(effort_defaults, use_container_width=True, disabled=['List'],
+                                          column_config={
+                                              'hearings': st.column_config.NumberColumn("Hearings / Application", min_value=0.0, step=0.1),
+                                              'hearings_cv': st.column_config.NumberColumn("Hearings CV", min_value=0.0, step=0.05),
+                                              'hours_low': st.column_config.NumberColumn("Hours Low", min_value=0.0, step=0.25),
+                                              'hours_mode': st.column_config.NumberColumn("Hours Most Likely", min_value=0.0, step=0.25),
+                                              'hours_high': st.column_config.NumberColumn("Hours High", min_value=0.0, step=0.25),
+                                          })
+            parallel = st.checkbox("Spread draws across worker processes", value=False)
+        
+        effort = tuple((list_type, Effort(*map(float, row))) for list_type, row in
+                       zip(effort_table.index, effort_table[list(Effort._fields)].itertuples(index=False)))
+        try:
+            capacity = load_capacity(data_version, capacity_year, include_other, effort, draws, growth / 100,
+                                     sitting_hours, (os.cpu_count() or 1) if parallel else 1, volumes)
+        except ValueError as exc:
+            st.error(f"Invalid effort assumptions: {exc}")
+        else:
+            capacity_summary = capacity.summary
+            total = capacity_summary.iloc[-1]
+            by_registry = capacity_summary.iloc[:-1]
+            
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Applications", f"{total['Applications']:,.0f}")
+            
+            with col2:
+                st.metric("Hearings (P50)", f"{total['Hearings_P50']:,.0f}")
+            
+            with col3:
+                st.metric("Member FTE (P50)", f"{total['FTE_P50']:,.1f}")
+            
+            with col4:
+                st.metric("Member FTE (P90)", f"{total['FTE_P90']:,.1f}",
+                          delta=f"+{total['FTE_P90'] - total['FTE_P50']:,.1f} buffer", delta_color="off")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fte_long = by_registry.melt(id_vars='Registry', value_vars=['FTE_P50', 'FTE_P90'],
+                                            var_name='Percentile', value_name='FTE')
+                fte_long['Percentile'] = fte_long['Percentile'].str.replace('FTE_', '')
+                fig_fte = px.bar(fte_long, x='Registry', y='FTE', color='Percentile', barmode='group',
+                                 title=f"Member FTE Needed by Registry ({capacity_year} volumes {growth:+d}%)")
+                fig_fte.update_layout(height=450)
+                show_chart(fig_fte)
+            
+            with col2:
+                # Binned here so the chart ships 60 bars rather than every draw
+                counts, edges = np.histogram(capacity.total_fte, bins=60)
+                fig_total = px.bar(pd.DataFrame({'FTE': (edges[:-1] + edges[1:]) / 2, 'Draws': counts}),
+                                   x='FTE', y='Draws', title="Distribution of Total Member FTE")
+                fig_total.update_traces(width=edges[1] - edges[0])
+                fig_total.add_vline(x=total['FTE_P50'], line_dash="dash", annotation_text="P50")
+                fig_total.add_vline(x=total['FTE_P90'], line_dash="dot", annotation_text="P90")
+                fig_total.update_layout(height=450, showlegend=False)
+                show_chart(fig_total)
+            
+            st.subheader("📋 Capacity Needs by Registry")
+            st.dataframe(capacity_summary[['Registry', 'Applications', 'Hearings_P50', 'Hearings_P90', 'Hours_P50',
+                                           'Hours_P90', 'FTE_P50', 'FTE_P90']].round(1),
+                         hide_index=True, use_container_width=True)
+            st.caption(f"{draws:,} draws in {capacity.seconds * 1000:.0f} ms · the Total row is the percentile "
+                       "of summed draws, so it is less than the sum of registry P90s")
+
+elif page == "⏱️ Case Lifecycle":
+    st.header("Case Lifecycle and Timeliness")
+    
+    lifecycle_signature = (cases.extract_signature('cases'), cases.extract_signature('case_events'))
+    lifecycle_query = pinned_search()
+    lifecycle = load_lifecycle_digests(lifecycle_signature, lifecycle_query)
+    if lifecycle is not None and not show_unsuppressed:
+        lifecycle = load_protected_cells(LIFECYCLE_CELL, (lifecycle_signature, lifecycle_query), lifecycle)
+    lifecycle = load_scoped_cells(LIFECYCLE_CELL, (lifecycle_signature, lifecycle_query, show_unsuppressed), scope,
+                                  lifecycle)
+    show_pinned_search()
+    
+    if lifecycle is None:
+        st.info("💡 Lifecycle analysis needs the case-level `cases` and `case_events` extracts "
+                f"(CSV or Parquet) in `{cases.data_dir()}`.")
+    elif not lifecycle.cells:
+        st.info("💡 No case lifecycle data for the registries and lists you can access.")
+    else:
+        lifecycle_years = lifecycle.values('Year')
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            stage = st.selectbox("Select Stage:", list(STAGES))
+            year_range = st.slider("Select Lodgement Year Range", 
+                                   min_value=lifecycle_years[0], max_value=lifecycle_years[-1], 
+                                   value=(lifecycle_years[0], lifecycle_years[-1]))
+        
+        with col2:
+            group_by = st.selectbox("Break Down By:", ["Registry", "List", "Category"])
+            selected_registries = st.multiselect("Select Registries:", lifecycle.values('Registry'))
+        
+        lifecycle_filters = dict(years=range(year_range[0], year_range[1] + 1),
+                                 registries=selected_registries or None)
+        overall = lifecycle.percentiles(stage, **lifecycle_filters)
+        
+        if overall.empty:
+            st.warning("No completed stages for this selection.")
+        else:
+            overall = overall.iloc[0]
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Cases", f"{overall['Cases']:,}")
+            
+            with col2:
+                st.metric("Median (days)", f"{overall['Median']:.0f}")
+            
+            with col3:
+                st.metric("90th Percentile (days)", f"{overall['P90']:.0f}")
+            
+            with col4:
+                st.metric("99th Percentile (days)", f"{overall['P99']:.0f}")
+            
+            breakdown = lifecycle.percentiles(stage, by=group_by, **lifecycle_filters)
+            breakdown_melted = breakdown.melt(id_vars=[group_by], value_vars=['Median', 'P90', 'P99'],
+                                              var_name='Percentile', value_name='Days')
+            
+            fig_durations = px.bar(breakdown_melted, x=group_by, y='Days', color='Percentile',
+                                   title=f'{stage} - Duration Percentiles by {group_by}',
+                                   barmode='group',
+                                   color_discrete_sequence=px.colors.qualitative.Set2)
+            fig_durations.update_layout(height=450, xaxis_tickangle=-45)
+            show_chart(fig_durations)
+            
+            # Trend of percentiles by lodgement year
+            by_year = lifecycle.percentiles(stage, by='Year', **lifecycle_filters)
+            fig_trend = px.line(by_year, x='Year', y=['Median', 'P90', 'P99'],
+                                title=f'{stage} - Duration Percentiles by Lodgement Year',
+                                markers=True)
+            fig_trend.update_layout(height=400, yaxis_title='Days')
+            show_chart(fig_trend)
+            
+            st.dataframe(breakdown.set_index(group_by), use_container_width=True, height=300)
+            st.caption(f"Percentiles from merged t-digests in {breakdown.attrs['query_ms']:.1f} ms.")
+
+elif page == "🔎 Case Search":
+    st.header("Case Search")
+    
+    search_signature = cases.extract_signature('cases')
+    search_index = load_search_index(search_signature)
+    
+    if search_index is None:
+        st.info("💡 Case search needs the case-level `cases` extract with a `Description` column "
+                f"(CSV or Parquet) in `{cases.data_dir()}`.")
+    else:
+        search_query = st.text_input("Search case descriptions:", placeholder=" · ".join(SEARCH_EXAMPLES))
+        st.caption("Every word must appear. Quote a phrase (\"bond claim\"), end a word with * to match "
+                   "its prefix (repair*).")
+        
+        search_totals = load_scoped_counts(('search', search_signature, show_unsuppressed), scope,
+                                           disclosed_counts(('search', search_signature),
+                                                            load_search_totals(search_signature)))
+        
+        if not search_query.strip():
+            st.info("💡 Enter words or phrases to find matching cases, then see how they break down "
+                    "by year, registry, party and category.")
+        else:
+            search_result = scoped_search(search_index, search_signature, search_query, limit=200)
+            
+            if not search_result.matches:
+                st.warning(f"No cases match {search_query}.")
+            else:
+                search_counts = disclosed_counts(('search', search_signature, search_query, scope), search_result.counts)
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Matching Cases", f"{search_result.matches:,}")
+                
+                with col2:
+                    st.metric("Share of Cases", f"{search_result.matches / search_totals.sum() * 100:.1f}%")
+                
+                with col3:
+                    st.metric("Search Time", f"{search_result.seconds * 1000:.0f} ms")
+                
+                # Matches re-aggregated by year, against all lodgements for the share
+                search_years = pd.DataFrame({
+                    'Matches': search_counts.groupby(level='Year').sum(),
+                    'Cases': search_totals.groupby(level='Year').sum(),
+                }).fillna(0).reset_index()
+                search_years['Share (%)'] = search_years['Matches'] / search_years['Cases'] * 100
+                
+                def build_search_years():
+                    fig_search_years = px.bar(search_years, x='Year', y='Matches',
+                                              title='Matching Cases by Lodgement Year',
+                                              hover_data=['Share (%)'],
+                                              color_discrete_sequence=['#1f77b4'])
+                    fig_search_years.update_layout(height=400)
+                    return fig_search_years
+                schedule_chart(build_search_years)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    search_registries = search_counts.groupby(level='Registry').sum().nlargest(15).reset_index(name='Matches')
+                    
+                    def build_search_registries():
+                        fig_search_registries = px.bar(search_registries, x='Matches', y='Registry',
+                                                       orientation='h',
+                                                       title='Matching Cases by Registry (Top 15)',
+                                                       color='Matches', color_continuous_scale='Blues')
+                        fig_search_registries.update_layout(height=450, yaxis={'categoryorder': 'total ascending'})
+                        return fig_search_registries
+                    schedule_chart(build_search_registries)
+                
+                with col2:
+                    search_parties = search_counts.groupby(level='Party').sum().reset_index(name='Matches')
+                    
+                    def build_search_parties():
+                        fig_search_parties = px.pie(search_parties, values='Matches', names='Party',
+                                                    title='Matching Cases by Applicant Type',
+                                                    color_discrete_sequence=px.colors.qualitative.Set3)
+                        fig_search_parties.update_layout(height=450)
+                        return fig_search_parties
+                    schedule_chart(build_search_parties)
+                
+                search_categories = (search_counts.groupby(level=['Category', 'Party']).sum()
+                                     .reset_index(name='Matches'))
+                
+                def build_search_categories():
+                    fig_search_categories = px.bar(search_categories, x='Category', y='Matches', color='Party',
+                                                   title='Matching Cases by Category and Applicant Type',
+                                                   barmode='stack',
+                                                   color_discrete_sequence=px.colors.qualitative.Set2)
+                    fig_search_categories.update_layout(height=450, xaxis_tickangle=-45)
+                    return fig_search_categories
+                schedule_chart(build_search_categories)
+                draw_scheduled_charts()
+                
+                # The match set filters the case-level pages until it is cleared
+                pinned = st.checkbox("📌 Filter Case Lifecycle and Repeat Disputes by this search",
+                                     value=pinned_search() == search_query.strip())
+                if pinned:
+                    st.session_state["case_search"] = search_query.strip()
+                elif pinned_search() == search_query.strip():
+                    del st.session_state["case_search"]
+                
+                st.subheader(f"Latest Matching Cases ({len(search_result.cases):,} of {search_result.matches:,})")
+                st.dataframe(search_result.cases, use_container_width=True, height=400, hide_index=True)
+        
+        search_stats = search_index.stats()
+        st.caption(f"Index: {search_stats['cases']:,} cases · {search_stats['terms']:,} terms · "
+                   f"{search_stats['segments']:,} segments in `{search_index.directory}`.")
+
+elif page == "🧮 Pivot Explorer":
+    st.header("Pivot Explorer")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        pivot_rows = st.multiselect("Rows:", list(DIMENSIONS), default=['Registry'])
+        pivot_columns = st.multiselect("Columns:", [d for d in DIMENSIONS if d not in pivot_rows], default=['Year'])
+    
+    with col2:
+        pivot_measure = st.selectbox("Measure:", MEASURES)
+        pivot_years = st.slider("Select Year Range", 
+                                min_value=int(df_other_lists['Year'].min()), max_value=int(df_other_lists['Year'].max()), 
+                                value=(int(df_other_lists['Year'].min()), int(df_other_lists['Year'].max())))
+    
+    with col3:
+        pivot_lists = st.multiselect("Filter Lists:", list(list_frames))
+        page_size = st.selectbox("Rows per Page:", [25, 50, 100, 250], index=1)
+    
+    needed_dims = set(pivot_rows) | set(pivot_columns) | {'Year'} | ({'List'} if pivot_lists else set())
+    
+    if not pivot_rows:
+        st.info("💡 Choose at least one row dimension.")
+    elif not cube.covers(needed_dims):
+        st.warning(f"No published table breaks applications down by {', '.join(sorted(needed_dims))}. "
+                   "Try fewer dimensions.")
+    else:
+        pivot = load_pivot(tuple(pivot_rows), tuple(pivot_columns), range(pivot_years[0], pivot_years[1] + 1),
+                           tuple(pivot_lists), data_version, cube)
+        n_rows, n_cols = pivot.shape
+        column_page_size = 20
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            sort_options = [TOTAL, LABEL] + pivot.column_names()
+            sort_by = st.selectbox("Sort By:", sort_options,
+                                   format_func=lambda c: {TOTAL: 'Row Total', LABEL: 'Row Label'}.get(c, c))
+        
+        with col2:
+            sort_order = st.selectbox("Order:", ["Descending", "Ascending"],
+                                      index=1 if sort_by == LABEL else 0)
+        
+        with col3:
+            row_page = st.number_input("Row Page:", min_value=1, max_value=max(1, -(-n_rows // page_size)), value=1)
+        
+        with col4:
+            column_page = st.number_input("Column Page:", min_value=1,
+                                          max_value=max(1, -(-n_cols // column_page_size)), value=1)
+        
+        pivot_page = pivot.page(pivot_measure, sort_by=sort_by, ascending=sort_order == "Ascending",
+                                page=row_page - 1, page_size=page_size,
+                                column_page=column_page - 1, column_page_size=column_page_size)
+        
+        st.dataframe(pivot_page.round(1), use_container_width=True, height=min(35 * (len(pivot_page) + 1) + 3, 600))
+        
+        first_row = (row_page - 1) * page_size + 1
+        first_col = (column_page - 1) * column_page_size + 1
+        column_range = (f"columns {first_col:,}–{first_col + pivot_page.shape[1] - 2:,} of {n_cols:,} · "
+                        if pivot_columns else "")
+        st.caption(f"Rows {first_row:,}–{first_row + len(pivot_page) - 1:,} of {n_rows:,} · {column_range}"
+                   f"page computed in {pivot_page.attrs['compute_ms']:.1f} ms")
+        if cube.is_estimate(needed_dims):
+            st.caption(ESTIMATE_NOTE)
+
+# Every section draws its own charts; this only catches a chart scheduled outside one
+draw_scheduled_charts()
+
+# Chart payload report
+if chart_payloads:
+    with st.sidebar.expander("📦 Chart Payloads"):
+        df_payloads = pd.DataFrame(chart_payloads)
+        st.caption(f"{len(df_payloads)} charts · {df_payloads['KiB'].sum():,.1f} KiB sent this rerun")
+        st.dataframe(df_payloads.round(1), hide_index=True, use_container_width=True)
+
+# Rerun profiler (admins only)
+if rerun_profiler is not None:
+    rerun_profiler.stop()
+    del st.session_state["active_profiler"]
+    st.session_state["profile_report"] = {
+        'page': page,
+        'wall_ms': rerun_profiler.wall * 1000,
+        'report': rerun_profiler.report(page),
+        'stacks': rerun_profiler.folded_stacks(),
+    }
+
+if scope.is_admin:
+    with st.sidebar.expander("🩺 Profiler"):
+        if st.session_state.get("profile_rerun"):
+            st.caption("Armed: your next interaction on this page will be profiled.")
+        else:
+            record_memory = st.checkbox("Record allocations (slows the profiled rerun)")
+            st.button("Profile next rerun", on_click=st.session_state.update,
+                      kwargs={'profile_rerun': "next", 'profile_rerun_memory': record_memory})
+        profile = st.session_state.get("profile_report")
+        if profile:
+            st.caption(f"Last profile: {profile['page']} · {profile['wall_ms']:.0f} ms")
+            st.download_button("⬇️ Report", profile['report'], file_name="rerun_profile.txt")
+            st.download_button("⬇️ Folded stacks (flame graph)", profile['stacks'], file_name="rerun_profile.folded")
 
 # Footer
 st.markdown("---")
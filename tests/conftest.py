@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """An empty data directory used as `NCAT_DATA_DIR`."""
+    monkeypatch.setenv('NCAT_DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def write_extract(data_dir):
+    """Writes rows as the CSV extract `<data dir>/<name>.csv` (or `<name>/<part>.csv`)."""
+    def write(name, rows, part=None):
+        path = data_dir / name / f'{part}.csv' if part else data_dir / f'{name}.csv'
+        path.parent.mkdir(exist_ok=True)
+        pd.DataFrame(rows).to_csv(path, index=False)
+        return path
+    return write
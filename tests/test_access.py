@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from ncat_analytics.access import Scope, authenticate, parse_users, scope_cells, scope_counts
+from ncat_analytics.applicants import CELL as APPLICANT_CELL, ApplicantSketches
+
+
+def test_users_resolve_to_scopes():
+    users = parse_users({'kim': {'password': 'pw', 'role': 'registry_manager', 'registries': ['Sydney']}})
+    scope = authenticate(users, 'kim', 'pw')
+    assert scope.allows_registry('Sydney') and not scope.allows_registry('Penrith')
+    assert authenticate(users, 'kim', 'wrong') is None
+    assert authenticate(users, '', 'pw') is None
+
+
+def test_invalid_users_are_rejected():
+    with pytest.raises(ValueError):
+        parse_users({'kim': {'password': 'pw', 'role': 'owner'}})
+    with pytest.raises(ValueError):
+        parse_users({'kim': {'password': 'pw', 'role': 'registry_manager'}})
+
+
+def test_scope_counts_by_registry_and_list():
+    index = pd.MultiIndex.from_tuples([('Sydney', 'Private Tenancy'), ('Sydney', 'Strata'),
+                                       ('Penrith', 'Private Tenancy')], names=['Registry', 'List'])
+    counts = pd.Series([1, 2, 3], index=index)
+    scope = Scope('kim', 'registry_manager', ('Sydney',), ('Private Tenancy',))
+    assert scope_counts(counts, scope).index.tolist() == [('Sydney', 'Private Tenancy')]
+    assert scope_counts(counts, Scope('admin', 'admin', None, None)) is counts
+
+
+def test_list_scope_applies_to_applicant_sketches():
+    store = ApplicantSketches().update(pd.DataFrame({
+        'Year': [2024] * 3, 'Registry': ['Sydney'] * 3, 'List': ['Private Tenancy', 'General', 'General'],
+        'Category': ['Repairs'] * 3, 'Applicant': ['Tenant A', 'Builder B', 'Builder B']}))
+    scoped = scope_cells(store, Scope('kim', 'registry_manager', ('Sydney',), ('Private Tenancy',)), APPLICANT_CELL)
+    assert scoped.top_filers(5)['Applicant'].tolist() == ['TENANT A']
+    assert len(store.cells) == 2
+
+
+def test_scope_on_a_missing_dimension_is_refused():
+    scope = Scope('kim', 'registry_manager', ('Sydney',), ('Private Tenancy',))
+    with pytest.raises(ValueError, match='List'):
+        scope_cells(ApplicantSketches(), scope, ('Year', 'Registry', 'Category'))
+    counts = pd.Series([1], index=pd.MultiIndex.from_tuples([(2024, 'Sydney')], names=['Year', 'Registry']))
+    with pytest.raises(ValueError, match='List'):
+        scope_counts(counts, scope)
+    # A registry-only scope can still be applied
+    assert len(scope_counts(counts, Scope('kim', 'registry_manager', ('Sydney',), None))) == 1
+
+
+def test_session_without_a_scope_must_sign_in(data_dir):
+    AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+    from ncat_analytics.loadtest import APP
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets['dashboard_password'] = 'secret'
+    at.session_state['password_correct'] = True
+    at.run()
+    assert [t.label for t in at.text_input] == ['Password']
+    assert not at.get('plotly_chart')
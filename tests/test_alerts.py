@@ -0,0 +1,70 @@
+import json
+
+import pandas as pd
+import pytest
+
+import ncat_analytics as ncat
+from ncat_analytics.alerts import (
+    AlertScheduler,
+    Rule,
+    append_alert_log,
+    evaluate,
+    latest_alerts,
+    load_rules,
+    logged_versions,
+    read_alert_log,
+)
+from ncat_analytics.cube import build_cube
+
+HIT = pd.DataFrame({'Rule': ['Spike'], 'Kind': ['yoy'], 'Series': ['Repairs'], 'Year': [2024], 'Value': [300.0],
+                    'Baseline': [100.0], 'Score': [200.0], 'Threshold': [50]})
+
+
+def test_evaluations_without_alerts_are_logged(tmp_path):
+    path = str(tmp_path / 'alert_log.csv')
+    append_alert_log(HIT, 'data1', 'rules1', path=path)
+    append_alert_log(HIT.iloc[:0], 'data2', 'rules1', path=path)
+    log = read_alert_log(path)
+    assert logged_versions(log) == {('data1', 'rules1'), ('data2', 'rules1')}
+    # Alerts of a replaced data version are not shown for the new one
+    assert latest_alerts(log, 'data2', 'rules1').empty
+    alerts = latest_alerts(log, 'data1', 'rules1')
+    assert alerts['Rule'].tolist() == ['Spike']
+    assert alerts['Year'].dtype == 'int64'
+
+
+def test_unevaluated_versions_have_no_alerts(tmp_path):
+    log = read_alert_log(str(tmp_path / 'missing.csv'))
+    assert latest_alerts(log, 'data1', 'rules1').empty
+    assert logged_versions(log) == set()
+
+
+def test_rules_fire_on_the_published_data():
+    cube = build_cube(ncat.published_data())
+    rules = [Rule('Spike', 'yoy', ('Category',), 50, min_value=100),
+             Rule('Quiet', 'zscore', ('Registry', 'List'), 1000, min_value=200)]
+    alerts = evaluate(cube, rules, year=2024)
+    assert set(alerts['Rule']) == {'Spike'}
+    assert (alerts['Score'].abs() >= 50).all()
+    assert (alerts['Score'].abs() / alerts['Threshold']).is_monotonic_decreasing
+
+
+def test_invalid_rules_are_rejected(tmp_path):
+    path = tmp_path / 'alert_rules.json'
+    path.write_text(json.dumps([{'name': 'Odd', 'kind': 'median', 'dims': ['List'], 'threshold': 1}]))
+    with pytest.raises(ValueError, match='unknown kind'):
+        load_rules(str(path))
+
+
+def test_scheduler_evaluates_each_version_once(tmp_path):
+    log = str(tmp_path / 'alert_log.csv')
+    rules = str(tmp_path / 'alert_rules.json')
+    scheduler = AlertScheduler(ncat.published_data, rules_file=rules, log_file=log)
+    assert scheduler.check() and scheduler.last_error is None
+    assert not scheduler.check()
+    evaluations = len(logged_versions(read_alert_log(log)))
+    # A restarted scheduler finds the versions in the log and does not append again
+    restarted = AlertScheduler(ncat.published_data, rules_file=rules, log_file=log)
+    size = len(read_alert_log(log))
+    assert restarted.check()
+    assert len(read_alert_log(log)) == size and evaluations == 1
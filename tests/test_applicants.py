@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from ncat_analytics.applicants import ApplicantSketches, normalize_applicants
+
+
+def test_spelling_variants_count_once():
+    names = normalize_applicants(pd.Series(['Ray White  Agents', 'ray white agents ', 'RAY WHITE\tAGENTS']))
+    assert names.nunique() == 1
+
+
+def test_slices_merge_cell_sketches(write_extract):
+    rows = [{'Lodged': f'{year}-03-01', 'Registry': registry, 'List': 'Private Tenancy',
+             'Category': 'Rental Bonds', 'Applicant': applicant}
+            for year in (2023, 2024) for registry in ('Sydney', 'Penrith')
+            for applicant in ['Agent A'] * 30 + [f'Tenant {i}' for i in range(20)]]
+    write_extract('cases', rows)
+    store = ApplicantSketches.from_extract(chunksize=37)
+    overall = store.summary().iloc[0]
+    assert overall['Filings'] == 200
+    assert overall['Distinct_Applicants'] == pytest.approx(21, abs=1)
+    assert store.top_filers(1)['Applicant'].tolist() == ['AGENT A']
+    sydney = store.summary(by='Registry', years=[2024], registries=['Sydney']).iloc[0]
+    assert (sydney['Registry'], sydney['Filings']) == ('Sydney', 50)
+    assert sydney['Top_10_Share_%'] == pytest.approx(39 / 50 * 100)
+
+
+def test_store_round_trips(tmp_path):
+    store = ApplicantSketches().update(pd.DataFrame({'Year': [2024, 2024], 'Registry': ['Sydney', 'Sydney'],
+                                                     'List': ['General', 'General'],
+                                                     'Category': ['Repairs', 'Repairs'],
+                                                     'Applicant': ['A', 'B']}))
+    store.save(tmp_path / 'sketches.pkl')
+    loaded = ApplicantSketches.load(tmp_path / 'sketches.pkl')
+    assert loaded.summary().iloc[0]['Filings'] == 2
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ncat_analytics.cache import DiskCache, fingerprint
+
+
+def test_arrays_are_hashed_by_content():
+    a = np.arange(1600.0).reshape(40, 40)
+    b = a.copy()
+    b[20, 20] += 1
+    assert fingerprint(a) != fingerprint(b)
+    assert fingerprint(a) == fingerprint(a.copy())
+    assert fingerprint(a) != fingerprint(a.reshape(20, 80))
+
+
+def test_indexes_and_frames_are_hashed_by_content():
+    index = pd.Index(range(2000))
+    assert fingerprint(index) != fingerprint(index.delete(1000).append(pd.Index([5000])))
+    df = pd.DataFrame({'x': range(5000)})
+    changed = df.copy()
+    changed.loc[2500, 'x'] = -1
+    assert fingerprint(df) != fingerprint(changed)
+
+
+def test_unknown_types_are_not_fingerprinted():
+    with pytest.raises(TypeError):
+        fingerprint(object())
+
+
+def test_disk_cache_round_trip_and_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10_000)
+    calls = []
+    for _ in range(2):
+        assert cache.get_or_compute('ns', (1, 'a'), lambda: calls.append(1) or 'value') == 'value'
+    assert calls == [1] and cache.hits == 1
+    for i in range(20):
+        cache.set(cache.key('big', i), b'x' * 2_000)
+    assert cache._scan()[1] <= 10_000
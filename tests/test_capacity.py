@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ncat_analytics.capacity import OTHER, Effort, registry_volumes, simulate
+from ncat_analytics.data import published_data
+
+
+def _volumes():
+    return pd.DataFrame({'Private Tenancy': [400.0, 100.0], 'General': [50.0, 0.0]},
+                        index=pd.Index(['Sydney', 'Newcastle'], name='Registry'))
+
+
+def test_registry_volumes_add_the_uncovered_total_as_other():
+    data = published_data()
+    volumes = registry_volumes(data, 2024)
+    assert OTHER in volumes.columns
+    assert (volumes >= 0).all().all()
+    without = registry_volumes(data, 2024, include_other=False)
+    assert OTHER not in without.columns
+    pd.testing.assert_frame_equal(volumes[without.columns].loc[without.index], without, check_dtype=False)
+
+
+def test_simulation_is_the_same_with_or_without_the_pool():
+    serial = simulate(_volumes(), draws=4000, seed=7, chunk_draws=1000)
+    pooled = simulate(_volumes(), draws=4000, seed=7, chunk_draws=1000, max_workers=2)
+    pd.testing.assert_frame_equal(serial.summary, pooled.summary)
+    np.testing.assert_array_equal(serial.total_fte, pooled.total_fte)
+
+
+def test_total_is_a_percentile_of_the_summed_draws():
+    result = simulate(_volumes(), draws=2000, seed=1)
+    summary = result.summary.set_index('Registry')
+    assert list(summary.index) == ['Sydney', 'Newcastle', 'Total']
+    assert summary.loc['Total', 'FTE_P90'] == pytest.approx(np.percentile(result.total_fte, 90))
+    # Percentiles do not add up across registries, means do
+    assert summary.loc['Total', 'Hours_Mean'] == pytest.approx(summary.drop('Total')['Hours_Mean'].sum())
+
+
+def test_fixed_effort_and_growth_scale_the_hours():
+    effort = {'Private Tenancy': Effort(1, 0, 2, 2, 2), 'General': Effort(1, 0, 2, 2, 2)}
+    base = simulate(_volumes(), effort, draws=4000, seed=3).summary.set_index('Registry')
+    grown = simulate(_volumes(), effort, draws=4000, growth=0.5, seed=3).summary.set_index('Registry')
+    assert base.loc['Total', 'Hours_Mean'] == pytest.approx(2 * 550, rel=0.02)
+    assert grown.loc['Total', 'Applications'] == 1.5 * 550
+    assert grown.loc['Total', 'Hours_Mean'] == pytest.approx(1.5 * base.loc['Total', 'Hours_Mean'], rel=0.02)
+
+
+def test_invalid_effort_is_rejected():
+    with pytest.raises(ValueError, match='low <= mode <= high'):
+        simulate(_volumes(), {'General': Effort(1, 0, 3, 2, 1)}, draws=10)
@@ -0,0 +1,67 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from ncat_analytics.charts import FigureScheduler, _compact, lttb_indices, optimize_figure, payload_bytes
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(10_000)
+    y = np.sin(x / 500)
+    y[4321] = 50.0
+    keep = lttb_indices(x, y, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4321 in keep
+
+
+@pytest.mark.parametrize('n_out', [2, 10, 20])
+def test_lttb_returns_everything_when_nothing_to_drop(n_out):
+    assert lttb_indices(np.arange(10), np.arange(10), n_out).tolist() == list(range(10))
+
+
+def test_compact_picks_the_narrowest_exact_dtype():
+    assert _compact(np.array([1.0, 2.0, 120.0])).dtype == np.int8
+    assert _compact(np.array([1, 40_000])).dtype == np.int32
+    assert _compact(np.array([0.5, 1.0])).dtype == np.float64
+    assert _compact(np.array([1.0, np.nan])).dtype == np.float64
+    assert _compact(['a', 'b']) == ['a', 'b']
+
+
+def test_optimize_figure_downsamples_long_lines_into_webgl():
+    dates = pd.date_range('2015-01-01', periods=5_000, freq='D')
+    fig = go.Figure(go.Scatter(x=dates, y=np.arange(5_000) % 97, mode='lines'))
+    optimized = optimize_figure(fig, max_points=500)
+    trace = optimized.data[0]
+    assert trace.type == 'scattergl'
+    assert len(trace.x) == 500 and trace.x[0] == dates[0] and trace.x[-1] == dates[-1]
+    assert payload_bytes(optimized) < payload_bytes(fig) / 5
+
+
+def test_optimize_figure_leaves_stacked_areas_whole():
+    fig = go.Figure(go.Scatter(x=np.arange(3_000), y=np.ones(3_000), stackgroup='one'))
+    trace = optimize_figure(fig, max_points=500).data[0]
+    assert trace.type == 'scatter' and len(trace.y) == 3_000
+
+
+def test_scheduled_figures_complete_independently():
+    scheduler = FigureScheduler(max_workers=2)
+    release = threading.Event()
+
+    def slow():
+        release.wait(10)
+        return go.Figure(go.Bar(x=['a'], y=[1]))
+
+    slow_future = scheduler.submit(slow)
+    fast_future = scheduler.submit(lambda: go.Figure(go.Scatter(x=np.arange(5000), y=np.arange(5000))))
+    # A section can draw its fast chart while another chart is still building
+    built = fast_future.result(timeout=10)
+    assert not slow_future.done()
+    assert built.figure.data[0].type == 'scattergl'
+    assert built.payload_bytes == payload_bytes(built.figure)
+    release.set()
+    assert slow_future.result(timeout=10).figure.data[0].type == 'bar'
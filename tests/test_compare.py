@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ncat_analytics as ncat
+from ncat_analytics.compare import PeriodComparator, compare_frames, consecutive_changes, period_label, period_years
+from ncat_analytics.cube import build_cube
+
+FACTS = pd.DataFrame({'Year': [2022, 2022, 2023, 2023, 2024, 2024],
+                      'Registry': ['Sydney', 'Penrith'] * 3,
+                      'Applications': [100, 50, 110, 40, 130, 50]})
+
+
+def test_periods():
+    assert period_years((2022, 2024)) == [2022, 2023, 2024]
+    assert period_years([2024, 2022]) == [2022, 2024]
+    assert period_label((2022, 2024)) == '2022-2024'
+    assert period_label(2024) == '2024'
+
+
+def test_compare_frames_change_and_contribution():
+    out = compare_frames(FACTS, 2022, 2024, dims=['Registry'])
+    assert out.loc['Sydney', ['Base', 'Target', 'Change', 'Change_%']].tolist() == [100, 130, 30, 30.0]
+    assert out['Contribution_%'].tolist() == pytest.approx([0.0, 100.0])
+
+
+def test_compare_frames_averages_ranges_of_different_length():
+    out = compare_frames(FACTS, (2022, 2023), 2024, agg='mean')
+    assert out.loc['All', 'Base'] == 150
+    assert out.loc['All', 'Target'] == 180
+
+
+def test_consecutive_changes_within_groups():
+    out = consecutive_changes(FACTS.iloc[::-1], dims=['Registry'])
+    penrith = out[out['Registry'] == 'Penrith']
+    assert penrith['Year'].tolist() == [2022, 2023, 2024]
+    assert np.isnan(penrith['Change_%'].iloc[0])
+    assert penrith['Change'].tolist()[1:] == [-10, 10]
+
+
+def test_comparator_matches_the_source_table_and_memoises():
+    data = ncat.published_data()
+    comparator = PeriodComparator(build_cube(data))
+    out = comparator.compare(2022, 2024, dims=('Registry',), List='Social Housing')
+    table = data.df_social_housing.set_index('Year')
+    expected = table.loc[2024] - table.loc[2022]
+    pd.testing.assert_series_equal(out['Change'], expected.astype(out['Change'].dtype), check_names=False)
+    out.loc[:, 'Change'] = 0
+    assert comparator.compare(2022, 2024, dims=('Registry',), List='Social Housing')['Change'].ne(0).any()
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from ncat_analytics.correlation import annual_series, lag_profile, lead_lag
+from ncat_analytics.data import published_data
+from ncat_analytics.metrics import FULL_YEARS
+
+
+def test_annual_series_cover_full_years_only():
+    series = annual_series(published_data())
+    assert list(series.columns) == list(range(FULL_YEARS[0], FULL_YEARS[1] + 1))
+    assert series.index.names == ['List', 'Registry']
+
+
+def test_lead_lag_finds_a_shifted_series():
+    rng = np.random.default_rng(0)
+    leader = rng.normal(100, 10, 60).cumsum()
+    follower = np.roll(leader, 2)
+    follower[:2] = leader[0]
+    index = pd.MultiIndex.from_tuples([('A', 'Sydney'), ('B', 'Sydney'), ('C', 'Sydney')], names=['List', 'Registry'])
+    series = pd.DataFrame([leader, follower, rng.normal(0, 1, 60)], index=index)
+    result = lead_lag(series, max_lag=3)
+    assert result.best_lag[0, 1] == 2 and result.best_lag[1, 0] == -2
+    assert result.best[0, 1] > 0.9
+    profile = lag_profile(series, ('A', 'Sydney'), ('B', 'Sydney'), max_lag=3)
+    assert profile.idxmax() == 2
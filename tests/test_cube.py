@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+import ncat_analytics as ncat
+from ncat_analytics.cube import build_cube
+
+
+@pytest.fixture(scope='module')
+def data():
+    return ncat.published_data()
+
+
+@pytest.fixture(scope='module')
+def cube(data):
+    return build_cube(data)
+
+
+def test_every_rollup_matches_the_source_table(cube, data):
+    by_registry = cube.query(['Year', 'Registry'], List='Social Housing').set_index(['Year', 'Registry'])
+    expected = data.df_social_housing.set_index('Year').stack().rename_axis(['Year', 'Registry'])
+    pd.testing.assert_series_equal(by_registry['Applications'], expected.sort_index(),
+                                   check_names=False, check_dtype=False)
+
+
+def test_routes_to_the_most_specific_published_source(cube):
+    assert cube._route(('Year', 'Registry')) == 'registry_totals'
+    assert cube._route(('Year', 'Registry', 'List')) == 'registry_lists'
+    assert cube._route(('Year', 'List', 'Party')) == 'parties'
+    assert not cube.is_estimate(['Year', 'Party'])
+
+
+def test_party_per_registry_is_an_explicit_estimate(cube, data):
+    split = cube.query(['Registry', 'Party'], Year=2024)
+    assert cube.is_estimate(['Registry', 'Party'])
+    # The estimate apportions each registry's private tenancy volume, so registry totals are kept
+    totals = split.groupby('Registry')['Applications'].sum()
+    published = data.df_geo.set_index('Year').loc[2024]
+    pd.testing.assert_series_equal(totals, published.astype(float), check_names=False)
+
+
+def test_empty_query_is_the_grand_total(cube, data):
+    lists = data.df_other_lists.drop(columns='Year')
+    assert cube.query([]) == lists.sum().sum()
+    assert cube.query([], Year=2024) == lists[data.df_other_lists['Year'] == 2024].sum().sum()
+
+
+def test_uncovered_source_raises(cube):
+    with pytest.raises(KeyError):
+        cube.query(['Registry', 'Party'], source='registry_lists')
+
+
+def test_drill_goes_one_level_down(cube):
+    assert set(cube.drill(Registry='Sydney', Year=2024).columns) == {'Year', 'List', 'Applications'}
+    assert set(cube.drill(Registry='Sydney', List='Private Tenancy', Year=2024).columns) == \
+        {'Year', 'Category', 'Applications'}
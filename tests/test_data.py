@@ -0,0 +1,53 @@
+import time
+
+import pandas as pd
+
+import ncat_analytics.data as data_module
+from ncat_analytics.data import load_sources, published_data, table_signature
+
+
+def test_extract_replaces_its_table(write_extract):
+    published = published_data().df_tenancy
+    write_extract('tables/tenancy', published.assign(Total_Applications=published['Total_Applications'] + 1))
+    loaded = load_sources()
+    assert (loaded.data.df_tenancy['Total_Applications'] == published['Total_Applications'] + 1).all()
+    sources = loaded.sources.set_index('Table')
+    assert sources.loc['tenancy', ['Source', 'Status', 'Rows']].tolist() == ['tables/tenancy', 'ok', len(published)]
+    assert sources.loc['categories', 'Source'] == 'published'
+    pd.testing.assert_frame_equal(loaded.data.df_categories, published_data().df_categories)
+
+
+def test_bad_extract_falls_back_to_the_published_table(write_extract):
+    write_extract('tables/total_ccd', {'Year': [2024], 'Sydney': ['many']})
+    write_extract('tables/parties', {'Landlord': [1]})
+    loaded = load_sources(processes=True)
+    sources = loaded.sources.set_index('Table')
+    assert sources.loc['total_ccd', 'Status'] == 'failed'
+    assert 'non-numeric values in Sydney' in sources.loc['total_ccd', 'Error']
+    assert 'missing columns Year' in sources.loc['parties', 'Error']
+    pd.testing.assert_frame_equal(loaded.data.df_total_ccd, published_data().df_total_ccd)
+
+
+def test_extracts_are_read_concurrently_within_the_timeout(write_extract, monkeypatch):
+    for field in ('tenancy', 'categories', 'parties'):
+        write_extract(f'tables/{field}', getattr(published_data(), f'df_{field}'))
+    read = data_module._read_extract
+
+    def slow_read(name, directory):
+        time.sleep(2.5 if name == 'tables/parties' else 0.3)
+        return read(name, directory)
+
+    monkeypatch.setattr(data_module, '_read_extract', slow_read)
+    start = time.perf_counter()
+    loaded = load_sources(max_workers=3, timeout=1.5)
+    # Reads overlap, and the slow one is dropped at the timeout instead of awaited
+    assert time.perf_counter() - start < 3
+    status = loaded.sources.set_index('Table')['Status']
+    assert status[['tenancy', 'categories']].tolist() == ['ok', 'ok']
+    assert status['parties'] == 'timed out'
+
+
+def test_table_signature_changes_with_an_extract(write_extract):
+    before = table_signature()
+    write_extract('tables/tenancy', published_data().df_tenancy)
+    assert table_signature() != before
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from ncat_analytics.digest import TDigest
+
+
+def test_tdigest_merge_matches_quantiles_of_combined_data():
+    rng = np.random.default_rng(1)
+    values = rng.exponential(30, 100_000)
+    merged = TDigest()
+    for chunk in np.array_split(values, 10):
+        merged.merge(TDigest().add(chunk))
+    assert merged.count == len(values)
+    expected = np.quantile(values, [0.5, 0.9, 0.99])
+    np.testing.assert_allclose(merged.quantile([0.5, 0.9, 0.99]), expected, rtol=0.02)
+
+
+def test_tdigest_ignores_nan_and_empty_is_nan():
+    assert np.isnan(TDigest().quantile(0.5))
+    assert TDigest().add([1.0, np.nan, 3.0]).count == 2
+
+
+@pytest.mark.parametrize('q', [0.01, 0.5, 0.9, 0.99, 0.999])
+def test_tdigest_quantile_rank_error_is_small(q):
+    rng = np.random.default_rng(2)
+    values = rng.lognormal(3, 1, 200_000)
+    estimate = TDigest().add(values).quantile(q)
+    # Rank error, which the scale function keeps smallest at the tails
+    assert abs((values < estimate).mean() - q) <= 0.01 * min(q, 1 - q) + 0.001
+
+
+def test_tdigest_stays_small_and_keeps_extremes():
+    values = np.random.default_rng(3).normal(0, 1, 100_000)
+    digest = TDigest(compression=100).add(values)
+    assert len(digest.means) <= 100
+    assert digest.quantile(0.0) == values.min()
+    assert digest.quantile(1.0) == values.max()
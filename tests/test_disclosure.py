@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from ncat_analytics.data import published_data
+from ncat_analytics.digest import TDigest
+from ncat_analytics.disclosure import protect_cells, protect_counts, protect_dataset, suppress
+from ncat_analytics.lifecycle import CELL as LIFECYCLE_CELL, STAGES, LifecycleDigests
+from ncat_analytics.metrics import specialization
+
+STAGE = list(STAGES)[-1]
+
+
+def _recoverable(values, hidden):
+    """Returns whether any hidden cell is the only hidden cell of a row or column."""
+    return any(((hidden.sum(axis=axis) == 1) & hidden.any(axis=axis)).any() for axis in range(values.ndim))
+
+
+def test_small_counts_are_primary_and_get_complements():
+    values = np.array([[3, 40, 50],
+                       [60, 70, 80],
+                       [90, 100, 110]], dtype=float)
+    primary, complementary = suppress(values, threshold=5)
+    assert primary.sum() == 1 and primary[0, 0]
+    hidden = primary | complementary
+    assert not _recoverable(values, hidden)
+    # The smallest cells are picked as complements
+    assert complementary[0, 1] and complementary[1, 0]
+
+
+def test_hidden_group_totals_exceed_threshold():
+    values = np.array([[2, 2, 50],
+                       [40, 60, 80]], dtype=float)
+    primary, complementary = suppress(values, threshold=5)
+    hidden = primary | complementary
+    assert (np.where(hidden, values, 0).sum(axis=1)[hidden.any(axis=1)] > 5).all()
+
+
+def test_nan_cells_are_never_hidden():
+    values = np.array([[3, np.nan, 50],
+                       [60, 70, 80]], dtype=float)
+    primary, complementary = suppress(values, threshold=5)
+    assert not (primary | complementary)[0, 1]
+    assert not _recoverable(values, primary | complementary)
+
+
+def test_nothing_hidden_without_small_counts():
+    primary, complementary = suppress(np.array([[0, 40], [60, 70]], dtype=float), threshold=5)
+    assert not primary.any() and not complementary.any()
+
+
+def test_specialization_keeps_suppressed_counts_missing():
+    frames = {'General': pd.DataFrame({'Year': [2024], 'Sydney': [30.0], 'Penrith': [float('nan')]}),
+              'Strata Schemes': pd.DataFrame({'Year': [2024], 'Sydney': [10.0], 'Penrith': [10.0]})}
+    out = specialization(frames, 2024).set_index(['List_Type', 'Registry'])['Percentage_of_Type']
+    assert out[('General', 'Sydney')] == 100.0
+    assert pd.isna(out[('General', 'Penrith')])
+    assert out[('Strata Schemes', 'Penrith')] == 50.0
+
+
+def test_protect_counts_matches_the_dense_array():
+    values = np.array([[[3, 40], [60, 70]],
+                       [[90, np.nan], [2, 110]]], dtype=float)
+    primary, complementary = suppress(values, threshold=5)
+    cells = np.argwhere(np.isfinite(values))
+    counts = pd.Series(values[np.isfinite(values)],
+                       index=pd.MultiIndex.from_arrays(cells.T, names=['Year', 'Registry', 'Party']))
+    # Row order does not matter
+    protected = protect_counts(counts.iloc[::-1], threshold=5)
+    expected = (primary | complementary)[tuple(np.array(protected.index.tolist()).T)]
+    np.testing.assert_array_equal(protected.isna().to_numpy(), expected)
+    assert protected.isna().sum() >= 4
+
+
+def test_protect_cells_drops_suppressed_cells():
+    store = LifecycleDigests()
+    sizes = {('Sydney', 'Repairs'): 3, ('Sydney', 'Bonds'): 40, ('Sydney', 'Rent'): 45,
+             ('Penrith', 'Repairs'): 50, ('Penrith', 'Bonds'): 60, ('Penrith', 'Rent'): 70}
+    for (registry, category), size in sizes.items():
+        store.cells[(2024, registry, 'General', category, STAGE)] = TDigest().add(np.arange(size, dtype=float))
+    protected = protect_cells(store, store.counts(), threshold=5, levels=LIFECYCLE_CELL)
+    assert sorted(key[1:4] for key in protected.cells) == [('Penrith', 'General', 'Rent'), ('Sydney', 'General', 'Rent')]
+    assert protected.percentiles(STAGE)['Cases'].sum() == 115
+    assert len(store.cells) == 6
+
+
+def test_party_category_totals_are_hidden_with_the_category_volumes():
+    data = published_data()
+    # Hides most Repairs volumes (300s-400s) in the category table
+    protected = protect_dataset(data, threshold=400).data
+    categories = protected.df_categories.set_index('Year')
+    parties = protected.df_party_categories
+    repairs = parties[parties['Category'] == 'Repairs'].set_index('Year')['Total']
+    hidden_years = categories.index[categories['Repairs'].isna()].intersection(repairs.index)
+    assert len(hidden_years)
+    assert repairs[hidden_years].isna().all()
+    # Shown totals are still the category volumes
+    shown = repairs.dropna()
+    assert (shown == categories.loc[shown.index, 'Repairs']).all()
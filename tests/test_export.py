@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip('streamlit')
+
+from ncat_analytics.export import _slug, markdown_html, render_view
+
+
+def test_markdown_html_covers_the_dashboard_markdown():
+    html = markdown_html('### Key Insights\n- **Peak** in `2022`\n- *down* 6% <now>\n---\nDone')
+    assert html.splitlines() == ['<h3>Key Insights</h3>', '<ul>',
+                                 '<li><strong>Peak</strong> in <code>2022</code></li>',
+                                 '<li><em>down</em> 6% &lt;now&gt;</li>', '</ul>', '<hr>', '<p>Done</p>']
+
+
+def test_slugs_are_file_names():
+    assert _slug('🏠 Overview') == 'overview'
+    assert _slug('Geographic Distribution - Individual List Types') == 'geographic-distribution-individual-list-types'
+    assert _slug('🔎') == 'view'
+
+
+def test_rendered_view_embeds_its_figures(data_dir):
+    view = render_view({'name': 'Overview', 'page': '🏠 Overview'})
+    assert view['errors'] == []
+    assert view['figures'] and view['metrics']
+    assert view['body'].count('class="chart"') == len(view['figures'])
@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+
+from ncat_analytics.geo import LEVELS, RegistryShapes, geojson_signature, simplify
+
+
+def _circle(n, radius=1.0, centre=(151.0, -33.0)):
+    angles = np.linspace(0, 2 * np.pi, n)
+    ring = np.column_stack([centre[0] + radius * np.cos(angles), centre[1] + radius * np.sin(angles)])
+    ring[-1] = ring[0]
+    return ring
+
+
+def _write(path, features):
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': features}))
+    return path
+
+
+def test_simplify_keeps_end_points_and_drops_flat_points():
+    line = np.column_stack([np.linspace(0, 10, 101), np.zeros(101)])
+    line[50, 1] = 1.0
+    simplified = simplify(line, tolerance=0.01)
+    np.testing.assert_array_equal(simplified[[0, -1]], line[[0, -1]])
+    # The spike and the points either side of it are all that is left of the interior
+    np.testing.assert_allclose(simplified, [[0, 0], [4.9, 0], [5, 1], [5.1, 0], [10, 0]])
+
+
+def test_coarser_levels_keep_fewer_vertices(tmp_path):
+    path = _write(tmp_path / 'registries.geojson', [
+        {'type': 'Feature', 'properties': {'Registry': 'Sydney'},
+         'geometry': {'type': 'Polygon', 'coordinates': [_circle(2000).tolist()]}},
+        {'type': 'Feature', 'properties': {'Registry': 'Penrith'},
+         'geometry': {'type': 'MultiPolygon', 'coordinates': [[_circle(500, 0.2, (150.7, -33.7)).tolist()],
+                                                               [_circle(50, 0.01, (150.6, -33.6)).tolist()]]}},
+        {'type': 'Feature', 'properties': {'Registry': 'Tamworth'},
+         'geometry': {'type': 'Point', 'coordinates': [150.9, -31.1]}},
+    ])
+    shapes = RegistryShapes.from_geojson(path)
+    assert shapes.names == ['Sydney', 'Penrith']
+    assert shapes.points == {'Tamworth': (150.9, -31.1)}
+    np.testing.assert_allclose(shapes.centroids['Sydney'], (151.0, -33.0), atol=1e-6)
+    vertices = [shapes.vertices(level) for level in LEVELS]
+    assert vertices == sorted(vertices)
+    assert vertices[-1] < shapes.source_vertices == 2550
+    # Every ring stays closed and within the tolerance of the source
+    features = shapes.geojson('State')['features']
+    sydney = np.array(features[0]['geometry']['coordinates'][0][0])
+    np.testing.assert_array_equal(sydney[0], sydney[-1])
+    radius = np.hypot(sydney[:, 0] - 151.0, sydney[:, 1] - (-33.0))
+    assert np.all(np.abs(radius - 1.0) <= LEVELS['State'][0] + 1e-3)
+
+
+def test_geojson_decodes_the_selected_registries(tmp_path):
+    square = [[150.0, -33.0], [150.5, -33.0], [150.5, -33.5], [150.0, -33.5], [150.0, -33.0]]
+    path = _write(tmp_path / 'registries.geojson', [
+        {'type': 'Feature', 'properties': {'Registry': 'Sydney'},
+         'geometry': {'type': 'Polygon', 'coordinates': [square]}},
+        {'type': 'Feature', 'properties': {'Registry': 'Newcastle'},
+         'geometry': {'type': 'Polygon', 'coordinates': [[[x, y + 1] for x, y in square]]}},
+        {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Polygon', 'coordinates': [square]}},
+    ])
+    shapes = RegistryShapes.from_geojson(path)
+    collection = shapes.geojson('Local', registries=['Newcastle'])
+    assert [f['properties']['Registry'] for f in collection['features']] == ['Newcastle']
+    assert collection['features'][0]['geometry'] == {
+        'type': 'MultiPolygon', 'coordinates': [[[[x, y + 1] for x, y in square]]]}
+    assert set(shapes.nbytes) == set(LEVELS)
+
+
+def test_signature_is_empty_without_a_file(tmp_path):
+    assert geojson_signature(str(tmp_path / 'missing.geojson')) == ()
+    path = _write(tmp_path / 'registries.geojson', [])
+    assert geojson_signature(str(path))[0][0] == str(path)
@@ -0,0 +1,32 @@
+from ncat_analytics.lifecycle import LifecycleDigests
+
+
+def test_stage_percentiles_and_case_filter(write_extract):
+    write_extract('cases', {'Case_ID': ['C1', 'C2', 'C3'], 'Lodged': ['2024-01-01'] * 3,
+                            'Registry': ['Sydney', 'Sydney', 'Penrith'], 'List': ['Private Tenancy'] * 3,
+                            'Category': ['Repairs'] * 3})
+    write_extract('case_events', {
+        'Case_ID': ['C1', 'C1', 'C2', 'C2', 'C3'],
+        'Event': ['Lodged', 'Final Order', 'Lodged', 'Final Order', 'Lodged'],
+        'Date': ['2024-01-01', '2024-01-11', '2024-01-01', '2024-01-31', '2024-01-01'],
+    })
+    stage = 'Lodgement → Final Order'
+    overall = LifecycleDigests.from_extract(chunksize=2).percentiles(stage)
+    assert overall['Cases'].iloc[0] == 2
+    filtered = LifecycleDigests.from_extract(case_ids=['C2']).percentiles(stage, by='Registry')
+    assert filtered[['Registry', 'Cases', 'Median']].values.tolist() == [['Sydney', 1, 30.0]]
+
+
+def test_events_after_the_final_order_are_not_lost(write_extract):
+    write_extract('cases', {'Case_ID': ['C1'], 'Lodged': ['2024-01-01'], 'Registry': ['Sydney'],
+                            'List': ['Private Tenancy'], 'Category': ['Repairs']})
+    # The final order is in the first file; the first hearing and a corrected order arrive a month later
+    write_extract('case_events', {'Case_ID': ['C1', 'C1'], 'Event': ['Lodged', 'Final Order'],
+                                  'Date': ['2024-01-01', '2024-03-01']}, part='2024-03')
+    write_extract('case_events', {'Case_ID': ['C1', 'C1'], 'Event': ['First Hearing', 'Final Order'],
+                                  'Date': ['2024-02-01', '2024-03-05']}, part='2024-04')
+    digests = LifecycleDigests.from_extract(chunksize=1)
+    medians = {stage: digests.percentiles(stage)[['Cases', 'Median']].values.tolist()
+               for stage in ('Lodgement → First Hearing', 'First Hearing → Final Order', 'Lodgement → Final Order')}
+    assert medians == {'Lodgement → First Hearing': [[1, 31.0]], 'First Hearing → Final Order': [[1, 29.0]],
+                       'Lodgement → Final Order': [[1, 60.0]]}
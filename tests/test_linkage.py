@@ -0,0 +1,41 @@
+from ncat_analytics.linkage import FIRST, PropertyLinks, parse_addresses, repeat_rates
+
+
+def _cases(addresses):
+    n = len(addresses)
+    return {
+        'Case_ID': [f'C{i}' for i in range(n)],
+        'Lodged': [f'2024-{i + 1:02d}-01' for i in range(n)],
+        'Registry': ['Sydney'] * n, 'List': ['Private Tenancy'] * n, 'Category': ['Repairs'] * n,
+        'Party': ['Tenant'] * n, 'Applicant': [f'A{i}' for i in range(n)], 'Address': addresses,
+    }
+
+
+def test_parse_addresses_normalises_unit_and_street_spellings():
+    keys = parse_addresses(['Unit 3, 12 King Street Newtown NSW 2042', '3/12 KING ST, NEWTOWN'])['Key']
+    assert keys[0] == keys[1]
+
+
+def test_spelling_variants_link_to_one_property(write_extract):
+    write_extract('cases', _cases(['3/12 King St Newtown', 'Unit 3 12 King Street Newtown NSW 2042',
+                                   '3/12 Kingg Street Newtown', '5 Queen St Newtown']))
+    links = PropertyLinks.from_extract()
+    assert links.stats['properties'] == 2
+    assert links.cases.groupby('Property').size().sort_values().tolist() == [1, 3]
+
+
+def test_blank_and_unparseable_addresses_are_never_repeats(write_extract):
+    write_extract('cases', _cases([None, None, 'unknown', None, '3/12 King St Newtown', '3/12 King Street Newtown']))
+    links = PropertyLinks.from_extract()
+    assert links.stats['unlinked'] == 4
+    counts = links.dispute_counts(repeat_days=365)
+    rates = repeat_rates(counts)
+    assert rates.loc['Repairs', 'Repeat'] == 1
+    assert (links.addresses.loc[links.addresses['Address'].isin(['', 'unknown']), 'Property'] == -1).all()
+
+
+def test_dispute_counts_filtered_to_case_ids_keep_prior_context(write_extract):
+    write_extract('cases', _cases(['3/12 King St Newtown', '3/12 King St Newtown']))
+    counts = PropertyLinks.from_extract().dispute_counts(repeat_days=365, case_ids=['C1'])
+    assert counts.sum() == 1
+    assert counts.index.get_level_values('Prior')[0] != FIRST
@@ -0,0 +1,13 @@
+import pytest
+
+pytest.importorskip('streamlit')
+
+from ncat_analytics.loadtest import SCRIPTS, format_report, load_test
+
+
+def test_one_session_replays_its_script_without_errors(data_dir):
+    report = load_test(sessions=1, scripts=['executive'])
+    assert report['errors'] == 0, report['error_samples']
+    assert report['reruns'] == len(SCRIPTS['executive'])
+    assert report['p50_ms'] <= report['p95_ms'] <= report['p99_ms']
+    assert 'errors 0' in format_report(report)
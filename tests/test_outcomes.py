@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from ncat_analytics.outcomes import OUTCOMES, PENDING, merge_join, outcome_counts, outcome_rates
+
+
+def _chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_merge_join_matches_in_memory_join_across_chunk_boundaries():
+    cases = pd.DataFrame({'Case_ID': [f'C{i:03d}' for i in range(20)]})
+    orders = pd.DataFrame({
+        'Case_ID': ['C001', 'C001', 'C004', 'C009', 'C010', 'C019'],
+        'Outcome': ['Dismissed', 'Orders made', 'Withdrawn', 'Conciliated', 'Orders made', 'Dismissed'],
+        'Decided': ['2024-01-01', '2024-02-01', '2024-01-05', '2024-01-07', '2024-01-09', '2024-01-11'],
+    })
+    joined = pd.concat(merge_join(_chunks(cases, 3), _chunks(orders, 2)), ignore_index=True)
+    assert len(joined) == len(cases)
+    outcome = joined.set_index('Case_ID')['Outcome']
+    # The latest decision wins
+    assert outcome['C001'] == 'Orders made'
+    assert outcome['C019'] == 'Dismissed'
+    assert outcome.notna().sum() == 5
+
+
+def test_merge_join_rejects_unsorted_extract():
+    cases = pd.DataFrame({'Case_ID': ['C2', 'C1']})
+    orders = pd.DataFrame(columns=['Case_ID', 'Outcome', 'Decided'])
+    with pytest.raises(ValueError, match='sorted'):
+        list(merge_join([cases], [orders]))
+
+
+def test_outcome_counts_from_extracts(write_extract):
+    write_extract('cases', {'Case_ID': ['C1', 'C2', 'C3'], 'Lodged': ['2023-01-01'] * 3, 'Registry': ['Sydney'] * 3,
+                            'List': ['Private Tenancy', 'Private Tenancy', 'General'],
+                            'Category': ['Repairs'] * 3, 'Party': ['Tenant'] * 3})
+    write_extract('orders', {'Case_ID': ['C1', 'C3'], 'Outcome': ['Orders made', 'Dismissed'],
+                             'Decided': ['2023-02-01', '2023-03-01']})
+    counts = outcome_counts(chunksize=2)
+    assert counts.xs(PENDING, level='Outcome').sum() == 1
+    assert counts.sum() == 3
+    assert counts.xs('General', level='List').index.get_level_values('Outcome').tolist() == ['Dismissed']
+
+
+def test_outcome_rates_has_every_outcome_column():
+    index = pd.MultiIndex.from_tuples(
+        [(2023, 'Sydney', 'Private Tenancy', 'Repairs', 'Tenant', 'Dismissed'),
+         (2023, 'Sydney', 'Private Tenancy', 'Repairs', 'Tenant', PENDING)],
+        names=['Year', 'Registry', 'List', 'Category', 'Party', 'Outcome'])
+    rates = outcome_rates(pd.Series([4, 1], index=index), by=['Registry', 'Category'])
+    assert list(rates.columns[:len(OUTCOMES)]) == OUTCOMES
+    assert rates.loc[('Sydney', 'Repairs'), 'Orders made'] == 0
+    assert rates.loc[('Sydney', 'Repairs'), 'Dismissed'] == 100
+    assert outcome_rates(pd.Series([4, 1], index=index), years=[1999]).empty
+    assert outcome_rates(pd.Series([4, 1], index=index), lists=['General']).empty
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import ncat_analytics as ncat
+
+
+def test_import_has_no_streamlit_or_plotly():
+    code = 'import sys, ncat_analytics; print(sorted(m for m in ("streamlit", "plotly") if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_load_data_without_extracts_is_the_published_data(data_dir):
+    data = ncat.load_data()
+    assert ncat.data_version(data) == ncat.data_version(ncat.published_data())
+
+
+def test_overview_metrics():
+    df = pd.DataFrame({'Year': [2017, 2018, 2019], 'Total_Applications': [100, 150, 120]})
+    metrics = ncat.overview_metrics(df, latest_year=2019, base_year=2017, years=(2017, 2019))
+    assert metrics['peak_year'] == 2018
+    assert metrics['annual_average'] == pytest.approx(370 / 3)
+    assert metrics['growth_pct'] == pytest.approx(20.0)
+
+
+def test_yoy_changes_against_previous_year():
+    df = pd.DataFrame({'Year': [2019, 2017, 2018], 'Total_Applications': [120, 100, 150]})
+    out = ncat.yoy_changes(df)
+    assert out['Year'].tolist() == [2017, 2018, 2019]
+    assert out['YoY_Absolute'].tolist()[1:] == [50, -30]
+    assert out['YoY_Change'].iloc[1] == pytest.approx(50.0)
+
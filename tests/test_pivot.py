@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from ncat_analytics.pivot import LABEL, TOTAL, PivotIndex
+
+
+def _pivot():
+    long = pd.DataFrame({'Registry': list('aabbccdd'), 'List': list('xyxyxyxy'),
+                         'Applications': [5, 1, np.nan, 10, 3, 3, 2, 4]})
+    return PivotIndex(long, ['Registry'], ['List'])
+
+
+def test_totals_leave_out_suppressed_cells():
+    page = _pivot().page()
+    assert page.loc['b', TOTAL] == 10
+    assert np.isnan(page.loc['b', 'x'])
+
+
+def test_sorting_puts_suppressed_last_and_keeps_label_order_for_ties():
+    pivot = _pivot()
+    assert pivot.page(sort_by=TOTAL).index.tolist() == ['b', 'a', 'c', 'd']
+    assert pivot.page(sort_by=TOTAL, ascending=True).index.tolist() == ['a', 'c', 'd', 'b']
+    assert pivot.page(sort_by='x').index.tolist() == ['a', 'c', 'd', 'b']
+    assert pivot.page(sort_by='x', ascending=True).index.tolist() == ['d', 'c', 'a', 'b']
+    assert pivot.page(sort_by=LABEL, ascending=True).index.tolist() == ['a', 'b', 'c', 'd']
+
+
+def test_pages():
+    page = _pivot().page(page=1, page_size=3)
+    assert page.index.tolist() == ['d']
+    assert page.attrs['pages'] == 2
@@ -0,0 +1,41 @@
+import numpy as np
+
+from ncat_analytics.profiling import RerunProfiler
+
+SCRIPT = """\
+profiler = RerunProfiler(__file__, interval=0.001).start()
+blocks = [np.ones(250_000) for _ in range(4)]
+total = 0
+for i in range(30_000):
+    total += i
+profiler.stop()
+"""
+
+
+def _run(tmp_path):
+    path = str(tmp_path / 'script.py')
+    with open(path, 'w') as f:
+        f.write(SCRIPT)
+    scope = {'RerunProfiler': RerunProfiler, 'np': np, '__file__': path}
+    exec(compile(SCRIPT, path, 'exec'), scope)
+    return scope['profiler']
+
+
+def test_profile_attributes_time_and_memory_to_script_lines(tmp_path):
+    profiler = _run(tmp_path)
+    lines = profiler.hot_lines()
+    assert set(lines['Line']) <= {2, 3, 4, 5, 6} and lines['Samples'].sum() > 0
+    memory = profiler.line_memory().set_index('Line')
+    # The four 2 MB arrays are allocated and kept by line 2
+    assert memory.loc[2, 'Net_KiB'] > 7_000
+    assert memory.loc[2, 'Source'].startswith('blocks =')
+    # Each array is allocated on its own line event of the comprehension
+    assert profiler.peak_bytes >= 2_000_000
+
+
+def test_folded_stacks_and_report(tmp_path):
+    profiler = _run(tmp_path)
+    folded = profiler.folded_stacks().splitlines()
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert any('script.py:' in line for line in folded)
+    assert 'Hottest script lines' in profiler.report('test')
@@ -0,0 +1,48 @@
+import pandas as pd
+
+import ncat_analytics as ncat
+from ncat_analytics.cache import DiskCache
+from ncat_analytics.quality import CELL_COLUMNS, QualityMonitor, failing_checks, reconcile, reconcile_dataset
+
+
+def _cells(rows):
+    return pd.DataFrame(rows, columns=CELL_COLUMNS)
+
+
+def test_groups_reconcile_in_one_batch():
+    parts = _cells([('sum', '2024', 't', '2024', 'a', 60), ('sum', '2024', 't', '2024', 'b', 40),
+                    ('sum', '2023', 't', '2023', 'a', 50), ('sum', '2023', 't', '2023', 'b', None),
+                    ('other', '2024', 't', '2024', 'c', 7)])
+    totals = _cells([('sum', '2024', 't', '2024', 'total', 100), ('sum', '2023', 't', '2023', 'total', 90),
+                     ('other', '2024', 't', '2024', 'total', 9)])
+    result = reconcile(parts, totals)
+    status = result.checks.set_index(['Check', 'Row'])['Status']
+    assert status.to_dict() == {('sum', '2024'): 'ok', ('sum', '2023'): 'incomplete', ('other', '2024'): 'mismatch'}
+    # Every cell of a failing group is flagged, and nothing of a passing one
+    assert sorted(result.flags['Column']) == ['a', 'b', 'c', 'total', 'total']
+    # Incomplete groups have no relative difference and come first
+    assert failing_checks(result)['Check'].tolist() == ['sum', 'other']
+
+
+def test_tolerance_allows_rounding():
+    parts = _cells([('sum', '2024', 't', '2024', 'a', 1000), ('sum', '2024', 't', '2024', 'b', 1004)])
+    totals = _cells([('sum', '2024', 't', '2024', 'total', 2000)])
+    assert reconcile(parts, totals).checks['Status'].tolist() == ['ok']
+    assert reconcile(parts, totals, tolerance=0).checks['Status'].tolist() == ['mismatch']
+
+
+def test_published_data_flags_the_known_party_category_gap():
+    checks = reconcile_dataset(ncat.published_data()).checks.set_index(['Check', 'Row'])
+    # Party-category Repairs 2018 is Landlord 0 + Tenant 284 against a Total of 308
+    assert checks.loc[('party_split', '2018 · Repairs'), 'Difference'] == -24
+    assert set(checks['Status']) <= {'ok', 'mismatch', 'incomplete'}
+
+
+def test_monitor_keeps_results_in_the_disk_cache(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    monitor = QualityMonitor(ncat.published_data, cache, code_version='test')
+    version = ncat.data_version(ncat.published_data())
+    assert monitor.results(version) is None
+    assert monitor.check() and monitor.last_error is None
+    restarted = QualityMonitor(ncat.published_data, cache, code_version='test')
+    assert restarted.results(version).checks.equals(monitor.results(version).checks)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ncat_analytics.registries import available_rates, load_registry_dimension, with_rates
+
+
+def test_registries_are_discovered_from_the_data(write_extract):
+    write_extract('registries', {'Registry': ['Sydney'], 'Region': ['Metro'], 'Catchment_Population': [200_000]})
+    dimension = load_registry_dimension(['Sydney', 'Broken Hill']).set_index('Registry')
+    assert dimension.loc['Broken Hill', 'Region'] == 'Unassigned'
+    assert np.isnan(dimension.loc['Broken Hill', 'Catchment_Population'])
+    assert available_rates(dimension) == ['Per_100k_Population']
+
+
+def test_no_extract_gives_blank_rates(data_dir):
+    dimension = load_registry_dimension(['Sydney'])
+    out = with_rates(pd.DataFrame({'Year': [2024], 'Registry': ['Sydney'], 'Applications': [10]}), dimension)
+    assert out.loc[0, 'Region'] == 'Unassigned'
+    assert out[['Per_100k_Population', 'Per_1k_Bonds', 'Per_Staff_FTE']].isna().all(axis=None)
+
+
+def test_year_specific_rows_win_over_all_year_rows():
+    dimension = pd.DataFrame({'Registry': ['Sydney', 'Sydney'], 'Year': [np.nan, 2024],
+                              'Region': ['Metro', 'Metro'], 'Catchment_Population': [100_000, 200_000],
+                              'Rental_Bonds': [1_000, np.nan], 'Staff_FTE': [0, 4]})
+    counts = pd.DataFrame({'Year': [2023, 2024], 'Registry': ['Sydney', 'Sydney'], 'Applications': [50, 80]})
+    out = with_rates(counts, dimension).set_index('Year')
+    assert out['Per_100k_Population'].tolist() == [50.0, 40.0]
+    # Missing year-specific values fall back to the all-year row
+    assert out.loc[2024, 'Per_1k_Bonds'] == pytest.approx(80.0)
+    # A zero denominator gives no rate rather than infinity
+    assert np.isnan(out.loc[2023, 'Per_Staff_FTE']) and out.loc[2024, 'Per_Staff_FTE'] == 20.0
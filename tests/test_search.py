@@ -0,0 +1,73 @@
+import pytest
+
+from ncat_analytics.search import SearchIndex, has_descriptions, parse_query
+
+
+def _cases(descriptions, start=0, lodged='2024-01-01', registry='Sydney'):
+    n = len(descriptions)
+    return {
+        'Case_ID': [f'C{start + i}' for i in range(n)], 'Lodged': [lodged] * n, 'Registry': [registry] * n,
+        'List': ['Private Tenancy'] * n, 'Category': ['Repairs'] * n, 'Party': ['Tenant'] * n,
+        'Description': descriptions,
+    }
+
+
+@pytest.fixture
+def index(data_dir, write_extract):
+    write_extract('cases', _cases(['Mould in bathroom', 'bond claim for cleaning', 'breach s 87 notice',
+                                   'repairs to roof leak', None]), part='2024-01')
+    write_extract('cases', _cases(['water damage, mould', 'claim bond'], start=10, lodged='2024-02-01',
+                                  registry='Penrith'), part='2024-02')
+    index = SearchIndex(str(data_dir / 'search'))
+    index.update()
+    return index
+
+
+def _ids(result):
+    return sorted(result.case_ids)
+
+
+def test_parse_query():
+    assert parse_query('mould') == [('term', 'mould')]
+    assert parse_query('repair*') == [('prefix', 'repair')]
+    assert parse_query('"bond claim"') == [('term', 'bond claim')]
+    assert parse_query('s87') == [('term', 's 87')]
+
+
+def test_words_phrases_and_prefixes(index):
+    assert _ids(index.search('mould')) == ['C0', 'C10']
+    assert _ids(index.search('"bond claim"')) == ['C1']
+    assert _ids(index.search('bond claim')) == ['C1', 'C11']
+    assert _ids(index.search('s87')) == ['C2']
+    assert _ids(index.search('repair*')) == ['C3']
+    assert index.search('nothing').matches == 0
+
+
+def test_results_are_scoped_and_counted(index):
+    result = index.search('mould', registries=['Penrith'])
+    assert _ids(result) == ['C10']
+    assert result.counts.sum() == 1
+    assert result.counts.index.get_level_values('Registry').tolist() == ['Penrith']
+    assert result.cases['Description'].tolist() == ['water damage, mould']
+    assert index.totals().sum() == 7
+
+
+def test_update_indexes_only_changed_files(index, write_extract):
+    assert index.update()['built'] == 0
+    write_extract('cases', _cases(['asbestos in ceiling'], start=20, lodged='2024-03-01'), part='2024-03')
+    stats = index.update()
+    assert (stats['built'], stats['kept']) == (1, 2)
+    assert _ids(index.search('asbestos')) == ['C20']
+
+
+def test_removed_files_are_dropped(index, data_dir):
+    (data_dir / 'cases' / '2024-02.csv').unlink()
+    assert index.update()['dropped'] == 1
+    assert _ids(index.search('mould')) == ['C0']
+    assert len(index.segments()) == 1
+
+
+def test_has_descriptions(data_dir, write_extract):
+    assert not has_descriptions()
+    write_extract('cases', {'Case_ID': ['C1'], 'Lodged': ['2024-01-01']})
+    assert not has_descriptions()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from ncat_analytics.sketches import HyperLogLog, MisraGries
+
+
+def test_hyperloglog_estimate_within_error():
+    sketch = HyperLogLog().add(np.arange(50_000))
+    assert sketch.estimate() == pytest.approx(50_000, rel=0.05)
+
+
+def test_hyperloglog_merge_equals_sketch_of_union():
+    left = HyperLogLog().add(np.arange(0, 30_000))
+    right = HyperLogLog().add(np.arange(20_000, 50_000))
+    union = HyperLogLog().add(np.arange(0, 50_000))
+    np.testing.assert_array_equal(left.copy().merge(right).registers, union.registers)
+
+
+def test_hyperloglog_rejects_other_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(p=12).merge(HyperLogLog(p=10))
+
+
+def test_misra_gries_keeps_heavy_hitters_across_merges():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([np.full(5_000, 'heavy'), rng.integers(0, 10_000, 20_000).astype(str)])
+    rng.shuffle(values)
+    merged = MisraGries(k=20)
+    for chunk in np.array_split(values, 7):
+        merged.merge(MisraGries(k=20).add(chunk))
+    top = merged.top(1)
+    assert top.index[0] == 'heavy'
+    # Counts are lower bounds, short by at most `error`
+    assert 5_000 - merged.error <= top.iloc[0] <= 5_000
+
@@ -0,0 +1,46 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+import ncat_analytics as ncat
+from ncat_analytics.versions import SnapshotStore
+
+
+def _revised(data):
+    categories = data.df_categories.copy()
+    categories.loc[categories['Year'] == 2024, 'General_Orders'] = 9999
+    return data._replace(df_categories=categories)
+
+
+def test_versions_round_trip_and_share_unchanged_columns(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    data = ncat.published_data()
+    first = store.commit(data, label='first')
+    files = len(glob.glob(os.path.join(str(tmp_path), 'columns', '*', '*.npy')))
+    second = store.commit(_revised(data), label='revised')
+    assert store.commit(data) == first
+    # The revision adds one column file
+    assert len(glob.glob(os.path.join(str(tmp_path), 'columns', '*', '*.npy'))) == files + 1
+    for field, before, after in zip(data._fields, data, store.load(first)):
+        pd.testing.assert_frame_equal(before, after, obj=field)
+    versions = store.versions().set_index('Version')
+    assert versions.loc[second, 'Label'] == 'revised'
+    # Versions committed within the same second may list in either order
+    assert sorted(versions['New_Columns']) == [1, versions.loc[first, 'Columns']]
+
+
+def test_diff_lists_the_changed_cells(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    data = ncat.published_data()
+    old, new = store.commit(data), store.commit(_revised(data))
+    changes = store.diff(old, new)
+    assert changes[['Table', 'Row', 'Column', 'After']].values.tolist() == \
+        [['categories', '2024', 'General_Orders', 9999]]
+    assert store.diff(old, old).empty
+
+
+def test_unknown_version_raises(tmp_path):
+    with pytest.raises(KeyError):
+        SnapshotStore(str(tmp_path)).load('missing')